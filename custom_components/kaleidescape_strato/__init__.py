@@ -1,23 +1,47 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DEVICE_ID, CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 
-from .api import KaleidescapeClient
 from .const import (
     CONF_DEBUG_COMMANDS,
+    CONF_PLAYBACK_OFFSETS,
+    CONF_PLAYERS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_SYSTEM_MODE,
     DATA_DEVICE_TYPE,
     DATA_IS_MOVIE_PLAYER,
+    DATA_PLAYER_ID,
+    DATA_PLAYERS,
+    DATA_POLL_SCHEDULER,
     DEFAULT_DEBUG_COMMANDS,
+    DEFAULT_NAME,
+    DEFAULT_PLAYBACK_OFFSETS,
     DEFAULT_PORT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_SYSTEM_MODE,
     DEFAULT_TIMEOUT,
     DOMAIN,
     PLATFORMS,
+    POLL_JITTER,
+    PROFILE_DETECTION_TIMEOUT,
 )
-from .coordinator import KaleidescapeSensorCoordinator
+from .coordinator import KaleidescapeSensorCoordinator, async_remove_snapshot
+from .events import KaleidescapeEventDispatcher
+from .kaleidescape_protocol import LOCAL_CPDID, KaleidescapeClient, KaleidescapeResponse
+from .metadata import KaleidescapeMetadataSync, async_remove_metadata
+from .playback import KaleidescapePlaybackClock, parse_playback_offsets
+from .presence import KaleidescapePresenceMonitor
+from .scheduler import KaleidescapePollScheduler
 
 KaleidescapeConfigEntry = ConfigEntry
 
@@ -25,38 +49,81 @@ _LOGGER = logging.getLogger(__name__)
 DATA_LOADED_PLATFORMS = "loaded_platforms"
 
 
+def _player_id(device_id: str) -> str:
+    return device_id.lstrip("#").lower()
+
+
+def _configured_players(entry: KaleidescapeConfigEntry) -> list[tuple[str, str, str]]:
+    """Return (device ID, player ID, name) for each player served by this entry."""
+    if not entry.data.get(CONF_SYSTEM_MODE, DEFAULT_SYSTEM_MODE):
+        return [(LOCAL_CPDID, "", entry.data.get(CONF_NAME, DEFAULT_NAME))]
+    return [
+        (player[CONF_DEVICE_ID], _player_id(player[CONF_DEVICE_ID]), player[CONF_NAME])
+        for player in entry.data.get(CONF_PLAYERS, [])
+    ]
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: KaleidescapeConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
-    client = KaleidescapeClient(
+    client = KaleidescapeClient.acquire(
         host=entry.data["host"],
         port=entry.data.get("port", DEFAULT_PORT),
         timeout=entry.data.get("timeout", DEFAULT_TIMEOUT),
         debug_commands=entry.options.get(CONF_DEBUG_COMMANDS, DEFAULT_DEBUG_COMMANDS),
+        rate_limit=entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        rate_burst=entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
     )
-    is_movie_player = True
-    device_type = "Kaleidescape"
-    try:
-        is_movie_player, device_type = await client.async_get_device_profile()
-    except Exception:
-        _LOGGER.debug("Unable to detect Kaleidescape device profile at setup", exc_info=True)
-
-    coordinator = KaleidescapeSensorCoordinator(
-        hass,
-        entry,
-        client,
-        include_player_metrics=is_movie_player,
+
+    playback_offsets = parse_playback_offsets(
+        entry.options.get(CONF_PLAYBACK_OFFSETS, DEFAULT_PLAYBACK_OFFSETS)
     )
-    try:
-        await coordinator.async_refresh()
-    except Exception:
-        _LOGGER.debug("Initial Kaleidescape sensor refresh failed", exc_info=True)
+    players: list[dict[str, Any]] = []
+    for device_id, player_id, name in _configured_players(entry):
+        player_client = client.for_device(device_id)
+        metadata_sync = KaleidescapeMetadataSync(hass, entry, player_client, player_id)
+        coordinator = KaleidescapeSensorCoordinator(
+            hass,
+            entry,
+            player_client,
+            include_player_metrics=True,
+            player_id=player_id,
+            metadata=metadata_sync,
+        )
+        profile = await coordinator.async_restore()
+        if not profile:
+            # First setup: the entities depend on the profile, so detect it before forwarding.
+            # A player that does not answer in time is assumed to be a movie player, and the
+            # background refresh reloads the entry once it has been detected.
+            try:
+                async with asyncio.timeout(PROFILE_DETECTION_TIMEOUT):
+                    is_movie_player, device_type = await player_client.async_get_device_profile()
+            except Exception:
+                _LOGGER.debug("Unable to detect Kaleidescape device profile", exc_info=True)
+            else:
+                await coordinator.async_save_profile(is_movie_player, device_type)
+                profile = {DATA_IS_MOVIE_PLAYER: is_movie_player, DATA_DEVICE_TYPE: device_type}
+        players.append(
+            {
+                CONF_DEVICE_ID: device_id,
+                DATA_PLAYER_ID: player_id,
+                CONF_NAME: name,
+                "client": player_client,
+                "sensor_coordinator": coordinator,
+                "metadata_sync": metadata_sync,
+                "profile": profile,
+                DATA_IS_MOVIE_PLAYER: bool(profile.get(DATA_IS_MOVIE_PLAYER, True)),
+                DATA_DEVICE_TYPE: str(profile.get(DATA_DEVICE_TYPE, "Kaleidescape")),
+            }
+        )
+        # Started before the platforms so entities read an up-to-date clock on every update.
+        clock = KaleidescapePlaybackClock(hass, entry, players[-1], playback_offsets)
+        entry.async_on_unload(clock.async_start())
+        players[-1]["playback_clock"] = clock
 
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
-        "sensor_coordinator": coordinator,
-        DATA_IS_MOVIE_PLAYER: is_movie_player,
-        DATA_DEVICE_TYPE: device_type,
+        DATA_PLAYERS: players,
     }
 
     loaded_platforms: list[Any] = []
@@ -74,22 +141,135 @@ async def async_setup_entry(hass: HomeAssistant, entry: KaleidescapeConfigEntry)
     if not loaded_platforms:
         _LOGGER.error("No Kaleidescape platforms could be set up for entry %s", entry.entry_id)
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        await client.async_release()
         return False
 
     hass.data[DOMAIN][entry.entry_id][DATA_LOADED_PLATFORMS] = loaded_platforms
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    if (scheduler := hass.data[DOMAIN].get(DATA_POLL_SCHEDULER)) is None:
+        scheduler = KaleidescapePollScheduler(hass, POLL_JITTER)
+        hass.data[DOMAIN][DATA_POLL_SCHEDULER] = scheduler
+    for player in players:
+        dispatcher = KaleidescapeEventDispatcher(hass, entry, player)
+        dispatcher.async_start()
+        entry.async_on_unload(dispatcher.async_stop)
+        entry.async_on_unload(scheduler.async_add(player["sensor_coordinator"]))
+        entry.async_on_unload(player["metadata_sync"].async_stop)
+        await player["metadata_sync"].async_load()
+
+    presence = KaleidescapePresenceMonitor(hass, entry, client, players)
+    entry.async_on_unload(await presence.async_start())
+    entry.async_create_background_task(
+        hass,
+        _async_refresh_in_background(hass, entry, client, players),
+        f"{DOMAIN}_{entry.entry_id}_initial_refresh",
+    )
     return True
 
 
+async def _async_refresh_in_background(
+    hass: HomeAssistant,
+    entry: KaleidescapeConfigEntry,
+    client: KaleidescapeClient,
+    players: list[dict[str, Any]],
+) -> None:
+    """Detect players and device profiles and run the first live poll without blocking setup."""
+    if entry.data.get(CONF_SYSTEM_MODE, DEFAULT_SYSTEM_MODE):
+        try:
+            system_players = await client.async_get_system_players()
+        except Exception:
+            _LOGGER.debug("Unable to read Kaleidescape system player list", exc_info=True)
+        else:
+            configured = [
+                {CONF_DEVICE_ID: device_id, CONF_NAME: name} for device_id, name in system_players
+            ]
+            if configured and configured != entry.data.get(CONF_PLAYERS):
+                _LOGGER.debug("Kaleidescape system players changed for entry %s", entry.entry_id)
+                hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, CONF_PLAYERS: configured}
+                )
+                return
+
+    reload_needed = False
+    for player in players:
+        coordinator: KaleidescapeSensorCoordinator = player["sensor_coordinator"]
+        profile: dict[str, Any] = player["profile"]
+        try:
+            is_movie_player, device_type = await player["client"].async_get_device_profile()
+        except Exception:
+            _LOGGER.debug("Unable to detect Kaleidescape device profile at setup", exc_info=True)
+            continue
+
+        await coordinator.async_save_profile(is_movie_player, device_type)
+        if profile:
+            reload_needed |= profile != {
+                DATA_IS_MOVIE_PLAYER: is_movie_player,
+                DATA_DEVICE_TYPE: device_type,
+            }
+        else:
+            # Setup could not detect the profile in time and assumed a generic movie player.
+            reload_needed = True
+
+    if reload_needed:
+        _LOGGER.debug("Kaleidescape device profile changed, reloading entry %s", entry.entry_id)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    for player in players:
+        try:
+            await player["sensor_coordinator"].async_refresh()
+        except Exception:
+            _LOGGER.debug("Initial Kaleidescape sensor refresh failed", exc_info=True)
+
+
+@callback
+def async_subscribe(
+    hass: HomeAssistant,
+    entry_id: str,
+    names: Iterable[str],
+    listener: Callable[[KaleidescapeResponse], None],
+    *,
+    player_id: str = "",
+) -> CALLBACK_TYPE:
+    """Subscribe another integration to a loaded player's event messages.
+
+    The subscription shares the entry's connection and is dropped when the entry unloads;
+    subscribers that outlive a reload must subscribe again. player_id selects a player in
+    system mode and is empty otherwise.
+    """
+    entry = hass.config_entries.async_get_entry(entry_id)
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if entry is None or entry_data is None:
+        raise HomeAssistantError(f"Kaleidescape entry {entry_id} is not loaded")
+    for player in entry_data[DATA_PLAYERS]:
+        if player[DATA_PLAYER_ID] == player_id:
+            break
+    else:
+        raise HomeAssistantError(f"Kaleidescape entry {entry_id} has no player '{player_id}'")
+
+    unsubscribe = player["client"].subscribe(names, listener)
+    entry.async_on_unload(unsubscribe)
+    return unsubscribe
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: KaleidescapeConfigEntry) -> bool:
     entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
     loaded_platforms = entry_data.get(DATA_LOADED_PLATFORMS, PLATFORMS)
     unloaded = await hass.config_entries.async_unload_platforms(entry, loaded_platforms)
     if unloaded:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        if (client := entry_data.get("client")) is not None:
+            await client.async_release()
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: KaleidescapeConfigEntry) -> None:
+    for _, player_id, _ in _configured_players(entry):
+        await async_remove_snapshot(hass, entry.entry_id, player_id)
+        await async_remove_metadata(hass, entry.entry_id, player_id)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: KaleidescapeConfigEntry) -> None:
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
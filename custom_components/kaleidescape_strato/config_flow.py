@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import logging
 from urllib.parse import urlparse
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
-from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_TIMEOUT
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry, ConfigFlow, OptionsFlow
+from homeassistant.const import CONF_DEVICE_ID, CONF_HOST, CONF_NAME, CONF_PORT, CONF_TIMEOUT
 from homeassistant.core import callback
-from homeassistant.data_entry_flow import FlowResult
+from homeassistant.data_entry_flow import FlowResult, FlowResultType
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.service_info.ssdp import (
     ATTR_UPNP_FRIENDLY_NAME,
     ATTR_UPNP_SERIAL,
@@ -14,17 +16,54 @@ from homeassistant.helpers.service_info.ssdp import (
     SsdpServiceInfo,
 )
 
-from .api import KaleidescapeClient
 from .const import (
     CONF_ALLOW_RAW_COMMANDS,
+    CONF_COMPACT_ENTITIES,
     CONF_DEBUG_COMMANDS,
+    CONF_DEVICES,
+    CONF_EVENT_ONLY_COMMANDS,
+    CONF_FAST_REFRESH_COMMANDS,
+    CONF_HOSTS,
+    CONF_PLAYBACK_OFFSETS,
+    CONF_PLAYERS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_SLOW_REFRESH_COMMANDS,
+    CONF_SYSTEM_MODE,
+    CONF_UPDATE_BATCH_WINDOW,
+    CONF_WAIT_FOR_STATE,
+    CONF_WAIT_TIMEOUT,
     DEFAULT_ALLOW_RAW_COMMANDS,
+    DEFAULT_COMPACT_ENTITIES,
     DEFAULT_DEBUG_COMMANDS,
+    DEFAULT_EVENT_ONLY_COMMANDS,
+    DEFAULT_FAST_REFRESH_COMMANDS,
     DEFAULT_NAME,
+    DEFAULT_PLAYBACK_OFFSETS,
     DEFAULT_PORT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_SLOW_REFRESH_COMMANDS,
+    DEFAULT_SYSTEM_MODE,
     DEFAULT_TIMEOUT,
+    DEFAULT_UPDATE_BATCH_WINDOW,
+    DEFAULT_WAIT_FOR_STATE,
+    DEFAULT_WAIT_TIMEOUT,
     DOMAIN,
+    REFRESH_TIERS,
 )
+from .kaleidescape_protocol import (
+    PLAYER_STATE_COMMANDS,
+    SHARED_STATE_COMMANDS,
+    KaleidescapeClient,
+    KaleidescapeDevice,
+    async_probe,
+    async_scan,
+    expand_scan_targets,
+)
+from .playback import parse_playback_offsets
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class KaleidescapeStratoConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -32,6 +71,7 @@ class KaleidescapeStratoConfigFlow(ConfigFlow, domain=DOMAIN):
 
     _discovered_host: str | None = None
     _discovered_name: str = DEFAULT_NAME
+    _scanned_devices: dict[str, KaleidescapeDevice]
 
     @staticmethod
     def _discovery_unique_id(discovery_info: SsdpServiceInfo, host: str) -> str:
@@ -55,25 +95,54 @@ class KaleidescapeStratoConfigFlow(ConfigFlow, domain=DOMAIN):
         return KaleidescapeStratoOptionsFlow(config_entry)
 
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan_network"])
+
+    async def async_step_manual(self, user_input: dict | None = None) -> FlowResult:
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            await self.async_set_unique_id(f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}")
-            self._abort_if_unique_id_configured()
-
-            client = KaleidescapeClient(
-                host=user_input[CONF_HOST],
-                port=user_input[CONF_PORT],
-                timeout=user_input[CONF_TIMEOUT],
+            device = await async_probe(
+                user_input[CONF_HOST], user_input[CONF_PORT], user_input[CONF_TIMEOUT]
             )
+            if device is not None:
+                await self.async_set_unique_id(_device_unique_id(device))
+                self._abort_if_unique_id_configured()
+
+            system_mode = user_input.get(CONF_SYSTEM_MODE, DEFAULT_SYSTEM_MODE)
+            players: list[tuple[str, str]] = []
+            if device is not None and system_mode:
+                client = KaleidescapeClient.acquire(
+                    host=user_input[CONF_HOST],
+                    port=user_input[CONF_PORT],
+                    timeout=user_input[CONF_TIMEOUT],
+                )
+                try:
+                    players = await client.async_get_system_players()
+                except (OSError, TimeoutError):
+                    players = []
+                finally:
+                    await client.async_release()
 
-            if await client.async_can_connect():
+            if device is None:
+                errors["base"] = "cannot_connect"
+            elif not system_mode:
                 return self.async_create_entry(
                     title=user_input[CONF_NAME],
                     data=user_input,
                 )
-
-            errors["base"] = "cannot_connect"
+            elif players:
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={
+                        **user_input,
+                        CONF_PLAYERS: [
+                            {CONF_DEVICE_ID: device_id, CONF_NAME: name}
+                            for device_id, name in players
+                        ],
+                    },
+                )
+            else:
+                errors["base"] = "no_players"
 
         data_schema = vol.Schema(
             {
@@ -81,15 +150,95 @@ class KaleidescapeStratoConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_HOST): str,
                 vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
                 vol.Required(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): vol.Coerce(float),
+                vol.Required(CONF_SYSTEM_MODE, default=DEFAULT_SYSTEM_MODE): bool,
             }
         )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=data_schema,
             errors=errors,
         )
 
+    async def async_step_scan_network(self, user_input: dict | None = None) -> FlowResult:
+        """Probe a list of addresses or subnets for Kaleidescape devices."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                hosts = expand_scan_targets(user_input[CONF_HOSTS])
+            except ValueError:
+                errors[CONF_HOSTS] = "invalid_hosts"
+            else:
+                configured = {entry.data.get(CONF_HOST) for entry in self._async_current_entries()}
+                devices = await async_scan(
+                    [host for host in hosts if host not in configured], user_input[CONF_PORT]
+                )
+                # A device answering on several addresses is offered once.
+                unique_devices: dict[str, KaleidescapeDevice] = {}
+                for device in devices:
+                    if _device_unique_id(device) not in self._async_current_ids():
+                        unique_devices.setdefault(_device_unique_id(device), device)
+                self._scanned_devices = {device.host: device for device in unique_devices.values()}
+                if self._scanned_devices:
+                    return await self.async_step_select_devices()
+                errors["base"] = "no_devices_found"
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_HOSTS): str,
+                vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
+            }
+        )
+        return self.async_show_form(
+            step_id="scan_network",
+            data_schema=data_schema,
+            errors=errors,
+        )
+
+    async def async_step_select_devices(self, user_input: dict | None = None) -> FlowResult:
+        """Add the scanned devices the user picked, one config entry each."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            selected = [self._scanned_devices[host] for host in user_input[CONF_DEVICES]]
+            if selected:
+                first, *others = selected
+                await self.async_set_unique_id(_device_unique_id(first))
+                self._abort_if_unique_id_configured()
+                for device in others:
+                    result = await self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": SOURCE_IMPORT, "unique_id": _device_unique_id(device)},
+                        data=_device_data(device),
+                    )
+                    if result["type"] is not FlowResultType.CREATE_ENTRY:
+                        _LOGGER.debug(
+                            "Skipped scanned device %s: %s", device.host, result.get("reason")
+                        )
+                return self.async_create_entry(title=first.name, data=_device_data(first))
+            errors["base"] = "no_devices_selected"
+
+        options = {
+            host: f"{device.name} ({device.device_type}, {host})"
+            for host, device in self._scanned_devices.items()
+        }
+        return self.async_show_form(
+            step_id="select_devices",
+            data_schema=vol.Schema(
+                {vol.Required(CONF_DEVICES, default=list(options)): cv.multi_select(options)}
+            ),
+            errors=errors,
+        )
+
+    async def async_step_import(self, import_data: dict) -> FlowResult:
+        """Create an entry for a device picked in another flow's network scan."""
+        await self.async_set_unique_id(
+            self.context.get("unique_id") or f"{import_data[CONF_HOST]}:{import_data[CONF_PORT]}"
+        )
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=import_data[CONF_NAME], data=import_data)
+
     async def async_step_ssdp(self, discovery_info: SsdpServiceInfo) -> FlowResult:
         """Handle SSDP discovery for Kaleidescape devices."""
         if discovery_info.ssdp_location is None:
@@ -103,22 +252,26 @@ class KaleidescapeStratoConfigFlow(ConfigFlow, domain=DOMAIN):
             if entry.data.get(CONF_HOST) == discovered_host:
                 return self.async_abort(reason="already_configured")
 
-        await self.async_set_unique_id(
-            self._discovery_unique_id(discovery_info, discovered_host),
-        )
-        self._abort_if_unique_id_configured(updates={CONF_HOST: discovered_host})
-
-        client = KaleidescapeClient(
-            host=discovered_host,
-            port=DEFAULT_PORT,
-            timeout=DEFAULT_TIMEOUT,
-        )
-        if not await client.async_can_connect():
+        device = await async_probe(discovered_host, DEFAULT_PORT)
+        if device is None:
             return self.async_abort(reason="cannot_connect")
 
+        unique_id = _device_unique_id(device)
+        # Entries discovered before serial numbers were used carry the SSDP identifier.
+        legacy_id = self._discovery_unique_id(discovery_info, discovered_host)
+        for entry in self._async_current_entries():
+            if entry.unique_id == legacy_id:
+                self.hass.config_entries.async_update_entry(
+                    entry, unique_id=unique_id, data={**entry.data, CONF_HOST: discovered_host}
+                )
+                return self.async_abort(reason="already_configured")
+
+        await self.async_set_unique_id(unique_id)
+        self._abort_if_unique_id_configured(updates={CONF_HOST: discovered_host})
+
         self._discovered_host = discovered_host
         self._discovered_name = str(
-            discovery_info.upnp.get(ATTR_UPNP_FRIENDLY_NAME, DEFAULT_NAME)
+            discovery_info.upnp.get(ATTR_UPNP_FRIENDLY_NAME, device.name)
         )
         self.context.update({"title_placeholders": {"name": self._discovered_name}})
         return await self.async_step_discovery_confirm()
@@ -148,13 +301,42 @@ class KaleidescapeStratoConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+def _device_unique_id(device: KaleidescapeDevice) -> str:
+    """Identify a device by the serial number it reports, however it was found."""
+    return device.serial or f"{device.host}:{device.port}"
+
+
+def _device_data(device: KaleidescapeDevice) -> dict:
+    return {
+        CONF_NAME: device.name,
+        CONF_HOST: device.host,
+        CONF_PORT: device.port,
+        CONF_TIMEOUT: DEFAULT_TIMEOUT,
+        CONF_SYSTEM_MODE: False,
+    }
+
+
 class KaleidescapeStratoOptionsFlow(OptionsFlow):
     def __init__(self, config_entry: ConfigEntry) -> None:
         self._config_entry = config_entry
 
     async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            tiered = [command for option in REFRESH_TIERS for command in user_input[option]]
+            if len(tiered) != len(set(tiered)):
+                errors["base"] = "command_in_several_tiers"
+            try:
+                offsets = parse_playback_offsets(user_input[CONF_PLAYBACK_OFFSETS])
+            except ValueError:
+                errors[CONF_PLAYBACK_OFFSETS] = "invalid_offsets"
+            else:
+                user_input[CONF_PLAYBACK_OFFSETS] = ", ".join(map(str, offsets))
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        state_commands = cv.multi_select([*SHARED_STATE_COMMANDS, *PLAYER_STATE_COMMANDS])
 
         data_schema = vol.Schema(
             {
@@ -172,6 +354,76 @@ class KaleidescapeStratoOptionsFlow(OptionsFlow):
                         DEFAULT_ALLOW_RAW_COMMANDS,
                     ),
                 ): bool,
+                vol.Required(
+                    CONF_RATE_LIMIT,
+                    default=self._config_entry.options.get(
+                        CONF_RATE_LIMIT,
+                        DEFAULT_RATE_LIMIT,
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5)),
+                vol.Required(
+                    CONF_RATE_BURST,
+                    default=self._config_entry.options.get(
+                        CONF_RATE_BURST,
+                        DEFAULT_RATE_BURST,
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_UPDATE_BATCH_WINDOW,
+                    default=self._config_entry.options.get(
+                        CONF_UPDATE_BATCH_WINDOW,
+                        DEFAULT_UPDATE_BATCH_WINDOW,
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
+                vol.Required(
+                    CONF_FAST_REFRESH_COMMANDS,
+                    default=self._config_entry.options.get(
+                        CONF_FAST_REFRESH_COMMANDS,
+                        DEFAULT_FAST_REFRESH_COMMANDS,
+                    ),
+                ): state_commands,
+                vol.Required(
+                    CONF_SLOW_REFRESH_COMMANDS,
+                    default=self._config_entry.options.get(
+                        CONF_SLOW_REFRESH_COMMANDS,
+                        DEFAULT_SLOW_REFRESH_COMMANDS,
+                    ),
+                ): state_commands,
+                vol.Required(
+                    CONF_EVENT_ONLY_COMMANDS,
+                    default=self._config_entry.options.get(
+                        CONF_EVENT_ONLY_COMMANDS,
+                        DEFAULT_EVENT_ONLY_COMMANDS,
+                    ),
+                ): state_commands,
+                vol.Optional(
+                    CONF_PLAYBACK_OFFSETS,
+                    default=self._config_entry.options.get(
+                        CONF_PLAYBACK_OFFSETS,
+                        DEFAULT_PLAYBACK_OFFSETS,
+                    ),
+                ): str,
+                vol.Required(
+                    CONF_COMPACT_ENTITIES,
+                    default=self._config_entry.options.get(
+                        CONF_COMPACT_ENTITIES,
+                        DEFAULT_COMPACT_ENTITIES,
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_WAIT_FOR_STATE,
+                    default=self._config_entry.options.get(
+                        CONF_WAIT_FOR_STATE,
+                        DEFAULT_WAIT_FOR_STATE,
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_WAIT_TIMEOUT,
+                    default=self._config_entry.options.get(
+                        CONF_WAIT_TIMEOUT,
+                        DEFAULT_WAIT_TIMEOUT,
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1)),
             }
         )
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        return self.async_show_form(step_id="init", data_schema=data_schema, errors=errors)
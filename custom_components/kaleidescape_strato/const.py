@@ -2,62 +2,78 @@ from __future__ import annotations
 
 from homeassistant.const import Platform
 
+from .kaleidescape_protocol import COMMAND_ALIASES as COMMAND_ALIASES
+
 DOMAIN = "kaleidescape_strato"
 DEFAULT_NAME = "Kaleidescape"
 DEFAULT_PORT = 10000
 DEFAULT_TIMEOUT = 5.0
+PROFILE_DETECTION_TIMEOUT = 3.0
 SENSOR_SCAN_INTERVAL = 5
+FAST_REFRESH_INTERVAL = 1
+SLOW_REFRESH_INTERVAL = 60
+POLL_JITTER = 0.2
+STATE_WAIT_POLL_INTERVAL = 0.25
+EVENT_DEBOUNCE_COOLDOWN = 0.2
+CONTENT_DETAILS_DEBOUNCE = 0.4
+DEFAULT_MACRO_WAIT_TIMEOUT = 5.0
+SSDP_DEFAULT_MAX_AGE = 1800
+PLAYBACK_SEEK_TOLERANCE = 2.0
 CONF_DEBUG_COMMANDS = "debug_commands"
 DEFAULT_DEBUG_COMMANDS = False
 CONF_ALLOW_RAW_COMMANDS = "allow_raw_commands"
 DEFAULT_ALLOW_RAW_COMMANDS = False
+CONF_RATE_LIMIT = "rate_limit"
+DEFAULT_RATE_LIMIT = 20.0
+CONF_RATE_BURST = "rate_burst"
+DEFAULT_RATE_BURST = 20
+CONF_WAIT_FOR_STATE = "wait_for_state"
+DEFAULT_WAIT_FOR_STATE = False
+CONF_WAIT_TIMEOUT = "wait_timeout"
+DEFAULT_WAIT_TIMEOUT = 30.0
+CONF_UPDATE_BATCH_WINDOW = "update_batch_window"
+DEFAULT_UPDATE_BATCH_WINDOW = 20
+CONF_FAST_REFRESH_COMMANDS = "fast_refresh_commands"
+# Empty by default: play status arrives as event messages and time remaining is computed
+# locally, so a one-second poll would only add listener passes and recorder writes.
+DEFAULT_FAST_REFRESH_COMMANDS: list[str] = []
+CONF_SLOW_REFRESH_COMMANDS = "slow_refresh_commands"
+DEFAULT_SLOW_REFRESH_COMMANDS = [
+    "GET_DEVICE_INFO",
+    "GET_VIDEO_COLOR",
+    "GET_CINEMASCAPE_MODE",
+    "GET_CINEMASCAPE_MASK",
+]
+CONF_EVENT_ONLY_COMMANDS = "event_only_commands"
+DEFAULT_EVENT_ONLY_COMMANDS: list[str] = []
+CONF_PLAYBACK_OFFSETS = "playback_offsets"
+DEFAULT_PLAYBACK_OFFSETS = "300"
+CONF_COMPACT_ENTITIES = "compact_entities"
+DEFAULT_COMPACT_ENTITIES = False
+CONF_SYSTEM_MODE = "system_mode"
+DEFAULT_SYSTEM_MODE = False
+CONF_PLAYERS = "players"
+CONF_HOSTS = "hosts"
+CONF_DEVICES = "devices"
 DATA_IS_MOVIE_PLAYER = "is_movie_player"
 DATA_DEVICE_TYPE = "device_type"
-PLATFORMS: list[Platform] = [Platform.REMOTE, Platform.SENSOR, Platform.MEDIA_PLAYER]
-
-COMMAND_ALIASES: dict[str, str] = {
-    "up": "UP",
-    "down": "DOWN",
-    "left": "LEFT",
-    "right": "RIGHT",
-    "select": "SELECT",
-    "ok": "SELECT",
-    "enter": "SELECT",
-    "back": "BACK",
-    "cancel": "CANCEL",
-    "exit": "BACK",
-    "home": "HOME",
-    "menu": "MENU",
-    "play": "PLAY",
-    "pause": "PAUSE",
-    "stop": "STOP_OR_CANCEL",
-    "next": "NEXT",
-    "previous": "PREVIOUS",
-    "rewind": "SCAN_REVERSE",
-    "replay": "REPLAY",
-    "fast_forward": "SCAN_FORWARD",
-    "info": "INFO",
-    "power_on": "LEAVE_STANDBY",
-    "turn_on": "LEAVE_STANDBY",
-    "on": "LEAVE_STANDBY",
-    "power_off": "ENTER_STANDBY",
-    "turn_off": "ENTER_STANDBY",
-    "off": "ENTER_STANDBY",
-    "intermission_on": "INTERMISSION_ON",
-    "intermission_off": "INTERMISSION_OFF",
-    "intermission_toggle": "INTERMISSION_TOGGLE",
-    "intermission": "INTERMISSION_TOGGLE",
-    "movie_list": "GO_MOVIE_LIST",
-    "movie_collections": "GO_MOVIE_COLLECTIONS",
-    "movie_covers": "GO_MOVIE_COVERS",
-    "movies": "GO_MOVIE_COLLECTIONS",
-    "system_status": "GO_SYSTEM_STATUS",
-    "settings": "GO_SYSTEM_STATUS",
-    "details": "DETAILS",
-    "kaleidescape_menu_toggle": "KALEIDESCAPE_MENU_TOGGLE",
-    "kaleidescape_menu_on": "KALEIDESCAPE_MENU_ON",
-    "kaleidescape_menu_off": "KALEIDESCAPE_MENU_OFF",
-    "navigation": "SHOW_NAVIGATION_OVERLAY",
-    "navigation_overlay": "SHOW_NAVIGATION_OVERLAY",
-    "shuffle_covers": "SHUFFLE_COVER_ART",
+DATA_PLAYERS = "players"
+DATA_PLAYER_ID = "player_id"
+DATA_POLL_SCHEDULER = "poll_scheduler"
+EVENT_KALEIDESCAPE = f"{DOMAIN}_event"
+ATTR_EVENT_TYPE = "type"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+METADATA_SAVE_DELAY = 5
+METADATA_NOTIFY_INTERVAL = 1.0
+DEFAULT_METADATA_WINDOW = 4
+METADATA_RETRY_INITIAL = 30
+METADATA_RETRY_MAX = 1800
+# Option holding a refresh tier's commands -> (default commands, poll interval). Commands in
+# no tier are polled every SENSOR_SCAN_INTERVAL; event-only ones only on a full refresh.
+REFRESH_TIERS: dict[str, tuple[list[str], float | None]] = {
+    CONF_FAST_REFRESH_COMMANDS: (DEFAULT_FAST_REFRESH_COMMANDS, FAST_REFRESH_INTERVAL),
+    CONF_SLOW_REFRESH_COMMANDS: (DEFAULT_SLOW_REFRESH_COMMANDS, SLOW_REFRESH_INTERVAL),
+    CONF_EVENT_ONLY_COMMANDS: (DEFAULT_EVENT_ONLY_COMMANDS, None),
 }
+PLATFORMS: list[Platform] = [Platform.REMOTE, Platform.SENSOR, Platform.MEDIA_PLAYER]
@@ -1,54 +1,55 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
-from datetime import timedelta
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import KaleidescapeClient
-from .const import DOMAIN, SENSOR_SCAN_INTERVAL
+from .const import (
+    CONF_UPDATE_BATCH_WINDOW,
+    CONTENT_DETAILS_DEBOUNCE,
+    DATA_DEVICE_TYPE,
+    DATA_IS_MOVIE_PLAYER,
+    DEFAULT_UPDATE_BATCH_WINDOW,
+    DOMAIN,
+    REFRESH_TIERS,
+    SENSOR_SCAN_INTERVAL,
+    STATE_WAIT_POLL_INTERVAL,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .kaleidescape_protocol import (
+    EMPTY_PLAYBACK_STATE,
+    PLAYER_STATE_COMMANDS,
+    SHARED_STATE_COMMANDS,
+    KaleidescapeClient,
+    PlaybackState,
+    StateValue,
+    state_commands_for_keys,
+)
+from .metadata import KaleidescapeMetadataSync
 
 _LOGGER = logging.getLogger(__name__)
 
-DEFAULT_PLAYBACK_STATE: dict[str, str | int | float] = {
-    "serial": "",
-    "cpdid": "",
-    "device_ip": "",
-    "media_location": "none",
-    "play_status": "none",
-    "play_speed": 0,
-    "title_length": 0,
-    "title_location": 0,
-    "chapter_length": 0,
-    "chapter_location": 0,
-    "media_title": "",
-    "media_content_id": "",
-    "media_content_type": "none",
-    "media_image_url": "",
-    "video_mode": "none",
-    "video_color_eotf": "unknown",
-    "video_color_space": "default",
-    "video_color_depth": "unknown",
-    "video_color_sampling": "none",
-    "screen_mask_ratio": "none",
-    "screen_mask_top_trim_rel": 0.0,
-    "screen_mask_bottom_trim_rel": 0.0,
-    "screen_mask_conservative_ratio": "none",
-    "screen_mask_top_mask_abs": 0.0,
-    "screen_mask_bottom_mask_abs": 0.0,
-    "cinemascape_mode": "none",
-    "cinemascape_mask": 0,
-    "system_readiness_state": "idle",
-    "power_state": "standby",
-    "ui_screen": "unknown",
-    "ui_popup": "none",
-    "ui_dialog": "none",
-}
-
-
-class KaleidescapeSensorCoordinator(DataUpdateCoordinator[dict[str, str | int | float | None]]):
+
+def _snapshot_store(
+    hass: HomeAssistant, entry_id: str, player_id: str = ""
+) -> Store[dict[str, Any]]:
+    key = f"{DOMAIN}.{entry_id}.{player_id}" if player_id else f"{DOMAIN}.{entry_id}"
+    return Store(hass, STORAGE_VERSION, key)
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str, player_id: str = "") -> None:
+    await _snapshot_store(hass, entry_id, player_id).async_remove()
+
+
+class KaleidescapeSensorCoordinator(DataUpdateCoordinator[PlaybackState]):
     def __init__(
         self,
         hass: HomeAssistant,
@@ -56,24 +57,281 @@ class KaleidescapeSensorCoordinator(DataUpdateCoordinator[dict[str, str | int |
         client: KaleidescapeClient,
         *,
         include_player_metrics: bool,
+        player_id: str = "",
+        metadata: KaleidescapeMetadataSync | None = None,
     ) -> None:
         self._client = client
+        self._metadata = metadata
         self._include_player_metrics = include_player_metrics
+        self._store = _snapshot_store(hass, entry.entry_id, player_id)
+        scope = f"{entry.entry_id}_{player_id}" if player_id else entry.entry_id
+        self._device_profile: dict[str, Any] = {}
+        self._batch_window = (
+            entry.options.get(CONF_UPDATE_BATCH_WINDOW, DEFAULT_UPDATE_BATCH_WINDOW) / 1000
+        )
+        self._pending_state: dict[str, Any] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._details_wanted: str | None = None
+        self._details_handle: str | None = None
+        self._details: tuple[str | None, str | None] = (None, None)
+        self._details_timer: asyncio.TimerHandle | None = None
+        self._details_task: asyncio.Task[None] | None = None
         super().__init__(
             hass,
             _LOGGER,
             config_entry=entry,
-            name=f"{DOMAIN}_{entry.entry_id}_sensors",
-            update_interval=timedelta(seconds=SENSOR_SCAN_INTERVAL),
+            name=f"{DOMAIN}_{scope}_sensors",
+            # Polls are driven by the shared KaleidescapePollScheduler.
+            update_interval=None,
+        )
+
+    @property
+    def paused(self) -> bool:
+        """Whether polling is suspended because the player has left the network."""
+        return not self._client.present
+
+    async def async_restore(self) -> dict[str, Any]:
+        """Load the last-known snapshot and return the stored device profile."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict):
+            return {}
+
+        snapshot = stored.get("data")
+        if isinstance(snapshot, dict):
+            self.data = PlaybackState.from_mapping(snapshot)
+
+        profile = stored.get("profile")
+        if isinstance(profile, dict):
+            self._device_profile = {
+                key: profile[key]
+                for key in (DATA_IS_MOVIE_PLAYER, DATA_DEVICE_TYPE)
+                if key in profile
+            }
+            self._include_player_metrics = bool(
+                self._device_profile.get(DATA_IS_MOVIE_PLAYER, self._include_player_metrics)
+            )
+        return dict(self._device_profile)
+
+    async def async_save_profile(self, is_movie_player: bool, device_type: str) -> None:
+        profile = {DATA_IS_MOVIE_PLAYER: is_movie_player, DATA_DEVICE_TYPE: device_type}
+        if profile == self._device_profile:
+            return
+        self._device_profile = profile
+        self._include_player_metrics = is_movie_player
+        await self._store.async_save(self._stored_data())
+
+    def _stored_data(self) -> dict[str, Any]:
+        data = self.data.as_dict() if self.data is not None else None
+        return {"data": data, "profile": self._device_profile}
+
+    async def _async_update_data(self) -> PlaybackState:
+        try:
+            response = await self._client.async_query_playback_state(
+                include_player_metrics=self._include_player_metrics
+            )
+        except (OSError, TimeoutError) as err:
+            raise UpdateFailed(f"Unable to poll Kaleidescape player: {err!r}") from err
+        previous = self.data or EMPTY_PLAYBACK_STATE
+        values = {**self._take_pending_state(), **response}
+        data = previous.updated({**values, **self._content_detail_fields(values)}, complete=True)
+        if data is not self.data:
+            self._store.async_delay_save(self._stored_data, STORAGE_SAVE_DELAY)
+        self._async_track_content(data)
+        return data
+
+    def refresh_tiers(self) -> dict[float, list[str]]:
+        """Group the polled commands by refresh interval; event-only commands are left out."""
+        commands = list(SHARED_STATE_COMMANDS)
+        if self._include_player_metrics:
+            commands.extend(PLAYER_STATE_COMMANDS)
+
+        options = self.config_entry.options
+        intervals: dict[str, float | None] = {}
+        for option, (default_commands, interval) in REFRESH_TIERS.items():
+            for command in options.get(option, default_commands):
+                intervals.setdefault(command, interval)
+
+        tiers: dict[float, list[str]] = {}
+        for command in commands:
+            if (interval := intervals.get(command, SENSOR_SCAN_INTERVAL)) is not None:
+                tiers.setdefault(interval, []).append(command)
+        return tiers
+
+    @property
+    def poll_target(self) -> tuple[object, str]:
+        """Connection and device polled; coordinators sharing one share their polls."""
+        return self._client.connection, self._client.device_id
+
+    async def async_query_commands(self, commands: Iterable[str]) -> dict[str, StateValue]:
+        return await self._client.async_query_state(commands)
+
+    @callback
+    def async_apply_polled_state(self, partial: Mapping[str, StateValue]) -> None:
+        """Apply one refresh tier's poll as one update."""
+        previous = self.data or EMPTY_PLAYBACK_STATE
+        values = {**self._take_pending_state(), **partial}
+        data = previous.updated({**values, **self._content_detail_fields(values)})
+        if data is not self.data:
+            self._store.async_delay_save(self._stored_data, STORAGE_SAVE_DELAY)
+        if data is not self.data or not self.last_update_success:
+            self.async_set_updated_data(data)
+        self._async_track_content(data)
+
+    async def async_refresh_keys(self, keys: Iterable[str]) -> None:
+        """Poll only the commands behind the given state keys and merge the result."""
+        partial = await self._client.async_query_state(state_commands_for_keys(keys))
+        self.async_merge_state(partial)
+
+    @callback
+    def async_merge_state(self, partial: Mapping[str, Any]) -> None:
+        """Merge decoded fields into the current data without rescheduling the poll.
+
+        Fields merged within the batch window of the first one are applied together, so a
+        burst of event messages causes one listener update.
+        """
+        self._pending_state.update(partial)
+        if not self._batch_window:
+            self._async_flush_pending_state()
+        elif self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                self._batch_window, self._async_flush_pending_state
+            )
+
+    def _take_pending_state(self) -> dict[str, Any]:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending_state = self._pending_state, {}
+        return pending
+
+    @callback
+    def _async_flush_pending_state(self) -> None:
+        values = self._take_pending_state()
+        data = (self.data or EMPTY_PLAYBACK_STATE).updated(
+            {**values, **self._content_detail_fields(values)}
         )
+        if data is not self.data:
+            self._store.async_delay_save(self._stored_data, STORAGE_SAVE_DELAY)
+        elif self.last_update_success:
+            return
+        # Also clears an earlier poll failure: the player is evidently sending data. Polls are
+        # scheduled by KaleidescapePollScheduler, so this does not reschedule anything.
+        self.async_set_updated_data(data)
+        self._async_track_content(data)
+
+    def _content_detail_fields(self, values: Mapping[str, Any]) -> dict[str, StateValue]:
+        """Return the looked-up details to apply on top of values for the highlighted handle.
+
+        Keys missing from values, as after a partial poll, are taken from the current data.
+        """
+        current = self.data or EMPTY_PLAYBACK_STATE
+        handle = values.get("media_content_id", current.media_content_id)
+        if not handle or handle != self._details_handle:
+            return {}
+        title, image_url = self._details
+        fields: dict[str, StateValue] = {"media_image_url": image_url}
+        if not values.get("media_title", current.media_title):
+            fields["media_title"] = title
+        return fields
+
+    @callback
+    def _async_track_content(self, data: PlaybackState) -> None:
+        """Look up details for the highlighted content once it stops changing.
+
+        While covers are scrolled the handle changes continuously; each change restarts the
+        debounce and cancels a lookup still waiting on the player.
+        """
+        handle = data.get("media_content_id") or None
+        if handle == self._details_wanted:
+            return
+        self._details_wanted = handle
+        self._cancel_content_lookup()
+        if handle == self._details_handle:
+            return
+        # Details of the previous handle must not outlive it, even if this lookup fails.
+        self._details_handle = None
+        self._details = (None, None)
+        if handle is None:
+            return
+        if self._metadata is not None and (details := self._metadata.details(handle)):
+            self._details_handle = handle
+            self._details = details
+            self.async_merge_state(self._content_detail_fields(data))
+        else:
+            self._details_timer = self.hass.loop.call_later(
+                CONTENT_DETAILS_DEBOUNCE, self._async_start_content_lookup, handle
+            )
 
-    async def _async_update_data(self) -> dict[str, str | int | float | None]:
-        response = await self._client.async_query_playback_state(
-            include_player_metrics=self._include_player_metrics
+    @callback
+    def _async_start_content_lookup(self, handle: str) -> None:
+        self._details_timer = None
+        self._details_task = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_fetch_content_details(handle),
+            f"{self.name}_content_details",
         )
-        return {
-            key: response.get(key)
-            if response.get(key) is not None
-            else DEFAULT_PLAYBACK_STATE[key]
-            for key in DEFAULT_PLAYBACK_STATE
-        }
+
+    async def _async_fetch_content_details(self, handle: str) -> None:
+        try:
+            details = await self._client.async_get_content_details(handle)
+        except (OSError, TimeoutError):
+            _LOGGER.debug("Unable to read Kaleidescape content details for %s", handle)
+            return
+        finally:
+            if self._details_task is asyncio.current_task():
+                self._details_task = None
+        if details is None:
+            return
+        self._details_handle = handle
+        self._details = details
+        if self.data is not None:
+            self.async_merge_state(self._content_detail_fields(self.data))
+
+    def _cancel_content_lookup(self) -> None:
+        if self._details_timer is not None:
+            self._details_timer.cancel()
+            self._details_timer = None
+        if self._details_task is not None:
+            self._details_task.cancel()
+            self._details_task = None
+
+    async def async_shutdown(self) -> None:
+        self._take_pending_state()
+        self._cancel_content_lookup()
+        await super().async_shutdown()
+
+    async def async_wait_for(
+        self,
+        condition: Callable[[Mapping[str, Any]], bool],
+        keys: Iterable[str],
+        timeout: float,
+    ) -> bool:
+        """Wait until condition holds on the player state, polling only the given keys.
+
+        Returns False if the deadline passes first. Updates from any other source, such
+        as the regular poll, are checked as soon as they are applied.
+        """
+        if self.data and condition(self.data):
+            return True
+
+        keys = list(keys)
+        condition_met = asyncio.Event()
+
+        @callback
+        def _check_condition() -> None:
+            if self.data and condition(self.data):
+                condition_met.set()
+
+        remove_listener = self.async_add_listener(_check_condition)
+        try:
+            async with asyncio.timeout(timeout):
+                while not condition_met.is_set():
+                    with contextlib.suppress(OSError, TimeoutError):
+                        await self.async_refresh_keys(keys)
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(condition_met.wait(), STATE_WAIT_POLL_INTERVAL)
+        except TimeoutError:
+            return False
+        finally:
+            remove_listener()
+        return True
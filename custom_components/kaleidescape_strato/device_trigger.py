@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.components.homeassistant.triggers.state import CONF_TO
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import ATTR_EVENT_TYPE, DOMAIN, EVENT_KALEIDESCAPE
+from .events import EVENT_TYPES
+from .kaleidescape_protocol import MOVIE_LOCATION_INDEX, PLAY_STATUS_INDEX
+from .playback import ATTR_OFFSET, EVENT_TYPE_PLAYBACK_BOUNDARY
+
+TRIGGER_TYPES: tuple[str, ...] = (*EVENT_TYPES, EVENT_TYPE_PLAYBACK_BOUNDARY)
+
+# Trigger type -> (event data key matched by "to", allowed values).
+TRIGGER_TARGETS: dict[str, tuple[str, list[str]]] = {
+    "movie_location": ("media_location", list(MOVIE_LOCATION_INDEX.values())),
+    "play_status": ("play_status", list(PLAY_STATUS_INDEX.values())),
+}
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+        vol.Optional(CONF_TO): str,
+        vol.Optional(ATTR_OFFSET): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict[str, str]]:
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    if config[CONF_TYPE] == EVENT_TYPE_PLAYBACK_BOUNDARY:
+        # Without an offset the trigger fires at every configured boundary.
+        return {
+            "extra_fields": vol.Schema(
+                {vol.Optional(ATTR_OFFSET): vol.All(vol.Coerce(int), vol.Range(min=1))}
+            )
+        }
+    if (target := TRIGGER_TARGETS.get(config[CONF_TYPE])) is None:
+        return {}
+    return {"extra_fields": vol.Schema({vol.Optional(CONF_TO): vol.In(target[1])})}
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    event_data = {
+        CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+        ATTR_EVENT_TYPE: config[CONF_TYPE],
+    }
+    if CONF_TO in config and (target := TRIGGER_TARGETS.get(config[CONF_TYPE])) is not None:
+        event_data[target[0]] = config[CONF_TO]
+    if ATTR_OFFSET in config:
+        event_data[ATTR_OFFSET] = config[ATTR_OFFSET]
+
+    event_config = event_trigger.TRIGGER_SCHEMA(
+        {
+            event_trigger.CONF_PLATFORM: "event",
+            event_trigger.CONF_EVENT_TYPE: EVENT_KALEIDESCAPE,
+            event_trigger.CONF_EVENT_DATA: event_data,
+        }
+    )
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
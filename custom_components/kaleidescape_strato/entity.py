@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from .const import DATA_DEVICE_TYPE, DATA_PLAYER_ID, DOMAIN
+
+
+def player_unique_id(entry: ConfigEntry, player: dict[str, Any], key: str) -> str:
+    if player_id := player[DATA_PLAYER_ID]:
+        return f"{entry.entry_id}_{player_id}_{key}"
+    return f"{entry.entry_id}_{key}"
+
+
+def player_device_identifier(entry: ConfigEntry, player: dict[str, Any]) -> str:
+    if player_id := player[DATA_PLAYER_ID]:
+        return f"{entry.entry_id}_{player_id}"
+    return entry.entry_id
+
+
+def remove_player_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    player: dict[str, Any],
+    platform: str,
+    keys: Iterable[str],
+) -> None:
+    """Drop registry entries of entities a player no longer provides."""
+    entity_registry = er.async_get(hass)
+    for key in keys:
+        if entity_id := entity_registry.async_get_entity_id(
+            platform, DOMAIN, player_unique_id(entry, player, key)
+        ):
+            entity_registry.async_remove(entity_id)
+
+
+def player_registry_device_id(
+    hass: HomeAssistant, entry: ConfigEntry, player: dict[str, Any]
+) -> str | None:
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, player_device_identifier(entry, player))}
+    )
+    return device.id if device is not None else None
+
+
+def player_device_info(entry: ConfigEntry, player: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "identifiers": {(DOMAIN, player_device_identifier(entry, player))},
+        "manufacturer": "Kaleidescape",
+        "model": str(player.get(DATA_DEVICE_TYPE, "Kaleidescape")),
+        "name": player[CONF_NAME],
+    }
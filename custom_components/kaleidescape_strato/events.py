@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import ATTR_EVENT_TYPE, EVENT_DEBOUNCE_COOLDOWN, EVENT_KALEIDESCAPE
+from .coordinator import KaleidescapeSensorCoordinator
+from .entity import player_registry_device_id
+from .kaleidescape_protocol import KaleidescapeResponse, StateValue, decode_state_response
+
+# Event message name -> (event type, state keys whose change is a transition).
+EVENT_TRANSITIONS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "MOVIE_LOCATION": ("movie_location", ("media_location",)),
+    "PLAY_STATUS": ("play_status", ("play_status", "play_speed")),
+    "UI_STATE": ("ui_state", ("ui_screen", "ui_popup", "ui_dialog")),
+    "SCREEN_MASK": (
+        "screen_mask",
+        (
+            "screen_mask_ratio",
+            "screen_mask_top_trim_rel",
+            "screen_mask_bottom_trim_rel",
+            "screen_mask_conservative_ratio",
+            "screen_mask_top_mask_abs",
+            "screen_mask_bottom_mask_abs",
+        ),
+    ),
+}
+EVENT_TYPES: tuple[str, ...] = tuple(event_type for event_type, _ in EVENT_TRANSITIONS.values())
+
+
+class _Transition:
+    """Debounced transition tracking for one event type on one player.
+
+    The first change fires immediately; further changes inside the cooldown collapse into
+    one event carrying the settled values when the cooldown ends.
+    """
+
+    def __init__(self, event_type: str, keys: tuple[str, ...]) -> None:
+        self.event_type = event_type
+        self.keys = keys
+        self.fired: dict[str, StateValue] | None = None
+        self.pending: dict[str, StateValue] | None = None
+        self.cancel_cooldown: CALLBACK_TYPE | None = None
+
+
+class KaleidescapeEventDispatcher:
+    """Fire kaleidescape_strato_event bus events straight from a player's event messages."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        player: dict[str, Any],
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._player = player
+        self._coordinator: KaleidescapeSensorCoordinator = player["sensor_coordinator"]
+        self._transitions = {
+            name: _Transition(event_type, keys)
+            for name, (event_type, keys) in EVENT_TRANSITIONS.items()
+        }
+        self._device_id: str | None = None
+        self._remove_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        self._remove_listener = self._player["client"].add_event_listener(self._handle_event)
+
+    @callback
+    def async_stop(self) -> None:
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        for transition in self._transitions.values():
+            if transition.cancel_cooldown is not None:
+                transition.cancel_cooldown()
+                transition.cancel_cooldown = None
+
+    @callback
+    def _handle_event(self, event: KaleidescapeResponse) -> None:
+        decoded = decode_state_response(event)
+        if not decoded:
+            return
+        if (transition := self._transitions.get(event.name)) is not None:
+            if transition.fired is None:
+                known = self._coordinator.data or {}
+                transition.fired = {key: known.get(key) for key in transition.keys}
+            values = {key: decoded.get(key) for key in transition.keys}
+            if transition.cancel_cooldown is not None:
+                transition.pending = values
+            else:
+                self._fire(transition, values)
+        self._coordinator.async_merge_state(decoded)
+
+    @callback
+    def _fire(self, transition: _Transition, values: dict[str, StateValue]) -> None:
+        previous = transition.fired or {}
+        if values == previous:
+            return
+        transition.fired = values
+        self._hass.bus.async_fire(
+            EVENT_KALEIDESCAPE,
+            {
+                CONF_DEVICE_ID: self._registry_device_id(),
+                ATTR_EVENT_TYPE: transition.event_type,
+                **values,
+                **{f"previous_{key}": value for key, value in previous.items()},
+            },
+        )
+
+        @callback
+        def _cooldown_finished(_now: Any) -> None:
+            transition.cancel_cooldown = None
+            if (pending := transition.pending) is not None:
+                transition.pending = None
+                self._fire(transition, pending)
+
+        transition.cancel_cooldown = async_call_later(
+            self._hass, EVENT_DEBOUNCE_COOLDOWN, _cooldown_finished
+        )
+
+    def _registry_device_id(self) -> str | None:
+        if self._device_id is None:
+            self._device_id = player_registry_device_id(self._hass, self._entry, self._player)
+        return self._device_id
@@ -0,0 +1,109 @@
+"""Kaleidescape control protocol: framing, state codec, index tables, client and discovery.
+
+Nothing here imports Home Assistant. Submodules load on first attribute access, so code that
+only parses or decodes messages never pays for asyncio or the command alias table.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .aliases import COMMAND_ALIASES
+    from .client import (
+        KaleidescapeClient,
+        KaleidescapeConnection,
+        KaleidescapeUnavailableError,
+        ProtocolCapture,
+    )
+    from .codec import (
+        EMPTY_PLAYBACK_STATE,
+        PLAYBACK_STATE_DEFAULTS,
+        PLAYBACK_STATE_KEYS,
+        PLAYER_STATE_COMMANDS,
+        SHARED_STATE_COMMANDS,
+        PlaybackState,
+        StateValue,
+        decode_state_response,
+        state_commands_for_keys,
+    )
+    from .discovery import (
+        KaleidescapeDevice,
+        async_probe,
+        async_scan,
+        expand_scan_targets,
+    )
+    from .framing import (
+        EVENT_SEQUENCE,
+        LOCAL_CPDID,
+        KaleidescapeResponse,
+        parse_response_message,
+    )
+    from .tables import MOVIE_LOCATION_INDEX, PLAY_STATUS_INDEX
+
+_EXPORTS: dict[str, str] = {
+    "COMMAND_ALIASES": "aliases",
+    "KaleidescapeClient": "client",
+    "KaleidescapeConnection": "client",
+    "KaleidescapeUnavailableError": "client",
+    "ProtocolCapture": "client",
+    "EMPTY_PLAYBACK_STATE": "codec",
+    "PLAYBACK_STATE_DEFAULTS": "codec",
+    "PLAYBACK_STATE_KEYS": "codec",
+    "PLAYER_STATE_COMMANDS": "codec",
+    "SHARED_STATE_COMMANDS": "codec",
+    "PlaybackState": "codec",
+    "StateValue": "codec",
+    "decode_state_response": "codec",
+    "state_commands_for_keys": "codec",
+    "KaleidescapeDevice": "discovery",
+    "async_probe": "discovery",
+    "async_scan": "discovery",
+    "expand_scan_targets": "discovery",
+    "EVENT_SEQUENCE": "framing",
+    "LOCAL_CPDID": "framing",
+    "KaleidescapeResponse": "framing",
+    "parse_response_message": "framing",
+    "MOVIE_LOCATION_INDEX": "tables",
+    "PLAY_STATUS_INDEX": "tables",
+}
+
+__all__ = [
+    "COMMAND_ALIASES",
+    "KaleidescapeClient",
+    "KaleidescapeConnection",
+    "KaleidescapeUnavailableError",
+    "ProtocolCapture",
+    "EMPTY_PLAYBACK_STATE",
+    "PLAYBACK_STATE_DEFAULTS",
+    "PLAYBACK_STATE_KEYS",
+    "PLAYER_STATE_COMMANDS",
+    "SHARED_STATE_COMMANDS",
+    "PlaybackState",
+    "StateValue",
+    "decode_state_response",
+    "state_commands_for_keys",
+    "KaleidescapeDevice",
+    "async_probe",
+    "async_scan",
+    "expand_scan_targets",
+    "EVENT_SEQUENCE",
+    "LOCAL_CPDID",
+    "KaleidescapeResponse",
+    "parse_response_message",
+    "MOVIE_LOCATION_INDEX",
+    "PLAY_STATUS_INDEX",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if (module_name := _EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
@@ -0,0 +1,48 @@
+"""Home Assistant style remote command names mapped to protocol commands."""
+
+COMMAND_ALIASES: dict[str, str] = {
+    "up": "UP",
+    "down": "DOWN",
+    "left": "LEFT",
+    "right": "RIGHT",
+    "select": "SELECT",
+    "ok": "SELECT",
+    "enter": "SELECT",
+    "back": "BACK",
+    "cancel": "CANCEL",
+    "exit": "BACK",
+    "home": "HOME",
+    "menu": "MENU",
+    "play": "PLAY",
+    "pause": "PAUSE",
+    "stop": "STOP_OR_CANCEL",
+    "next": "NEXT",
+    "previous": "PREVIOUS",
+    "rewind": "SCAN_REVERSE",
+    "replay": "REPLAY",
+    "fast_forward": "SCAN_FORWARD",
+    "info": "INFO",
+    "power_on": "LEAVE_STANDBY",
+    "turn_on": "LEAVE_STANDBY",
+    "on": "LEAVE_STANDBY",
+    "power_off": "ENTER_STANDBY",
+    "turn_off": "ENTER_STANDBY",
+    "off": "ENTER_STANDBY",
+    "intermission_on": "INTERMISSION_ON",
+    "intermission_off": "INTERMISSION_OFF",
+    "intermission_toggle": "INTERMISSION_TOGGLE",
+    "intermission": "INTERMISSION_TOGGLE",
+    "movie_list": "GO_MOVIE_LIST",
+    "movie_collections": "GO_MOVIE_COLLECTIONS",
+    "movie_covers": "GO_MOVIE_COVERS",
+    "movies": "GO_MOVIE_COLLECTIONS",
+    "system_status": "GO_SYSTEM_STATUS",
+    "settings": "GO_SYSTEM_STATUS",
+    "details": "DETAILS",
+    "kaleidescape_menu_toggle": "KALEIDESCAPE_MENU_TOGGLE",
+    "kaleidescape_menu_on": "KALEIDESCAPE_MENU_ON",
+    "kaleidescape_menu_off": "KALEIDESCAPE_MENU_OFF",
+    "navigation": "SHOW_NAVIGATION_OVERLAY",
+    "navigation_overlay": "SHOW_NAVIGATION_OVERLAY",
+    "shuffle_covers": "SHUFFLE_COVER_ART",
+}
@@ -0,0 +1,171 @@
+"""Command-line probe and benchmark for Kaleidescape players, without Home Assistant.
+
+Run it from the repository root, where only the standard library is needed::
+
+    python -m kaleidescape_protocol.cli HOST query GET_PLAY_STATUS
+    python -m kaleidescape_protocol.cli HOST watch
+    python -m kaleidescape_protocol.cli HOST send up up select
+    python -m kaleidescape_protocol.cli HOST bench -n 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+from .aliases import COMMAND_ALIASES
+from .client import KaleidescapeClient
+from .codec import EMPTY_PLAYBACK_STATE, decode_state_response
+from .framing import LOCAL_CPDID, KaleidescapeResponse
+
+DEFAULT_PORT = 10000
+DEFAULT_TIMEOUT = 5.0
+PERCENTILES = (50, 90, 99)
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def _positive_float(text: str) -> float:
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _format_response(command: str, response: KaleidescapeResponse | None) -> str:
+    if response is None:
+        return f"{command}: no response"
+    line = f"{command}: status={response.status} {response.name} {':'.join(response.fields)}"
+    if decoded := decode_state_response(response):
+        line += "\n  " + " ".join(f"{key}={value}" for key, value in decoded.items())
+    return line
+
+
+async def _async_query(client: KaleidescapeClient, args: argparse.Namespace) -> int:
+    responses = await client.async_send_requests(args.commands)
+    for command, response in responses.items():
+        print(_format_response(command, response))
+    return 0
+
+
+async def _async_send(client: KaleidescapeClient, args: argparse.Namespace) -> int:
+    for command in args.commands:
+        resolved = COMMAND_ALIASES.get(command.strip().lower(), command.strip())
+        response = await client.async_send_request(resolved)
+        print(_format_response(resolved, response))
+    return 0
+
+
+async def _async_watch(client: KaleidescapeClient, args: argparse.Namespace) -> int:
+    state = EMPTY_PLAYBACK_STATE
+
+    def _show(source: str, values: dict) -> None:
+        nonlocal state
+        updated = state.updated(values, complete=source == "poll")
+        if updated is state:
+            return
+        state = updated
+        changes = " ".join(f"{key}={state[key]}" for key in state.changed_keys)
+        print(f"{time.strftime('%H:%M:%S')} {source:5} {changes}", flush=True)
+
+    client.add_event_listener(lambda event: _show("event", decode_state_response(event)))
+    while True:
+        _show("poll", await client.async_query_playback_state())
+        await asyncio.sleep(args.interval)
+
+
+async def _async_timed(operation: Callable[[], Awaitable[object]]) -> float:
+    started = time.perf_counter()
+    await operation()
+    return (time.perf_counter() - started) * 1000
+
+
+async def _async_bench(client: KaleidescapeClient, args: argparse.Namespace) -> int:
+    samples: dict[str, list[float]] = {"connect": [], "rtt": [], "poll": []}
+    for _ in range(args.iterations):
+        await client.async_close()
+        samples["connect"].append(await _async_timed(client.connection.async_connect))
+        samples["rtt"].append(
+            await _async_timed(lambda: client.async_send_request("GET_DEVICE_POWER_STATE"))
+        )
+        samples["poll"].append(await _async_timed(client.async_query_playback_state))
+
+    header = " ".join(f"{'p' + str(p):>8}" for p in PERCENTILES)
+    print(f"{'ms':8} {'min':>8} {header} {'max':>8}  (n={args.iterations})")
+    for name, values in samples.items():
+        columns = " ".join(f"{_percentile(values, p):8.1f}" for p in PERCENTILES)
+        print(f"{name:8} {min(values):8.1f} {columns} {max(values):8.1f}")
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m kaleidescape_protocol.cli", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("host")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--timeout", type=_positive_float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--device", default=LOCAL_CPDID, help="device ID, e.g. #SERIAL")
+    parser.add_argument("--debug", action="store_true", help="log every frame")
+    commands = parser.add_subparsers(dest="action", required=True)
+
+    query = commands.add_parser("query", help="send GET_* requests and print the responses")
+    query.add_argument("commands", nargs="+")
+    query.set_defaults(handler=_async_query)
+
+    send = commands.add_parser("send", help="send commands or remote aliases in order")
+    send.add_argument("commands", nargs="+")
+    send.set_defaults(handler=_async_send)
+
+    watch = commands.add_parser("watch", help="print decoded state changes as they happen")
+    watch.add_argument(
+        "--interval", type=_positive_float, default=5.0, help="poll interval in seconds"
+    )
+    watch.set_defaults(handler=_async_watch)
+
+    bench = commands.add_parser("bench", help="measure connect, round-trip and poll latency")
+    bench.add_argument("-n", "--iterations", type=_positive_int, default=20)
+    bench.set_defaults(handler=_async_bench)
+    return parser
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    client = KaleidescapeClient(
+        args.host, args.port, args.timeout, args.debug, device_id=args.device
+    )
+    try:
+        return await args.handler(client, args)
+    finally:
+        await client.async_close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.debug else logging.WARNING)
+    try:
+        return asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, TimeoutError) as err:
+        print(f"error: {err!r}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,992 @@
+"""Long-lived control connection and per-player client."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import socket
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import NamedTuple
+
+from .codec import (
+    PLAYER_STATE_COMMANDS,
+    SHARED_STATE_COMMANDS,
+    StateValue,
+    decode_state_response,
+    parse_int,
+)
+from .framing import (
+    CONTINUATION_MESSAGES,
+    ENABLE_EVENTS_BODY,
+    EVENT_SEQUENCE,
+    LOCAL_CPDID,
+    MERGEABLE_PREFIX,
+    SEQUENCE_NUMBERS,
+    KaleidescapeResponse,
+    message_sequence,
+    parse_response_message,
+    split_command,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_INITIAL_BACKOFF = 5.0
+BREAKER_MAX_BACKOFF = 300.0
+
+RTT_ALPHA = 0.125
+RTT_BETA = 0.25
+RTT_VARIANCE_MULTIPLIER = 4
+# RFC 6298 minimum; replies to the heavier GETs routinely take a few hundred milliseconds.
+RTT_TIMEOUT_FLOOR = 1.0
+
+KEEPALIVE_IDLE = 5.0
+KEEPALIVE_TIMEOUT = 2.0
+KEEPALIVE_COMMAND = "GET_DEVICE_POWER_STATE"
+TCP_KEEPALIVE_IDLE = 5
+TCP_KEEPALIVE_INTERVAL = 2
+TCP_KEEPALIVE_COUNT = 3
+
+BULK_WINDOW = 4
+BULK_RESERVED_SEQUENCES = 2
+BULK_YIELD_INTERVAL = 0.05
+
+# About an hour of the default polling on one player, and a few tens of megabytes at most.
+CAPTURE_MAX_FRAMES = 50_000
+
+
+def _enable_tcp_keepalive(writer: asyncio.StreamWriter) -> None:
+    """Have the kernel probe the socket too, where the platform exposes the timers."""
+    sock = writer.get_extra_info("socket")
+    if sock is None:
+        return
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for option, value in (
+        ("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE),
+        ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL),
+        ("TCP_KEEPCNT", TCP_KEEPALIVE_COUNT),
+    ):
+        if hasattr(socket, option):
+            sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+
+class KaleidescapeUnavailableError(ConnectionError):
+    """Raised without touching the network while the player's circuit breaker is open."""
+
+
+class _RttEstimator:
+    """Smoothed round-trip time and variance, as used for TCP retransmission timers."""
+
+    def __init__(self) -> None:
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self._backoff = 1
+
+    def sample(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+        self._backoff = 1
+
+    def timed_out(self) -> None:
+        self._backoff = min(self._backoff * 2, 64)
+
+    def timeout(self, ceiling: float) -> float:
+        if self.srtt is None:
+            return ceiling
+        rto = (self.srtt + RTT_VARIANCE_MULTIPLIER * self.rttvar) * self._backoff
+        return min(max(rto, RTT_TIMEOUT_FLOOR), ceiling)
+
+
+class _TokenBucket:
+    """Token-bucket limiter that queues callers in FIFO order instead of dropping them."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waiting = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.burst)
+        self._updated = now
+
+    async def async_acquire(self) -> None:
+        self.waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                while self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self.waiting -= 1
+
+
+class ProtocolCapture:
+    """Raw frames sent (">") and received ("<") on a connection, timestamped from start.
+
+    Recording stops at max_frames, so a capture that is never stopped stays bounded.
+    """
+
+    def __init__(self, max_frames: int = CAPTURE_MAX_FRAMES) -> None:
+        self.started = time.monotonic()
+        self.frames: list[tuple[float, str, str]] = []
+        self.max_frames = max_frames
+        self.truncated = False
+
+    def record(self, direction: str, frame: str) -> None:
+        if len(self.frames) >= self.max_frames:
+            if not self.truncated:
+                self.truncated = True
+                _LOGGER.warning(
+                    "Kaleidescape capture reached %d frames, later frames are dropped",
+                    self.max_frames,
+                )
+            return
+        self.frames.append((time.monotonic() - self.started, direction, frame))
+
+
+class _ConnectionSettings(NamedTuple):
+    timeout: float
+    debug_commands: bool
+    rate_limit: float | None
+    rate_burst: int
+
+
+class _PendingRequest(NamedTuple):
+    future: asyncio.Future[KaleidescapeResponse | None]
+    sent_at: float
+    key: tuple[str, str]
+
+
+class KaleidescapeConnection:
+    """Long-lived control connection shared by every player addressed through one host."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float,
+        debug_commands: bool = False,
+        rate_limit: float | None = None,
+        rate_burst: int = 1,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._debug_commands = debug_commands
+        self._rate_limiter = _TokenBucket(rate_limit, rate_burst) if rate_limit else None
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+        self._probe_in_flight = False
+        self._present = True
+        self._availability_listeners: list[Callable[[bool], None]] = []
+        self._event_listeners: list[tuple[str, Callable[[KaleidescapeResponse], None]]] = []
+        self._events_enabled: set[str] = set()
+        self._capture: ProtocolCapture | None = None
+        self._connect_rtt = _RttEstimator()
+        self._response_rtt = _RttEstimator()
+        self._connect_lock = asyncio.Lock()
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task[None] | None = None
+        self._keepalive_task: asyncio.Task[None] | None = None
+        self._last_received = 0.0
+        self._peer_address: str | None = None
+        self._pending: dict[str, _PendingRequest] = {}
+        self._reclaim_timers: dict[str, asyncio.TimerHandle] = {}
+        self._in_flight: dict[tuple[str, str], asyncio.Future[KaleidescapeResponse | None]] = {}
+        self._defaults = _ConnectionSettings(timeout, debug_commands, rate_limit, rate_burst)
+        self._users: dict[object, _ConnectionSettings] = {}
+        self._released = False
+        self._sequences: asyncio.Queue[str] = asyncio.Queue()
+        for sequence in SEQUENCE_NUMBERS:
+            self._sequences.put_nowait(sequence)
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def round_trip_time(self) -> float | None:
+        return self._response_rtt.srtt
+
+    @property
+    def peer_address(self) -> str | None:
+        """IP address of the last successful connection, which may differ from the host name."""
+        return self._peer_address
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting on the rate limiter to be sent."""
+        return self._rate_limiter.waiting if self._rate_limiter is not None else 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def present(self) -> bool:
+        return self._present
+
+    @property
+    def available(self) -> bool:
+        return self._present and self._consecutive_failures < BREAKER_FAILURE_THRESHOLD
+
+    def retain(
+        self,
+        timeout: float,
+        debug_commands: bool,
+        rate_limit: float | None = None,
+        rate_burst: int = 1,
+    ) -> object:
+        """Register another user of this connection and return its token for release().
+
+        The timeout and logging follow the most permissive current user; the rate limit
+        follows the most conservative one, since all users share the device's control port.
+        """
+        token = object()
+        self._users[token] = _ConnectionSettings(timeout, debug_commands, rate_limit, rate_burst)
+        self._apply_settings()
+        return token
+
+    def release(self, token: object | None) -> bool:
+        """Drop the user holding token and return whether the connection is now unused.
+
+        An unused connection never reconnects: work still holding one of its clients, such
+        as a background task of an unloading entry, fails instead of opening a stray socket.
+        """
+        self._users.pop(token, None)
+        self._apply_settings()
+        if self._users:
+            return False
+        self._released = True
+        return True
+
+    def _apply_settings(self) -> None:
+        users = list(self._users.values()) or [self._defaults]
+        self._timeout = max(user.timeout for user in users)
+        self._debug_commands = any(user.debug_commands for user in users)
+        limited = [user for user in users if user.rate_limit]
+        if not limited:
+            self._rate_limiter = None
+            return
+        rate = min(user.rate_limit for user in limited if user.rate_limit)
+        burst = min(user.rate_burst for user in limited)
+        if self._rate_limiter is None:
+            self._rate_limiter = _TokenBucket(rate, burst)
+        else:
+            self._rate_limiter.rate = rate
+            self._rate_limiter.burst = burst
+
+    def add_availability_listener(self, listener: Callable[[bool], None]) -> Callable[[], None]:
+        self._availability_listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in self._availability_listeners:
+                self._availability_listeners.remove(listener)
+
+        return _remove
+
+    def add_event_listener(
+        self, device_id: str, listener: Callable[[KaleidescapeResponse], None]
+    ) -> Callable[[], None]:
+        """Call listener with every unsolicited event message from device_id.
+
+        The local player sends events unprompted; other players in the system are asked to
+        with ENABLE_EVENTS ahead of the next request on each new connection.
+        """
+        registration = (device_id, listener)
+        self._event_listeners.append(registration)
+
+        def _remove() -> None:
+            if registration in self._event_listeners:
+                self._event_listeners.remove(registration)
+
+        return _remove
+
+    def start_capture(self) -> ProtocolCapture:
+        """Start recording every raw frame on this connection, replacing any running capture."""
+        self._capture = ProtocolCapture()
+        return self._capture
+
+    def stop_capture(self) -> ProtocolCapture | None:
+        capture, self._capture = self._capture, None
+        return capture
+
+    def inject_message(self, message: str) -> None:
+        """Handle a frame as if it had been read from the socket, e.g. when replaying."""
+        self._handle_message(message)
+
+    def mark_reachable(self) -> None:
+        """Close the circuit breaker, e.g. after SSDP has seen the player again."""
+        was_available = self.available
+        self._present = True
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+        self._probe_in_flight = False
+        if not was_available:
+            _LOGGER.info("Kaleidescape player at %s:%s is reachable again", self._host, self._port)
+            self._notify_availability()
+
+    async def async_mark_absent(self) -> None:
+        """Treat the player as gone until mark_reachable(), e.g. after an SSDP byebye.
+
+        The socket is closed and every request fails fast without reconnect attempts.
+        """
+        if not self._present:
+            return
+        was_available = self.available
+        self._present = False
+        if was_available:
+            self._notify_availability()
+        await self.async_close()
+
+    def _notify_availability(self) -> None:
+        available = self.available
+        for listener in list(self._availability_listeners):
+            try:
+                listener(available)
+            except Exception:
+                _LOGGER.exception("Error in Kaleidescape availability listener")
+
+    def _check_breaker(self) -> None:
+        if not self._present:
+            raise KaleidescapeUnavailableError(
+                f"Kaleidescape player at {self._host}:{self._port} has left the network"
+            )
+        if self.available:
+            return
+        if self._probe_in_flight or time.monotonic() < self._retry_at:
+            raise KaleidescapeUnavailableError(
+                f"Kaleidescape player at {self._host}:{self._port} is unavailable"
+            )
+        self._probe_in_flight = True
+
+    def _record_success(self) -> None:
+        was_available = self.available
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+        self._probe_in_flight = False
+        if not was_available:
+            _LOGGER.info("Kaleidescape player at %s:%s is reachable again", self._host, self._port)
+            self._notify_availability()
+
+    def _record_failure(self) -> None:
+        was_available = self.available
+        self._consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.available:
+            return
+
+        exponent = min(self._consecutive_failures - BREAKER_FAILURE_THRESHOLD, 16)
+        backoff = min(BREAKER_INITIAL_BACKOFF * 2**exponent, BREAKER_MAX_BACKOFF)
+        self._retry_at = time.monotonic() + backoff * random.uniform(0.8, 1.2)
+        if was_available:
+            _LOGGER.warning(
+                "Kaleidescape player at %s:%s is unreachable, backing off reconnect attempts",
+                self._host,
+                self._port,
+            )
+            self._notify_availability()
+        else:
+            _LOGGER.debug(
+                "Kaleidescape reconnect probe to %s:%s failed, next probe in %.0fs",
+                self._host,
+                self._port,
+                backoff,
+            )
+
+    async def async_exchange(
+        self, requests: list[tuple[str, str]]
+    ) -> list[KaleidescapeResponse | None]:
+        """Send (device ID, body) requests pipelined and return their responses in order."""
+        self._check_breaker()
+        try:
+            futures = await self._async_write_requests(requests)
+            responses: list[KaleidescapeResponse | None] = []
+            try:
+                for future in futures:
+                    responses.append(
+                        await asyncio.wait_for(
+                            asyncio.shield(future),
+                            timeout=self._response_rtt.timeout(self._timeout),
+                        )
+                    )
+            except TimeoutError:
+                # A slow reply is not a dead link: fail this exchange only and back off the
+                # timeout. Keepalive probes and connect errors judge the connection.
+                self._response_rtt.timed_out()
+                self._abandon(futures)
+                raise
+            except asyncio.CancelledError:
+                self._abandon(futures)
+                raise
+        finally:
+            self._probe_in_flight = False
+        self._record_success()
+        return responses
+
+    async def async_wait_for_spare_capacity(self, reserve: int) -> None:
+        """Wait until no command is queued behind the rate limit and reserve sequences are free.
+
+        Background work calls this before each request so interactive commands go first.
+        """
+        while self.queue_depth or self._sequences.qsize() <= reserve:
+            await asyncio.sleep(BULK_YIELD_INTERVAL)
+
+    async def async_connect(self) -> None:
+        self._check_breaker()
+        try:
+            await self._async_ensure_connected()
+        finally:
+            self._probe_in_flight = False
+        self._record_success()
+
+    async def async_close(self) -> None:
+        # A connect still in progress would otherwise open its socket after the close.
+        async with self._connect_lock:
+            writer = self._writer
+            read_task = self._read_task
+            self._drop_connection(ConnectionResetError("Kaleidescape connection closed"))
+        if read_task is not None and read_task is not asyncio.current_task():
+            read_task.cancel()
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _async_write_requests(
+        self, requests: list[tuple[str, str]]
+    ) -> list[asyncio.Future[KaleidescapeResponse | None]]:
+        writer = await self._async_ensure_connected()
+        enable_events = [
+            (device_id, ENABLE_EVENTS_BODY) for device_id in self._devices_without_events()
+        ]
+        self._events_enabled.update(device_id for device_id, _ in enable_events)
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future[KaleidescapeResponse | None]] = []
+        # All nine sequence numbers may be taken by unanswered requests; the batch as a whole
+        # waits at most the timeout for free ones rather than hanging until they come back.
+        sequence_budget = self._timeout
+        for device_id, body in [*enable_events, *requests]:
+            key = (device_id, body)
+            if (shared := self._in_flight.get(key)) is not None:
+                futures.append(shared)
+                continue
+
+            if self._rate_limiter is not None:
+                await self._rate_limiter.async_acquire()
+            if not self._sequences.empty():
+                # Taking a free number must not yield, or an identical request issued
+                # meanwhile would miss this one in _in_flight.
+                sequence = self._sequences.get_nowait()
+            else:
+                waited_from = loop.time()
+                try:
+                    sequence = await asyncio.wait_for(self._sequences.get(), sequence_budget)
+                except (TimeoutError, asyncio.CancelledError):
+                    self._abandon(futures)
+                    raise
+                sequence_budget = max(sequence_budget - (loop.time() - waited_from), 0.0)
+            if writer is not self._writer:
+                self._sequences.put_nowait(sequence)
+                raise ConnectionResetError("Kaleidescape connection was lost")
+
+            payload = f"{device_id}/{sequence}/{body}\n".encode("latin-1")
+            if self._debug_commands:
+                _LOGGER.info("Kaleidescape command send: %s", payload.decode("latin-1").strip())
+            future: asyncio.Future[KaleidescapeResponse | None] = loop.create_future()
+            self._pending[sequence] = _PendingRequest(future, time.monotonic(), key)
+            if body.startswith(MERGEABLE_PREFIX):
+                self._in_flight[key] = future
+            if self._capture is not None:
+                self._capture.record(">", payload.decode("latin-1").strip())
+            writer.write(payload)
+            futures.append(future)
+        await writer.drain()
+        return futures[len(enable_events) :]
+
+    def _abandon(self, futures: Iterable[asyncio.Future[KaleidescapeResponse | None]]) -> None:
+        """Stop sharing unanswered requests nobody waits for, and reclaim them if no reply comes.
+
+        A late reply still updates the RTT and frees its sequence number sooner.
+        """
+        unanswered = {id(future) for future in futures if not future.done()}
+        loop = asyncio.get_running_loop()
+        for sequence, request in list(self._pending.items()):
+            if id(request.future) not in unanswered:
+                continue
+            if self._in_flight.get(request.key) is request.future:
+                del self._in_flight[request.key]
+            if sequence not in self._reclaim_timers:
+                self._reclaim_timers[sequence] = loop.call_later(
+                    self._timeout, self._reclaim, sequence, request
+                )
+
+    def _reclaim(self, sequence: str, request: _PendingRequest) -> None:
+        """Free the sequence number of a reply that never came."""
+        self._reclaim_timers.pop(sequence, None)
+        if self._pending.get(sequence) is not request:
+            return
+        del self._pending[sequence]
+        self._sequences.put_nowait(sequence)
+        if not request.future.done():
+            request.future.set_exception(TimeoutError("Kaleidescape reply never arrived"))
+            request.future.exception()
+
+    def _devices_without_events(self) -> list[str]:
+        devices: list[str] = []
+        for device_id, _ in self._event_listeners:
+            if (
+                device_id != LOCAL_CPDID
+                and device_id not in self._events_enabled
+                and device_id not in devices
+            ):
+                devices.append(device_id)
+        return devices
+
+    async def _async_ensure_connected(self) -> asyncio.StreamWriter:
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return self._writer
+            if self._released:
+                raise ConnectionResetError("Kaleidescape connection was released")
+
+            started = time.monotonic()
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self._host, self._port),
+                    timeout=self._connect_rtt.timeout(self._timeout),
+                )
+            except TimeoutError:
+                self._connect_rtt.timed_out()
+                self._record_failure()
+                raise
+            except OSError:
+                self._record_failure()
+                raise
+            self._connect_rtt.sample(time.monotonic() - started)
+            try:
+                _enable_tcp_keepalive(writer)
+            except OSError:
+                _LOGGER.debug("Unable to enable TCP keepalive on %s:%s", self._host, self._port)
+
+            if peer := writer.get_extra_info("peername"):
+                self._peer_address = peer[0]
+            self._writer = writer
+            self._last_received = time.monotonic()
+            loop = asyncio.get_running_loop()
+            self._read_task = loop.create_task(self._async_read_loop(reader, writer))
+            self._keepalive_task = loop.create_task(self._async_keepalive(writer))
+            return writer
+
+    async def _async_read_loop(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                self._last_received = time.monotonic()
+                message = line.decode(errors="ignore").strip()
+                if self._capture is not None:
+                    self._capture.record("<", message)
+                self._handle_message(message)
+        except (OSError, ValueError):
+            _LOGGER.debug("Kaleidescape connection to %s:%s failed", self._host, self._port)
+        finally:
+            if self._writer is writer:
+                _LOGGER.debug("Kaleidescape connection to %s:%s closed", self._host, self._port)
+                self._drop_connection(ConnectionResetError("Kaleidescape connection was lost"))
+                writer.close()
+
+    async def _async_keepalive(self, writer: asyncio.StreamWriter) -> None:
+        """Probe the connection whenever it is idle, so a half-open socket is replaced early."""
+        while writer is self._writer:
+            if (idle := time.monotonic() - self._last_received) < KEEPALIVE_IDLE:
+                await asyncio.sleep(KEEPALIVE_IDLE - idle)
+                continue
+            try:
+                await asyncio.wait_for(self._async_probe(), KEEPALIVE_TIMEOUT)
+            except (OSError, TimeoutError) as err:
+                if writer is not self._writer:
+                    return
+                _LOGGER.debug(
+                    "Kaleidescape keepalive to %s:%s failed (%r), reconnecting",
+                    self._host,
+                    self._port,
+                    err,
+                )
+                self._record_failure()
+                await self.async_close()
+                try:
+                    await self.async_connect()
+                except (OSError, TimeoutError):
+                    pass
+                return
+
+    async def _async_probe(self) -> None:
+        (future,) = await self._async_write_requests(
+            [split_command(KEEPALIVE_COMMAND, LOCAL_CPDID)]
+        )
+        await asyncio.shield(future)
+
+    def _handle_message(self, message: str) -> None:
+        if self._debug_commands:
+            _LOGGER.info("Kaleidescape command response: %s", message)
+        else:
+            _LOGGER.debug("Kaleidescape command response: %s", message)
+
+        sequence = message_sequence(message)
+        if sequence == EVENT_SEQUENCE:
+            self._dispatch_event(message)
+            return
+
+        response = parse_response_message(message)
+        if response is not None and response.name in CONTINUATION_MESSAGES:
+            return
+
+        pending = self._pending.pop(sequence, None)
+        if pending is None:
+            _LOGGER.debug("Unmatched Kaleidescape message: %s", message)
+            return
+
+        self._sequences.put_nowait(sequence)
+        if (timer := self._reclaim_timers.pop(sequence, None)) is not None:
+            timer.cancel()
+        if self._in_flight.get(pending.key) is pending.future:
+            del self._in_flight[pending.key]
+        if not pending.future.done():
+            self._response_rtt.sample(time.monotonic() - pending.sent_at)
+            pending.future.set_result(response)
+
+    def _dispatch_event(self, message: str) -> None:
+        event = parse_response_message(message)
+        if event is None:
+            return
+        device_id = event.device_id.upper()
+        for listener_device_id, listener in list(self._event_listeners):
+            if listener_device_id.upper() != device_id:
+                continue
+            try:
+                listener(event)
+            except Exception:
+                _LOGGER.exception("Error in Kaleidescape event listener")
+
+    def _drop_connection(self, error: Exception) -> None:
+        keepalive_task = self._keepalive_task
+        self._writer = None
+        self._read_task = None
+        self._keepalive_task = None
+        if keepalive_task is not None and keepalive_task is not asyncio.current_task():
+            keepalive_task.cancel()
+        self._in_flight.clear()
+        self._events_enabled.clear()
+        for timer in self._reclaim_timers.values():
+            timer.cancel()
+        self._reclaim_timers.clear()
+        pending, self._pending = self._pending, {}
+        for sequence, request in pending.items():
+            self._sequences.put_nowait(sequence)
+            if not request.future.done():
+                request.future.set_exception(error)
+                # Callers may already have given up; don't log the error as unretrieved.
+                request.future.exception()
+
+
+_CONNECTION_POOL: dict[tuple[str, int], KaleidescapeConnection] = {}
+
+
+def _pool_key(host: str, port: int) -> tuple[str, int]:
+    return host.strip().lower(), port
+
+
+class KaleidescapeClient:
+    """Per-player view of a Kaleidescape connection."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float,
+        debug_commands: bool = False,
+        *,
+        device_id: str = LOCAL_CPDID,
+        connection: KaleidescapeConnection | None = None,
+    ) -> None:
+        self._connection = connection or KaleidescapeConnection(host, port, timeout, debug_commands)
+        self._device_id = device_id
+        self._lease: object | None = None
+
+    @classmethod
+    def acquire(
+        cls,
+        host: str,
+        port: int,
+        timeout: float,
+        debug_commands: bool = False,
+        *,
+        rate_limit: float | None = None,
+        rate_burst: int = 1,
+    ) -> KaleidescapeClient:
+        """Return a client on the process-wide connection for host and port.
+
+        Every caller must pair this with async_release(); the connection is closed when
+        the last user releases it.
+        """
+        key = _pool_key(host, port)
+        if (connection := _CONNECTION_POOL.get(key)) is None:
+            connection = KaleidescapeConnection(host, port, timeout, debug_commands)
+            _CONNECTION_POOL[key] = connection
+        client = cls(host, port, timeout, connection=connection)
+        client._lease = connection.retain(timeout, debug_commands, rate_limit, rate_burst)
+        return client
+
+    async def async_release(self) -> None:
+        if not self._connection.release(self._lease):
+            return
+        key = _pool_key(self._connection.host, self._connection.port)
+        if _CONNECTION_POOL.get(key) is self._connection:
+            del _CONNECTION_POOL[key]
+        await self._connection.async_close()
+
+    def for_device(self, device_id: str) -> KaleidescapeClient:
+        """Return a client that addresses another player over this client's connection."""
+        return KaleidescapeClient(
+            self._connection.host,
+            self._connection.port,
+            self._connection.timeout,
+            device_id=device_id,
+            connection=self._connection,
+        )
+
+    @property
+    def device_id(self) -> str:
+        return self._device_id
+
+    @property
+    def connection(self) -> KaleidescapeConnection:
+        return self._connection
+
+    @property
+    def round_trip_time(self) -> float | None:
+        return self._connection.round_trip_time
+
+    @property
+    def peer_address(self) -> str | None:
+        return self._connection.peer_address
+
+    @property
+    def queue_depth(self) -> int:
+        return self._connection.queue_depth
+
+    @property
+    def present(self) -> bool:
+        return self._connection.present
+
+    @property
+    def available(self) -> bool:
+        return self._connection.available
+
+    def add_availability_listener(self, listener: Callable[[bool], None]) -> Callable[[], None]:
+        return self._connection.add_availability_listener(listener)
+
+    def add_event_listener(
+        self, listener: Callable[[KaleidescapeResponse], None]
+    ) -> Callable[[], None]:
+        return self._connection.add_event_listener(self._device_id, listener)
+
+    def subscribe(
+        self, names: Iterable[str], callback: Callable[[KaleidescapeResponse], None]
+    ) -> Callable[[], None]:
+        """Call callback with each event message named in names as soon as it is read.
+
+        Names are protocol message names such as SCREEN_MASK; a GET_ prefix is ignored.
+        Callbacks run in the event loop and must not block. Returns an unsubscribe function.
+        """
+        wanted = frozenset(name.strip().upper().removeprefix("GET_") for name in names)
+
+        def _listener(event: KaleidescapeResponse) -> None:
+            if event.name in wanted:
+                callback(event)
+
+        return self.add_event_listener(_listener)
+
+    def mark_reachable(self) -> None:
+        self._connection.mark_reachable()
+
+    async def async_mark_absent(self) -> None:
+        await self._connection.async_mark_absent()
+
+    async def async_close(self) -> None:
+        await self._connection.async_close()
+
+    async def async_can_connect(self) -> bool:
+        try:
+            await self._connection.async_connect()
+            return True
+        except Exception:
+            _LOGGER.debug(
+                "Unable to connect to Kaleidescape host %s:%s",
+                self._connection.host,
+                self._connection.port,
+            )
+            return False
+
+    async def async_send_command(self, command: str) -> None:
+        await self.async_send_request(command)
+
+    async def async_send_request(self, command: str) -> KaleidescapeResponse | None:
+        return (await self.async_send_requests([command])).get(command)
+
+    async def async_send_requests(
+        self, commands: list[str]
+    ) -> dict[str, KaleidescapeResponse | None]:
+        responses = await self._connection.async_exchange(
+            [split_command(command, self._device_id) for command in commands]
+        )
+        return dict(zip(commands, responses, strict=True))
+
+    async def async_get_system_players(self) -> list[tuple[str, str]]:
+        """Return (device ID, friendly name) for every player in this player's system."""
+        response = await self.async_send_request("GET_AVAILABLE_DEVICES_BY_SERIAL_NUMBER")
+        if not (
+            response
+            and response.status == 0
+            and response.name == "AVAILABLE_DEVICES_BY_SERIAL_NUMBER"
+        ):
+            return []
+
+        device_ids = [
+            serial if serial.startswith("#") else f"#{serial}"
+            for serial in (field.strip() for field in response.fields)
+            if serial
+        ]
+        players: list[tuple[str, str]] = []
+        for device_id in device_ids:
+            name_response = await self.for_device(device_id).async_send_request("GET_FRIENDLY_NAME")
+            name = device_id.lstrip("#")
+            if (
+                name_response
+                and name_response.status == 0
+                and name_response.name == "FRIENDLY_NAME"
+                and name_response.fields
+                and name_response.fields[0].strip()
+            ):
+                name = name_response.fields[0].strip()
+            players.append((device_id, name))
+        return players
+
+    async def async_get_device_profile(self) -> tuple[bool, str]:
+        responses = await self.async_send_requests(["GET_NUM_ZONES", "GET_DEVICE_TYPE_NAME"])
+        num_zones_response = responses.get("GET_NUM_ZONES")
+        device_type_response = responses.get("GET_DEVICE_TYPE_NAME")
+
+        is_movie_player = True
+        if (
+            num_zones_response
+            and num_zones_response.status == 0
+            and num_zones_response.name == "NUM_ZONES"
+            and len(num_zones_response.fields) >= 1
+        ):
+            movie_zones = parse_int(num_zones_response.fields[0])
+            if movie_zones is not None:
+                is_movie_player = movie_zones > 0
+
+        device_type = "Kaleidescape"
+        if (
+            device_type_response
+            and device_type_response.status == 0
+            and device_type_response.name == "DEVICE_TYPE_NAME"
+            and device_type_response.fields
+        ):
+            device_type = device_type_response.fields[0]
+
+        return is_movie_player, device_type
+
+    async def async_query_state(self, commands: Iterable[str]) -> dict[str, StateValue]:
+        """Run GET_* state commands in one exchange and return the fields they decoded."""
+        command_list = list(commands)
+        responses = await self.async_send_requests(command_list)
+
+        state: dict[str, StateValue] = {}
+        for command in command_list:
+            state.update(decode_state_response(responses.get(command)))
+        return state
+
+    async def async_query_playback_state(
+        self, *, include_player_metrics: bool = True
+    ) -> dict[str, StateValue]:
+        """Run a full poll and return the decoded fields; unreported keys are left out."""
+        commands = list(SHARED_STATE_COMMANDS)
+        if include_player_metrics:
+            commands.extend(PLAYER_STATE_COMMANDS)
+
+        return await self.async_query_state(commands)
+
+    async def async_fetch_content_details(
+        self, handles: Iterable[str], *, window: int = BULK_WINDOW
+    ) -> AsyncIterator[tuple[str, tuple[str | None, str | None] | None]]:
+        """Yield (handle, details) for each handle, keeping up to window lookups outstanding.
+
+        Lookups run at background priority: each one waits for spare capacity on the
+        connection first. Results arrive in completion order; a failed lookup raises.
+        """
+
+        async def _lookup(handle: str) -> tuple[str, tuple[str | None, str | None] | None]:
+            return handle, await self.async_get_content_details(handle)
+
+        remaining = iter(handles)
+        outstanding: set[asyncio.Task[tuple[str, tuple[str | None, str | None] | None]]] = set()
+        try:
+            while True:
+                while len(outstanding) < window and (handle := next(remaining, None)) is not None:
+                    if not handle:
+                        continue
+                    await self._connection.async_wait_for_spare_capacity(BULK_RESERVED_SEQUENCES)
+                    outstanding.add(asyncio.create_task(_lookup(handle)))
+                if not outstanding:
+                    return
+                done, outstanding = await asyncio.wait(
+                    outstanding, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in outstanding:
+                task.cancel()
+
+    async def async_get_content_details(self, handle: str) -> tuple[str | None, str | None] | None:
+        """Return (title, image URL) for a content handle, or None if it has no details."""
+        content_details_response = await self.async_send_request(
+            f"{self._device_id}/0/GET_CONTENT_DETAILS:{handle}:"
+        )
+        if not (
+            content_details_response
+            and content_details_response.status == 0
+            and content_details_response.name == "CONTENT_DETAILS_OVERVIEW"
+            and len(content_details_response.fields) >= 4
+        ):
+            return None
+        return (
+            content_details_response.fields[1].strip() or None,
+            content_details_response.fields[2].strip() or None,
+        )
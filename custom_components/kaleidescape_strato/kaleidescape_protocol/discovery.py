@@ -0,0 +1,102 @@
+"""Concurrent probing of addresses for Kaleidescape control ports."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .client import KaleidescapeClient
+from .codec import decode_state_response
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_CONCURRENCY = 32
+SCAN_TIMEOUT = 1.5
+SCAN_MAX_HOSTS = 1024
+PROBE_COMMANDS = ["GET_DEVICE_INFO", "GET_DEVICE_TYPE_NAME", "GET_FRIENDLY_NAME"]
+
+_TARGET_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+@dataclass(frozen=True, slots=True)
+class KaleidescapeDevice:
+    """A control port that answered a probe."""
+
+    host: str
+    port: int
+    serial: str | None
+    device_type: str
+    name: str
+
+
+def expand_scan_targets(text: str, limit: int = SCAN_MAX_HOSTS) -> list[str]:
+    """Expand addresses, host names and CIDR subnets into a de-duplicated host list.
+
+    Raises ValueError for a malformed subnet or when more than limit hosts would be probed.
+    """
+    hosts: dict[str, None] = {}
+    for target in filter(None, _TARGET_SEPARATORS.split(text)):
+        if "/" not in target:
+            hosts[target] = None
+        else:
+            network = ipaddress.ip_network(target, strict=False)
+            if network.num_addresses > limit + 2:
+                raise ValueError(f"{target} has more than {limit} addresses")
+            hosts.update(dict.fromkeys(str(address) for address in network.hosts()))
+        if len(hosts) > limit:
+            raise ValueError(f"more than {limit} hosts to scan")
+    return list(hosts)
+
+
+async def async_probe(
+    host: str, port: int, timeout: float = SCAN_TIMEOUT
+) -> KaleidescapeDevice | None:
+    """Identify the Kaleidescape device at host in one pipelined exchange, if any answers."""
+    client = KaleidescapeClient(host, port, timeout)
+    try:
+        responses = await client.async_send_requests(PROBE_COMMANDS)
+    except (OSError, TimeoutError):
+        return None
+    finally:
+        await client.async_close()
+
+    info = responses["GET_DEVICE_INFO"]
+    if info is None or info.status != 0:
+        return None
+    serial = decode_state_response(info).get("serial")
+    fields = {
+        command: response.fields[0].strip()
+        for command, response in responses.items()
+        if response is not None and response.status == 0 and response.fields
+    }
+    device_type = fields.get("GET_DEVICE_TYPE_NAME") or "Kaleidescape"
+    return KaleidescapeDevice(
+        host=host,
+        port=port,
+        serial=serial if isinstance(serial, str) else None,
+        device_type=device_type,
+        name=fields.get("GET_FRIENDLY_NAME") or device_type,
+    )
+
+
+async def async_scan(
+    hosts: Iterable[str],
+    port: int,
+    timeout: float = SCAN_TIMEOUT,
+    concurrency: int = SCAN_CONCURRENCY,
+) -> list[KaleidescapeDevice]:
+    """Probe hosts with at most concurrency connections open and return the responders."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(host: str) -> KaleidescapeDevice | None:
+        async with semaphore:
+            return await async_probe(host, port, timeout)
+
+    results = await asyncio.gather(*(_probe(host) for host in hosts))
+    devices = [device for device in results if device is not None]
+    _LOGGER.debug("Kaleidescape scan found %d of %d hosts", len(devices), len(results))
+    return devices
@@ -0,0 +1,77 @@
+"""Wire framing: addressing, sequence numbers and response message parsing."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+LOCAL_CPDID = "01"
+
+SEQUENCE_NUMBERS = tuple(str(number) for number in range(1, 10))
+EVENT_SEQUENCE = "!"
+ENABLE_EVENTS_BODY = "ENABLE_EVENTS:"
+CONTINUATION_MESSAGES = frozenset({"CONTENT_DETAILS"})
+MERGEABLE_PREFIX = "GET_"
+
+
+def split_command(command: str, device_id: str) -> tuple[str, str]:
+    """Return the device ID and wire body for a command, honouring pass-through addressing."""
+    normalized = command.strip()
+    if "/" in normalized:
+        parts = normalized.split("/", 2)
+        if len(parts) == 3:
+            return parts[0], parts[2]
+        return device_id, normalized
+    return device_id, f"{normalized.upper()}:"
+
+
+def message_sequence(message: str) -> str:
+    parts = message.split("/", 2)
+    return parts[1] if len(parts) == 3 else ""
+
+
+@dataclass(frozen=True)
+class KaleidescapeResponse:
+    status: int
+    name: str
+    fields: list[str]
+    device_id: str = ""
+    sequence: str = ""
+
+
+def parse_response_message(message: str) -> KaleidescapeResponse | None:
+    normalized = message.strip()
+    if "/" not in normalized:
+        return None
+
+    try:
+        device_id, sequence, payload = normalized.split("/", 2)
+    except ValueError:
+        return None
+
+    if ":" not in payload:
+        return None
+
+    status_text, body = payload.split(":", 1)
+    try:
+        status = int(status_text)
+    except ValueError:
+        return None
+
+    if "/" in body:
+        body = body.rsplit("/", 1)[0]
+
+    parts = body.split(":")
+    if not parts:
+        return None
+
+    fields = parts[1:]
+    if fields and fields[-1] == "":
+        fields = fields[:-1]
+
+    return KaleidescapeResponse(
+        status=status,
+        name=parts[0],
+        fields=fields,
+        device_id=device_id,
+        sequence=sequence,
+    )
@@ -0,0 +1,212 @@
+"""Index tables mapping numeric protocol fields to names.
+
+PLAY_STATUS_INDEX and MOVIE_LOCATION_INDEX are read on every play status poll and are built at
+import. The rest are only needed once a message that uses them arrives, so each is built on
+first attribute access and then cached as a module global.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+PLAY_STATUS_INDEX = {
+    0: "none",
+    1: "paused",
+    2: "playing",
+    4: "forward",
+    6: "reverse",
+}
+
+MOVIE_LOCATION_INDEX = {
+    0: "none",
+    3: "content",
+    4: "intermission",
+    5: "credits",
+    6: "disc_menu",
+}
+
+
+def _system_readiness_index() -> dict[int, str]:
+    return {
+        0: "ready",
+        1: "becoming_ready",
+        2: "idle",
+    }
+
+
+def _power_state_index() -> dict[int, str]:
+    return {
+        0: "standby",
+        1: "on",
+    }
+
+
+def _ui_screen_index() -> dict[int, str]:
+    return {
+        0: "unknown",
+        1: "movie_list",
+        2: "movie_collections",
+        3: "movie_covers",
+        4: "parental_control",
+        7: "playing_movie",
+        8: "system_status",
+        9: "music_list",
+        10: "music_covers",
+        11: "music_collections",
+        12: "music_now_playing",
+        14: "vault_summary",
+        15: "system_settings",
+        16: "movie_store",
+        17: "paired_unit_lobby",
+    }
+
+
+def _ui_popup_index() -> dict[int, str]:
+    return {
+        0: "none",
+        1: "details",
+        2: "movie_status",
+        3: "movie_not_status",
+    }
+
+
+def _ui_dialog_index() -> dict[int, str]:
+    return {
+        0: "none",
+        1: "menu",
+        2: "passcode",
+        3: "question",
+        4: "information",
+        5: "warning",
+        6: "error",
+        7: "preplay",
+        8: "warranty",
+        9: "keyboard",
+        10: "ip_config",
+    }
+
+
+def _video_mode_index() -> dict[int, str]:
+    return {
+        0: "none",
+        1: "480i60_4:3",
+        2: "480i60_16:9",
+        3: "480p60_4:3",
+        4: "480p60_16:9",
+        5: "576i50_4:3",
+        6: "576i50_16:9",
+        7: "576p50_4:3",
+        8: "576p50_16:9",
+        9: "720p60_ntsc_hd",
+        10: "720p50_pal_hd",
+        11: "1080i60_16:9",
+        12: "1080i50_16:9",
+        13: "1080p60_16:9",
+        14: "1080p50_16:9",
+        17: "1080p24_16:9",
+        19: "480i60_64:27",
+        20: "576i50_64:27",
+        21: "1080i60_64:27",
+        22: "1080i50_64:27",
+        23: "1080p60_64:27",
+        24: "1080p50_64:27",
+        25: "1080p23976_64:27",
+        26: "1080p24_64:27",
+        27: "3840x2160p23976_16:9",
+        28: "3840x2160p23976_64:27",
+        29: "3840x2160p30_16:9",
+        30: "3840x2160p30_64:27",
+        31: "3840x2160p60_16:9",
+        32: "3840x2160p60_64:27",
+        33: "3840x2160p25_16:9",
+        34: "3840x2160p25_64:27",
+        35: "3840x2160p50_16:9",
+        36: "3840x2160p50_64:27",
+        37: "3840x2160p24_16:9",
+        38: "3840x2160p24_64:27",
+    }
+
+
+def _video_color_eotf_index() -> dict[int, str]:
+    return {
+        0: "unknown",
+        1: "sdr",
+        2: "hdr",
+        3: "smtpest2084",
+    }
+
+
+def _video_color_space_index() -> dict[int, str]:
+    return {
+        0: "default",
+        1: "rgb",
+        2: "bt601",
+        3: "bt709",
+        4: "bt2020",
+    }
+
+
+def _video_color_depth_index() -> dict[int, str]:
+    return {
+        0: "unknown",
+        24: "24bit",
+        30: "30bit",
+        36: "36bit",
+    }
+
+
+def _video_color_sampling_index() -> dict[int, str]:
+    return {
+        0: "none",
+        1: "rgb",
+        2: "ycbcr422",
+        3: "ycbcr444",
+        4: "ycbcr420",
+    }
+
+
+def _screen_mask_ratio_index() -> dict[int, str]:
+    return {
+        0: "none",
+        1: "1.33",
+        2: "1.66",
+        3: "1.78",
+        4: "1.85",
+        5: "2.35",
+    }
+
+
+def _cinemascape_mode_index() -> dict[int, str]:
+    return {
+        0: "none",
+        1: "anamorphic",
+        2: "letterbox",
+        3: "native",
+    }
+
+
+_LAZY_TABLES: dict[str, Callable[[], dict[int, str]]] = {
+    "SYSTEM_READINESS_INDEX": _system_readiness_index,
+    "POWER_STATE_INDEX": _power_state_index,
+    "UI_SCREEN_INDEX": _ui_screen_index,
+    "UI_POPUP_INDEX": _ui_popup_index,
+    "UI_DIALOG_INDEX": _ui_dialog_index,
+    "VIDEO_MODE_INDEX": _video_mode_index,
+    "VIDEO_COLOR_EOTF_INDEX": _video_color_eotf_index,
+    "VIDEO_COLOR_SPACE_INDEX": _video_color_space_index,
+    "VIDEO_COLOR_DEPTH_INDEX": _video_color_depth_index,
+    "VIDEO_COLOR_SAMPLING_INDEX": _video_color_sampling_index,
+    "SCREEN_MASK_RATIO_INDEX": _screen_mask_ratio_index,
+    "CINEMASCAPE_MODE_INDEX": _cinemascape_mode_index,
+}
+
+
+def __getattr__(name: str) -> dict[int, str]:
+    if (build := _LAZY_TABLES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    table = globals()[name] = build()
+    return table
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_TABLES])
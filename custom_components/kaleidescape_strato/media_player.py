@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
 from datetime import datetime
+from typing import Any
 
 from homeassistant.components.media_player import (
     MediaPlayerEntity,
@@ -8,20 +10,51 @@ from homeassistant.components.media_player import (
     MediaPlayerState,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import utcnow
 
-from .const import DATA_DEVICE_TYPE, DATA_IS_MOVIE_PLAYER, DEFAULT_NAME, DOMAIN
+from .const import (
+    CONF_WAIT_FOR_STATE,
+    CONF_WAIT_TIMEOUT,
+    DATA_IS_MOVIE_PLAYER,
+    DATA_PLAYERS,
+    DEFAULT_WAIT_FOR_STATE,
+    DEFAULT_WAIT_TIMEOUT,
+    DOMAIN,
+)
 from .coordinator import KaleidescapeSensorCoordinator
+from .entity import player_device_info, player_unique_id, remove_player_entities
 
 POWER_ON_COMMAND = "LEAVE_STANDBY"
 POWER_OFF_COMMAND = "ENTER_STANDBY"
 
 PLAYING_STATES = {"playing", "forward", "reverse"}
 
+StateCondition = Callable[[Mapping[str, Any]], bool]
+
+
+def _is_ready_and_on(state: Mapping[str, Any]) -> bool:
+    return state.get("power_state") == "on" and state.get("system_readiness_state") == "ready"
+
+
+def _is_standby(state: Mapping[str, Any]) -> bool:
+    return state.get("power_state") == "standby"
+
+
+def _is_playing(state: Mapping[str, Any]) -> bool:
+    return state.get("play_status") == "playing"
+
+
+def _is_paused(state: Mapping[str, Any]) -> bool:
+    return state.get("play_status") == "paused"
+
+
+def _is_stopped(state: Mapping[str, Any]) -> bool:
+    return state.get("play_status") == "none"
+
 
 def _supported_features() -> MediaPlayerEntityFeature:
     features = MediaPlayerEntityFeature(0)
@@ -45,14 +78,15 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    if not hass.data[DOMAIN][entry.entry_id][DATA_IS_MOVIE_PLAYER]:
-        return
-
-    client = hass.data[DOMAIN][entry.entry_id]["client"]
-    coordinator: KaleidescapeSensorCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "sensor_coordinator"
-    ]
-    async_add_entities([KaleidescapeMediaPlayerEntity(entry, client, coordinator)])
+    players = hass.data[DOMAIN][entry.entry_id][DATA_PLAYERS]
+    for player in players:
+        if not player[DATA_IS_MOVIE_PLAYER]:
+            remove_player_entities(hass, entry, player, "media_player", ("media_player",))
+    async_add_entities(
+        KaleidescapeMediaPlayerEntity(entry, player)
+        for player in players
+        if player[DATA_IS_MOVIE_PLAYER]
+    )
 
 
 class KaleidescapeMediaPlayerEntity(
@@ -62,32 +96,22 @@ class KaleidescapeMediaPlayerEntity(
     _attr_name = None
     _attr_supported_features = _supported_features()
 
-    def __init__(
-        self,
-        entry: ConfigEntry,
-        client,
-        coordinator: KaleidescapeSensorCoordinator,
-    ) -> None:
-        super().__init__(coordinator)
+    def __init__(self, entry: ConfigEntry, player: dict[str, Any]) -> None:
+        super().__init__(player["sensor_coordinator"])
         self._entry = entry
-        self._client = client
-        self._attr_unique_id = f"{entry.entry_id}_media_player"
+        self._player = player
+        self._client = player["client"]
+        self._wait_for_state = entry.options.get(CONF_WAIT_FOR_STATE, DEFAULT_WAIT_FOR_STATE)
+        self._wait_timeout = float(entry.options.get(CONF_WAIT_TIMEOUT, DEFAULT_WAIT_TIMEOUT))
+        self._attr_unique_id = player_unique_id(entry, player, "media_player")
 
     @property
     def available(self) -> bool:
-        return True
+        return self._client.available
 
     @property
     def device_info(self):
-        device_type = self.hass.data[DOMAIN][self._entry.entry_id].get(
-            DATA_DEVICE_TYPE, "Kaleidescape"
-        )
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "manufacturer": "Kaleidescape",
-            "model": str(device_type),
-            "name": self._entry.data.get(CONF_NAME, DEFAULT_NAME),
-        }
+        return player_device_info(self._entry, self._player)
 
     @property
     def state(self) -> MediaPlayerState:
@@ -169,33 +193,49 @@ class KaleidescapeMediaPlayerEntity(
             return utcnow()
         return None
 
-    async def async_turn_on(self) -> None:
-        await self._client.async_send_command(POWER_ON_COMMAND)
+    async def _async_send_command(
+        self,
+        command: str,
+        condition: StateCondition | None = None,
+        keys: tuple[str, ...] = (),
+    ) -> None:
+        """Send a command and, if enabled in options, wait until condition holds."""
+        try:
+            await self._client.async_send_command(command)
+        except (OSError, TimeoutError) as err:
+            raise HomeAssistantError(
+                f"Unable to send {command} to Kaleidescape player: {err}"
+            ) from err
+
+        if condition is not None and self._wait_for_state:
+            if not await self.coordinator.async_wait_for(condition, keys, self._wait_timeout):
+                raise HomeAssistantError(
+                    f"Kaleidescape player did not complete {command} within {self._wait_timeout:g}s"
+                )
         await self.coordinator.async_request_refresh()
 
+    async def async_turn_on(self) -> None:
+        await self._async_send_command(
+            POWER_ON_COMMAND, _is_ready_and_on, ("power_state", "system_readiness_state")
+        )
+
     async def async_turn_off(self) -> None:
-        await self._client.async_send_command(POWER_OFF_COMMAND)
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command(POWER_OFF_COMMAND, _is_standby, ("power_state",))
 
     async def async_media_play(self) -> None:
-        await self._client.async_send_command("PLAY")
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command("PLAY", _is_playing, ("play_status",))
 
     async def async_media_pause(self) -> None:
-        await self._client.async_send_command("PAUSE")
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command("PAUSE", _is_paused, ("play_status",))
 
     async def async_media_stop(self) -> None:
-        await self._client.async_send_command("STOP_OR_CANCEL")
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command("STOP_OR_CANCEL", _is_stopped, ("play_status",))
 
     async def async_media_next_track(self) -> None:
-        await self._client.async_send_command("NEXT")
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command("NEXT")
 
     async def async_media_previous_track(self) -> None:
-        await self._client.async_send_command("PREVIOUS")
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command("PREVIOUS")
 
     async def async_toggle(self) -> None:
         if self.state == MediaPlayerState.PLAYING:
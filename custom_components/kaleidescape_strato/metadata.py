@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    METADATA_NOTIFY_INTERVAL,
+    METADATA_RETRY_INITIAL,
+    METADATA_RETRY_MAX,
+    METADATA_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .kaleidescape_protocol import KaleidescapeClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _metadata_store(
+    hass: HomeAssistant, entry_id: str, player_id: str = ""
+) -> Store[dict[str, Any]]:
+    scope = f"{entry_id}.{player_id}" if player_id else entry_id
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{scope}.metadata")
+
+
+async def async_remove_metadata(hass: HomeAssistant, entry_id: str, player_id: str = "") -> None:
+    await _metadata_store(hass, entry_id, player_id).async_remove()
+
+
+class KaleidescapeMetadataSync:
+    """Bulk content-details fetch for one player, checkpointed so it resumes after restarts.
+
+    Fetched details and the handles still to fetch are saved together; a sync that is
+    interrupted by a reload or restart picks up from the saved list at the next setup. After a
+    connection failure it is retried with backoff, and straight away once the player becomes
+    available again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: KaleidescapeClient,
+        player_id: str = "",
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._client = client
+        self._store = _metadata_store(hass, entry.entry_id, player_id)
+        self._details: dict[str, tuple[str | None, str | None]] = {}
+        self._pending: dict[str, None] = {}
+        self._window = 1
+        self._task: asyncio.Task[None] | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._last_notify = 0.0
+        self._started_at = 0.0
+        self._fetched_this_run = 0
+        self._failed_runs = 0
+        self._cancel_retry: CALLBACK_TYPE | None = None
+        self._remove_availability_listener: CALLBACK_TYPE | None = None
+        self.last_error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def fetched(self) -> int:
+        return len(self._details)
+
+    @property
+    def remaining(self) -> int:
+        return len(self._pending)
+
+    @property
+    def progress(self) -> float | None:
+        """Percentage of known handles fetched, or None before any sync was requested."""
+        total = self.fetched + self.remaining
+        return round(self.fetched / total * 100, 1) if total else None
+
+    @property
+    def rate(self) -> float | None:
+        """Lookups per second in the current run."""
+        if not self.running or not self._fetched_this_run:
+            return None
+        elapsed = max(time.monotonic() - self._started_at, 1e-3)
+        return round(self._fetched_this_run / elapsed, 1)
+
+    def details(self, handle: str) -> tuple[str | None, str | None] | None:
+        return self._details.get(handle)
+
+    def add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove
+
+    async def async_load(self) -> None:
+        """Restore the checkpoint and resume a sync that was interrupted."""
+        self._remove_availability_listener = self._client.add_availability_listener(
+            self._handle_availability
+        )
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict):
+            return
+        self._details = {
+            handle: (value[0], value[1])
+            for handle, value in stored.get("details", {}).items()
+            if isinstance(value, list) and len(value) == 2
+        }
+        self._pending = dict.fromkeys(stored.get("pending", []))
+        self._window = int(stored.get("window", self._window))
+        if self._pending:
+            self.async_start((), self._window)
+
+    @callback
+    def async_start(self, handles: Iterable[str], window: int) -> None:
+        """Queue handles without details and start fetching if not already running."""
+        self._pending.update(
+            (handle, None) for handle in handles if handle and handle not in self._details
+        )
+        self._window = window
+        self._store.async_delay_save(self._stored_data, METADATA_SAVE_DELAY)
+        if self._task is None and self._pending:
+            self._cancel_retry_timer()
+            self._task = self._entry.async_create_background_task(
+                self._hass, self._async_run(), f"{DOMAIN}_{self._store.key}_sync"
+            )
+        self._notify(force=True)
+
+    async def async_stop(self) -> None:
+        """Cancel a running sync and write the checkpoint."""
+        self._cancel_retry_timer()
+        if self._remove_availability_listener is not None:
+            self._remove_availability_listener()
+            self._remove_availability_listener = None
+        if (task := self._task) is not None:
+            task.cancel()
+            self._task = None
+        await self._store.async_save(self._stored_data())
+
+    async def _async_run(self) -> None:
+        self._started_at = time.monotonic()
+        self._fetched_this_run = 0
+        self.last_error = None
+        try:
+            # Handles queued while a pass runs are picked up by the next pass.
+            while self._pending:
+                async for handle, details in self._client.async_fetch_content_details(
+                    list(self._pending), window=self._window
+                ):
+                    self._pending.pop(handle, None)
+                    self._details[handle] = details or (None, None)
+                    self._fetched_this_run += 1
+                    self._store.async_delay_save(self._stored_data, METADATA_SAVE_DELAY)
+                    self._notify()
+        except (OSError, TimeoutError) as err:
+            self.last_error = repr(err)
+            delay = min(METADATA_RETRY_INITIAL * 2**self._failed_runs, METADATA_RETRY_MAX)
+            self._failed_runs += 1
+            _LOGGER.warning(
+                "Kaleidescape metadata sync stopped with %d handles left, retrying in %ds: %r",
+                self.remaining,
+                delay,
+                err,
+            )
+            self._cancel_retry = async_call_later(self._hass, delay, self._handle_retry)
+        else:
+            self._failed_runs = 0
+            _LOGGER.debug("Kaleidescape metadata sync finished, %d handles", self.fetched)
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+            self._store.async_delay_save(self._stored_data, METADATA_SAVE_DELAY)
+            self._notify(force=True)
+
+    @callback
+    def _handle_retry(self, _now: Any) -> None:
+        self._cancel_retry = None
+        self.async_start((), self._window)
+
+    @callback
+    def _handle_availability(self, available: bool) -> None:
+        if available and self._task is None and self._pending:
+            self.async_start((), self._window)
+
+    @callback
+    def _cancel_retry_timer(self) -> None:
+        if self._cancel_retry is not None:
+            self._cancel_retry()
+            self._cancel_retry = None
+
+    def _stored_data(self) -> dict[str, Any]:
+        return {
+            "details": {handle: list(value) for handle, value in self._details.items()},
+            "pending": list(self._pending),
+            "window": self._window,
+        }
+
+    @callback
+    def _notify(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_notify < METADATA_NOTIFY_INTERVAL:
+            return
+        self._last_notify = now
+        for listener in list(self._listeners):
+            listener()
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import ATTR_EVENT_TYPE, EVENT_KALEIDESCAPE, PLAYBACK_SEEK_TOLERANCE
+from .coordinator import KaleidescapeSensorCoordinator
+from .entity import player_registry_device_id
+
+EVENT_TYPE_PLAYBACK_BOUNDARY = "playback_boundary"
+ATTR_OFFSET = "offset"
+
+
+def parse_playback_offsets(text: str) -> list[int]:
+    """Parse comma-separated seconds before the end of a title, e.g. "300, 60".
+
+    Raises ValueError for anything that is not a positive whole number of seconds.
+    """
+    offsets = {int(part) for part in text.replace(",", " ").split()}
+    if any(offset <= 0 for offset in offsets):
+        raise ValueError("offsets must be positive")
+    return sorted(offsets, reverse=True)
+
+
+class _Anchor:
+    """The last sample that changed the playback timeline."""
+
+    __slots__ = ("location", "length", "chapter_location", "chapter_length", "rate", "at")
+
+    def __init__(self, state: Any, rate: float | None, at: datetime) -> None:
+        self.location: int = state.get("title_location")
+        self.length: int = state.get("title_length")
+        self.chapter_location: int | None = state.get("chapter_location")
+        self.chapter_length: int | None = state.get("chapter_length")
+        self.rate = rate
+        self.at = at
+
+    def position(self, now: datetime) -> float:
+        return self.location + (self.rate or 0.0) * (now - self.at).total_seconds()
+
+
+def _playback_rate(state: Any) -> float | None:
+    """Seconds of title per second: 1 when playing, 0 when stopped, None while scanning.
+
+    PLAY_STATUS reports scan speeds as steps rather than multipliers, so forward and
+    reverse scanning are not extrapolated.
+    """
+    play_status = state.get("play_status")
+    if play_status == "playing":
+        return 1.0
+    if play_status in ("forward", "reverse"):
+        return None
+    return 0.0
+
+
+class KaleidescapePlaybackClock:
+    """Local model of a player's title timeline, extrapolated from the last sample.
+
+    The timeline is only re-anchored when the title, play status or speed changes, or when
+    a sample disagrees with the extrapolated position by more than PLAYBACK_SEEK_TOLERANCE
+    (a seek). Boundary timers fire kaleidescape_strato_event events at the configured
+    offsets before the end of the title and are re-armed only when the timeline is.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        player: dict[str, Any],
+        offsets: Iterable[int],
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._player = player
+        self._coordinator: KaleidescapeSensorCoordinator = player["sensor_coordinator"]
+        self._offsets = tuple(offsets)
+        self._anchor: _Anchor | None = None
+        self._speed: Any = None
+        self._timers: list[CALLBACK_TYPE] = []
+        self._device_id: str | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Follow coordinator updates; start before entities subscribe so they read fresh values."""
+        remove_listener = self._coordinator.async_add_listener(self._handle_update)
+        self._handle_update()
+
+        @callback
+        def _stop() -> None:
+            remove_listener()
+            self._cancel_timers()
+
+        return _stop
+
+    def time_remaining(self, now: datetime | None = None) -> int | None:
+        if (anchor := self._anchor) is None:
+            return None
+        return max(round(anchor.length - anchor.position(now or dt_util.utcnow())), 0)
+
+    @property
+    def estimated_end(self) -> datetime | None:
+        anchor = self._anchor
+        if anchor is None or not anchor.rate:
+            return None
+        return anchor.at + timedelta(seconds=(anchor.length - anchor.location) / anchor.rate)
+
+    @property
+    def chapter_progress(self) -> float | None:
+        anchor = self._anchor
+        if anchor is None or not anchor.chapter_length or anchor.chapter_location is None:
+            return None
+        elapsed = (dt_util.utcnow() - anchor.at).total_seconds() * (anchor.rate or 0.0)
+        location = min(anchor.chapter_location + elapsed, anchor.chapter_length)
+        return round(location / anchor.chapter_length * 100, 1)
+
+    @callback
+    def _handle_update(self) -> None:
+        state = self._coordinator.data
+        if not state or not state.get("title_length") or state.get("title_location") is None:
+            if self._anchor is not None:
+                self._anchor = None
+                self._cancel_timers()
+            return
+
+        now = dt_util.utcnow()
+        rate = _playback_rate(state)
+        anchor = self._anchor
+        if (
+            anchor is not None
+            and anchor.length == state.get("title_length")
+            and anchor.rate == rate
+            and self._speed == state.get("play_speed")
+            and abs(anchor.position(now) - state["title_location"]) <= PLAYBACK_SEEK_TOLERANCE
+        ):
+            # Same timeline; only the chapter fields need refreshing.
+            anchor.chapter_location = state.get("chapter_location")
+            anchor.chapter_length = state.get("chapter_length")
+            return
+
+        self._anchor = _Anchor(state, rate, now)
+        self._speed = state.get("play_speed")
+        self._arm_timers()
+
+    def _arm_timers(self) -> None:
+        self._cancel_timers()
+        remaining = self.time_remaining()
+        if remaining is None or not self._anchor or self._anchor.rate != 1.0:
+            return
+        for offset in self._offsets:
+            if (delay := remaining - offset) > 0:
+                self._timers.append(
+                    async_call_later(self._hass, delay, self._boundary_callback(offset))
+                )
+
+    def _boundary_callback(self, offset: int) -> Any:
+        @callback
+        def _fire(_now: Any) -> None:
+            if self._device_id is None:
+                self._device_id = player_registry_device_id(self._hass, self._entry, self._player)
+            state = self._coordinator.data or {}
+            self._hass.bus.async_fire(
+                EVENT_KALEIDESCAPE,
+                {
+                    CONF_DEVICE_ID: self._device_id,
+                    ATTR_EVENT_TYPE: EVENT_TYPE_PLAYBACK_BOUNDARY,
+                    ATTR_OFFSET: offset,
+                    "time_remaining": self.time_remaining(),
+                    "media_title": state.get("media_title"),
+                },
+            )
+
+        return _fire
+
+    def _cancel_timers(self) -> None:
+        for cancel in self._timers:
+            cancel()
+        self._timers.clear()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import re
+import socket
+from typing import Any
+from urllib.parse import urlparse
+
+from homeassistant.components import ssdp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.service_info.ssdp import ATTR_UPNP_MANUFACTURER, SsdpServiceInfo
+
+from .const import DOMAIN, SSDP_DEFAULT_MAX_AGE
+from .kaleidescape_protocol import KaleidescapeClient, KaleidescapeUnavailableError
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAX_AGE_PATTERN = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def _max_age(discovery_info: SsdpServiceInfo) -> float:
+    cache_control = str(discovery_info.ssdp_headers.get("cache-control", ""))
+    if match := _MAX_AGE_PATTERN.search(cache_control):
+        return float(match.group(1))
+    return SSDP_DEFAULT_MAX_AGE
+
+
+class KaleidescapePresenceMonitor:
+    """Follow a host's SSDP announcements to pause and resume its players.
+
+    A byebye, or an alive announcement that expires without being renewed, marks the
+    connection absent: polling and reconnect attempts stop and entities go unavailable. The
+    next alive reconnects and refreshes straight away. Hosts that never announce are left to
+    the circuit breaker. Announcements carry an IP address, so a host configured by name is
+    matched through its resolved addresses and the address the connection last reached.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: KaleidescapeClient,
+        players: list[dict[str, Any]],
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._client = client
+        self._players = players
+        self._host: str = entry.data["host"]
+        self._addresses: set[str] = {self._host}
+        self._cancel_expiry: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> CALLBACK_TYPE:
+        """Subscribe to SSDP announcements and return a function that stops monitoring."""
+        try:
+            infos = await self._hass.loop.getaddrinfo(self._host, None, type=socket.SOCK_STREAM)
+        except OSError:
+            _LOGGER.debug("Unable to resolve Kaleidescape host %s", self._host)
+        else:
+            self._addresses.update(str(info[4][0]) for info in infos)
+        remove_callback = await ssdp.async_register_callback(
+            self._hass, self._handle_ssdp, {ATTR_UPNP_MANUFACTURER: "Kaleidescape, Inc."}
+        )
+
+        @callback
+        def _stop() -> None:
+            remove_callback()
+            self._cancel_expiry_timer()
+
+        return _stop
+
+    @callback
+    def _handle_ssdp(self, discovery_info: SsdpServiceInfo, change: ssdp.SsdpChange) -> None:
+        if discovery_info.ssdp_location is None:
+            return
+        if not self._is_own_host(urlparse(discovery_info.ssdp_location).hostname):
+            return
+
+        self._cancel_expiry_timer()
+        if change == ssdp.SsdpChange.BYEBYE:
+            self._async_mark_absent("announced it is leaving the network")
+            return
+
+        self._cancel_expiry = async_call_later(
+            self._hass, _max_age(discovery_info), self._handle_expired
+        )
+        if self._client.available:
+            return
+        _LOGGER.debug("SSDP announcement from %s, reconnecting", self._host)
+        self._client.mark_reachable()
+        for player in self._players:
+            self._hass.async_create_task(player["sensor_coordinator"].async_request_refresh())
+
+    def _is_own_host(self, hostname: str | None) -> bool:
+        return hostname is not None and (
+            hostname in self._addresses or hostname == self._client.peer_address
+        )
+
+    @callback
+    def _handle_expired(self, _now: Any) -> None:
+        self._cancel_expiry = None
+        self._async_mark_absent("stopped renewing its SSDP announcement")
+
+    @callback
+    def _async_mark_absent(self, reason: str) -> None:
+        if not self._client.present:
+            return
+        _LOGGER.info("Kaleidescape host %s %s, pausing polling", self._host, reason)
+        self._entry.async_create_background_task(
+            self._hass,
+            self._client.async_mark_absent(),
+            f"{DOMAIN}_{self._entry.entry_id}_mark_absent",
+        )
+        error = KaleidescapeUnavailableError(f"Kaleidescape host {self._host} {reason}")
+        for player in self._players:
+            player["sensor_coordinator"].async_set_update_error(error)
+
+    @callback
+    def _cancel_expiry_timer(self) -> None:
+        if self._cancel_expiry is not None:
+            self._cancel_expiry()
+            self._cancel_expiry = None
@@ -1,27 +1,66 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Iterable
+import dataclasses
+import logging
+import re
+from collections.abc import Iterable, Mapping
+from pathlib import Path
 from typing import Any
 
+import voluptuous as vol
 from homeassistant.components.remote import RemoteEntity, RemoteEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
 from .const import (
     COMMAND_ALIASES,
     CONF_ALLOW_RAW_COMMANDS,
+    DATA_PLAYERS,
     DEFAULT_ALLOW_RAW_COMMANDS,
-    DEFAULT_NAME,
+    DEFAULT_MACRO_WAIT_TIMEOUT,
+    DEFAULT_METADATA_WINDOW,
     DOMAIN,
 )
+from .entity import player_device_info, player_unique_id
+from .kaleidescape_protocol import (
+    EVENT_SEQUENCE,
+    PLAYBACK_STATE_KEYS,
+    ProtocolCapture,
+    decode_state_response,
+    parse_response_message,
+)
+from .kaleidescape_protocol.capture import CaptureFrame, async_replay, read_capture, write_capture
 
 POWER_ON_COMMAND = "LEAVE_STANDBY"
 POWER_OFF_COMMAND = "ENTER_STANDBY"
 
+SERVICE_QUERY = "query"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+SERVICE_SYNC_CONTENT_DETAILS = "sync_content_details"
+ATTR_COMMANDS = "commands"
+ATTR_FILENAME = "filename"
+ATTR_REALTIME = "realtime"
+ATTR_HANDLES = "handles"
+ATTR_WINDOW = "window"
+QUERY_PREFIX = "GET_"
+CAPTURE_SUFFIX = ".cap.gz"
+
+_LOGGER = logging.getLogger(__name__)
+
+WAIT_STEP_PATTERN = re.compile(
+    r"^wait\s+(?P<key>\w+)\s*(?P<operator>==|!=)\s*(?P<value>\S+)"
+    r"(?:\s+within\s+(?P<timeout>\d+(?:\.\d+)?)s?)?$",
+    re.IGNORECASE,
+)
+
 
 def _supported_features() -> RemoteEntityFeature:
     features = RemoteEntityFeature(0)
@@ -46,13 +85,79 @@ def _normalize_command(command: str, *, allow_raw_commands: bool) -> str:
     )
 
 
+def _drop_empty(values: list[str]) -> list[str]:
+    return [value for value in values if value]
+
+
+class _WaitStep:
+    def __init__(self, key: str, operator: str, value: str, timeout: float) -> None:
+        self.key = key
+        self.expected = value.lower()
+        self.negate = operator == "!="
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        operator = "!=" if self.negate else "=="
+        return f"{self.key} {operator} {self.expected}"
+
+    def matches(self, state: Mapping[str, Any]) -> bool:
+        return (str(state.get(self.key)).lower() == self.expected) != self.negate
+
+
+def _parse_wait_step(command: str) -> _WaitStep | None:
+    if (match := WAIT_STEP_PATTERN.match(command.strip())) is None:
+        return None
+    key = match["key"].lower()
+    if key not in PLAYBACK_STATE_KEYS:
+        raise HomeAssistantError(f"Unknown Kaleidescape state '{key}' in wait step")
+    timeout = float(match["timeout"]) if match["timeout"] else DEFAULT_MACRO_WAIT_TIMEOUT
+    return _WaitStep(key, match["operator"], match["value"], timeout)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    client = hass.data[DOMAIN][entry.entry_id]["client"]
-    async_add_entities([KaleidescapeRemoteEntity(entry, client)])
+    async_add_entities(
+        KaleidescapeRemoteEntity(entry, player)
+        for player in hass.data[DOMAIN][entry.entry_id][DATA_PLAYERS]
+    )
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_QUERY,
+        {vol.Required(ATTR_COMMANDS): vol.All(cv.ensure_list, [cv.string])},
+        "async_query",
+        supports_response=SupportsResponse.ONLY,
+    )
+    platform.async_register_entity_service(SERVICE_START_CAPTURE, {}, "async_start_capture")
+    platform.async_register_entity_service(
+        SERVICE_STOP_CAPTURE,
+        {},
+        "async_stop_capture",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    platform.async_register_entity_service(
+        SERVICE_REPLAY_CAPTURE,
+        {
+            vol.Required(ATTR_FILENAME): cv.string,
+            vol.Optional(ATTR_REALTIME, default=False): cv.boolean,
+        },
+        "async_replay_capture",
+    )
+    platform.async_register_entity_service(
+        SERVICE_SYNC_CONTENT_DETAILS,
+        {
+            vol.Required(ATTR_HANDLES): vol.All(
+                cv.ensure_list, [vol.All(cv.string, vol.Strip)], _drop_empty
+            ),
+            vol.Optional(ATTR_WINDOW, default=DEFAULT_METADATA_WINDOW): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=6)
+            ),
+        },
+        "async_sync_content_details",
+    )
 
 
 class KaleidescapeRemoteEntity(RemoteEntity):
@@ -61,19 +166,29 @@ class KaleidescapeRemoteEntity(RemoteEntity):
     _attr_should_poll = False
     _attr_supported_features = _supported_features()
 
-    def __init__(self, entry: ConfigEntry, client) -> None:
+    def __init__(self, entry: ConfigEntry, player: dict[str, Any]) -> None:
         self._entry = entry
-        self._client = client
+        self._player = player
+        self._client = player["client"]
         self._allow_raw_commands = entry.options.get(
             CONF_ALLOW_RAW_COMMANDS,
             DEFAULT_ALLOW_RAW_COMMANDS,
         )
-        self._attr_unique_id = f"{entry.entry_id}_remote"
+        self._attr_unique_id = player_unique_id(entry, player, "remote")
         self._attr_is_on = True
+        self._replay_task: asyncio.Task[None] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._client.add_availability_listener(self._handle_availability))
+
+    @callback
+    def _handle_availability(self, available: bool) -> None:
+        self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
-        return True
+        return self._client.available
 
     @property
     def is_on(self) -> bool:
@@ -81,38 +196,151 @@ class KaleidescapeRemoteEntity(RemoteEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "manufacturer": "Kaleidescape",
-            "model": "Strato",
-            "name": self._entry.data.get(CONF_NAME, DEFAULT_NAME),
-        }
+        return player_device_info(self._entry, self._player)
 
     async def async_send_command(self, command: Iterable[str] | str, **kwargs: Any) -> None:
         commands = [command] if isinstance(command, str) else list(command)
+        steps: list[str | _WaitStep] = [
+            _parse_wait_step(raw_command)
+            or _normalize_command(raw_command, allow_raw_commands=self._allow_raw_commands)
+            for raw_command in commands
+        ]
 
         num_repeats = int(kwargs.get("num_repeats", 1))
         delay_secs = float(kwargs.get("delay_secs", 0.4))
+        # Macros with wait steps pace themselves on device state, so keys go back-to-back.
+        if any(isinstance(step, _WaitStep) for step in steps):
+            delay_secs = 0
 
         for repeat_index in range(num_repeats):
-            for command_index, raw_command in enumerate(commands):
-                resolved = _normalize_command(
-                    raw_command,
-                    allow_raw_commands=self._allow_raw_commands,
-                )
-                await self._client.async_send_command(resolved)
+            for step_index, step in enumerate(steps):
+                if isinstance(step, _WaitStep):
+                    await self._async_wait_for(step)
+                    continue
+                await self._async_send_command(step)
 
-                last_command = command_index == len(commands) - 1
+                last_step = step_index == len(steps) - 1
                 last_repeat = repeat_index == num_repeats - 1
-                if not (last_command and last_repeat):
+                if delay_secs and not (last_step and last_repeat):
                     await asyncio.sleep(delay_secs)
 
+    async def _async_wait_for(self, step: _WaitStep) -> None:
+        coordinator = self._player["sensor_coordinator"]
+        if not await coordinator.async_wait_for(step.matches, [step.key], step.timeout):
+            raise HomeAssistantError(
+                f"Kaleidescape player did not reach {step} within {step.timeout:g}s"
+            )
+
+    async def async_query(self, commands: list[str]) -> ServiceResponse:
+        """Send GET_* requests as one pipelined exchange and return the parsed responses."""
+        requests = [command.strip() for command in commands]
+        for command in requests:
+            if not command.split("/")[-1].upper().startswith(QUERY_PREFIX):
+                raise ServiceValidationError(
+                    f"Only {QUERY_PREFIX}* requests can be queried, got '{command}'"
+                )
+            # Addressed forms pick their own device, which may not be this entity's player.
+            if "/" in command and not self._allow_raw_commands:
+                raise ServiceValidationError(
+                    f"Addressed request '{command}' needs 'Allow sending raw commands to "
+                    "device' enabled in options"
+                )
+
+        try:
+            responses = await self._client.async_send_requests(requests)
+        except (OSError, TimeoutError) as err:
+            raise HomeAssistantError(f"Unable to query Kaleidescape player: {err}") from err
+
+        return {
+            "responses": {
+                command: dataclasses.asdict(response) if response is not None else None
+                for command, response in responses.items()
+            }
+        }
+
+    async def async_start_capture(self) -> None:
+        """Record every raw frame on this player's connection until stop_capture."""
+        self._client.connection.start_capture()
+
+    async def async_stop_capture(self) -> ServiceResponse:
+        """Write the running capture under <config>/kaleidescape_strato and return its path."""
+        capture = self._client.connection.stop_capture()
+        if capture is None:
+            raise ServiceValidationError("No Kaleidescape capture is running")
+
+        connection = self._client.connection
+        timestamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        path = self._capture_directory() / f"{connection.host}-{timestamp}{CAPTURE_SUFFIX}"
+        frames = await self.hass.async_add_executor_job(
+            self._write_capture, path, capture, f"{connection.host}:{connection.port}"
+        )
+        return {"path": str(path), "frames": frames, "truncated": capture.truncated}
+
+    async def async_replay_capture(self, filename: str, realtime: bool = False) -> None:
+        """Replay a capture's received frames for this player into its coordinator.
+
+        Event frames go through the connection's event listeners as if they had just been
+        read. Regular polling keeps running during the replay.
+        """
+        path = self._capture_directory() / Path(filename).name
+        try:
+            frames = await self.hass.async_add_executor_job(read_capture, path)
+        except (OSError, ValueError) as err:
+            raise ServiceValidationError(f"Unable to read capture {path.name}: {err}") from err
+
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+        self._replay_task = self._entry.async_create_background_task(
+            self.hass,
+            self._async_replay(frames, realtime),
+            f"{self.entity_id}_replay_capture",
+        )
+
+    async def async_sync_content_details(
+        self, handles: list[str], window: int = DEFAULT_METADATA_WINDOW
+    ) -> None:
+        """Fetch and store details for content handles in the background, resuming if cut off."""
+        self._player["metadata_sync"].async_start(handles, window)
+
+    async def _async_replay(self, frames: list[CaptureFrame], realtime: bool) -> None:
+        coordinator = self._player["sensor_coordinator"]
+        device_id = self._client.device_id.upper()
+
+        @callback
+        def _handle_frame(frame: CaptureFrame) -> None:
+            response = parse_response_message(frame.frame)
+            if response is None or response.device_id.upper() != device_id:
+                return
+            if response.sequence == EVENT_SEQUENCE:
+                self._client.connection.inject_message(frame.frame)
+            elif decoded := decode_state_response(response):
+                coordinator.async_merge_state(decoded)
+
+        replayed = await async_replay(frames, _handle_frame, realtime=realtime)
+        _LOGGER.debug("Replayed %s Kaleidescape frames into %s", replayed, self.entity_id)
+
+    def _capture_directory(self) -> Path:
+        return Path(self.hass.config.path(DOMAIN))
+
+    @staticmethod
+    def _write_capture(path: Path, capture: ProtocolCapture, source: str) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return write_capture(path, capture, source)
+
+    async def _async_send_command(self, command: str) -> None:
+        try:
+            await self._client.async_send_command(command)
+        except (OSError, TimeoutError) as err:
+            raise HomeAssistantError(
+                f"Unable to send {command} to Kaleidescape player: {err}"
+            ) from err
+
     async def async_turn_on(self, **kwargs: Any) -> None:
-        await self._client.async_send_command(POWER_ON_COMMAND)
+        await self._async_send_command(POWER_ON_COMMAND)
         self._attr_is_on = True
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        await self._client.async_send_command(POWER_OFF_COMMAND)
+        await self._async_send_command(POWER_OFF_COMMAND)
         self._attr_is_on = False
 
     async def async_toggle(self, **kwargs: Any) -> None:
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DOMAIN
+from .coordinator import KaleidescapeSensorCoordinator
+
+
+@dataclass(eq=False)
+class _PollJob:
+    """One refresh tier of one player, polled once for every coordinator following it."""
+
+    target: tuple[object, str]
+    interval: float
+    commands: list[str]
+    coordinators: list[KaleidescapeSensorCoordinator] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+    task: asyncio.Task[None] | None = field(default=None, repr=False)
+
+
+class KaleidescapePollScheduler:
+    """Spread the polls of every Kaleidescape coordinator evenly over each refresh interval.
+
+    Every refresh tier of every player is a job; coordinators of several config entries
+    that poll the same commands on the same connection and device share one job, so the
+    player is asked once and the result is fanned out. Jobs sharing an interval own fixed
+    phase slots within it, re-assigned whenever jobs are added or removed, and every poll is
+    nudged by a small random jitter that never crosses into a neighbouring slot. Slots of
+    paused coordinators are skipped.
+    """
+
+    def __init__(self, hass: HomeAssistant, jitter: float) -> None:
+        self._hass = hass
+        self._jitter = jitter
+        self._jobs: dict[float, list[_PollJob]] = {}
+
+    @callback
+    def async_add(self, coordinator: KaleidescapeSensorCoordinator) -> CALLBACK_TYPE:
+        jobs = [
+            self._job_for(coordinator.poll_target, interval, commands)
+            for interval, commands in coordinator.refresh_tiers().items()
+        ]
+        for job in jobs:
+            job.coordinators.append(coordinator)
+
+        @callback
+        def _remove() -> None:
+            for job in jobs:
+                if coordinator in job.coordinators:
+                    job.coordinators.remove(coordinator)
+                if job.coordinators or job not in self._jobs.get(job.interval, []):
+                    continue
+                self._jobs[job.interval].remove(job)
+                if job.timer is not None:
+                    job.timer.cancel()
+                    job.timer = None
+                self._rebalance(job.interval)
+
+        return _remove
+
+    def _job_for(
+        self, target: tuple[object, str], interval: float, commands: list[str]
+    ) -> _PollJob:
+        for job in self._jobs.get(interval, []):
+            if job.target == target and set(job.commands) == set(commands):
+                return job
+        job = _PollJob(target, interval, list(commands))
+        self._jobs.setdefault(interval, []).append(job)
+        self._rebalance(interval)
+        return job
+
+    def _rebalance(self, interval: float) -> None:
+        jobs = self._jobs.get(interval, [])
+        for job in jobs:
+            if job.timer is not None:
+                job.timer.cancel()
+        if not jobs:
+            self._jobs.pop(interval, None)
+            return
+
+        now = self._hass.loop.time()
+        cycle_start = now - now % interval
+        slot = interval / len(jobs)
+        for index, job in enumerate(jobs):
+            due = cycle_start + index * slot
+            if due <= now:
+                due += interval
+            self._schedule(job, due)
+
+    def _schedule(self, job: _PollJob, due: float) -> None:
+        max_jitter = min(self._jitter, job.interval / len(self._jobs[job.interval]) / 4)
+        when = max(due + random.uniform(-max_jitter, max_jitter), self._hass.loop.time())
+        job.timer = self._hass.loop.call_at(when, self._poll, job, due)
+
+    @callback
+    def _poll(self, job: _PollJob, due: float) -> None:
+        self._schedule(job, due + job.interval)
+        if not job.coordinators or any(coordinator.paused for coordinator in job.coordinators):
+            return
+        if job.task is not None and not job.task.done():
+            # The previous poll of this tier is still waiting on the player; skip this slot.
+            return
+        lead = job.coordinators[0]
+        job.task = lead.config_entry.async_create_background_task(
+            self._hass,
+            self._async_poll(job),
+            f"{DOMAIN}_{lead.name}_poll_{job.interval:g}s",
+        )
+
+    async def _async_poll(self, job: _PollJob) -> None:
+        try:
+            partial = await job.coordinators[0].async_query_commands(job.commands)
+        except (OSError, TimeoutError) as err:
+            error = UpdateFailed(f"Unable to poll Kaleidescape player: {err!r}")
+            for coordinator in list(job.coordinators):
+                coordinator.async_set_update_error(error)
+            return
+        for coordinator in list(job.coordinators):
+            coordinator.async_apply_polled_state(partial)
@@ -1,25 +1,71 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, PERCENTAGE, EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DATA_DEVICE_TYPE, DATA_IS_MOVIE_PLAYER, DEFAULT_NAME, DOMAIN
+from .const import (
+    CONF_COMPACT_ENTITIES,
+    DATA_IS_MOVIE_PLAYER,
+    DATA_PLAYERS,
+    DEFAULT_COMPACT_ENTITIES,
+    DOMAIN,
+)
 from .coordinator import KaleidescapeSensorCoordinator
+from .entity import player_device_info, player_unique_id, remove_player_entities
+from .kaleidescape_protocol import KaleidescapeClient, StateValue
+from .metadata import KaleidescapeMetadataSync
+from .playback import KaleidescapePlaybackClock
 
 
 @dataclass(frozen=True, kw_only=True)
 class KaleidescapeSensorDescription(SensorEntityDescription):
-    value_fn: Callable[[dict[str, str | int | float | None]], StateType]
+    value_fn: Callable[[Mapping[str, StateValue]], StateType]
+
+
+@dataclass(frozen=True, kw_only=True)
+class KaleidescapeSensorGroupDescription(SensorEntityDescription):
+    """One compact-mode sensor standing in for several playback state sensors."""
+
+    state_key: str
+    attribute_keys: tuple[str, ...]
+
+
+@dataclass(frozen=True, kw_only=True)
+class KaleidescapeConnectionSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[KaleidescapeClient], StateType]
+
+
+@dataclass(frozen=True, kw_only=True)
+class KaleidescapePlaybackSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[KaleidescapePlaybackClock], StateType | datetime]
 
 
+CONNECTION_SENSOR_TYPES: tuple[KaleidescapeConnectionSensorDescription, ...] = (
+    KaleidescapeConnectionSensorDescription(
+        key="command_queue_depth",
+        name="Command queue depth",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda client: client.queue_depth,
+    ),
+)
+
 SHARED_SENSOR_TYPES: tuple[KaleidescapeSensorDescription, ...] = (
     KaleidescapeSensorDescription(
         key="serial",
@@ -196,24 +242,154 @@ PLAYER_SENSOR_TYPES: tuple[KaleidescapeSensorDescription, ...] = (
     ),
 )
 
+PLAYBACK_SENSOR_TYPES: tuple[KaleidescapePlaybackSensorDescription, ...] = (
+    KaleidescapePlaybackSensorDescription(
+        key="time_remaining",
+        name="Time remaining",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda clock: clock.time_remaining(),
+    ),
+    KaleidescapePlaybackSensorDescription(
+        key="estimated_end",
+        name="Estimated end",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda clock: clock.estimated_end,
+    ),
+    KaleidescapePlaybackSensorDescription(
+        key="chapter_progress",
+        name="Chapter progress",
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda clock: clock.chapter_progress,
+    ),
+)
+
+
+SHARED_SENSOR_GROUPS: tuple[KaleidescapeSensorGroupDescription, ...] = (
+    KaleidescapeSensorGroupDescription(
+        key="system",
+        name="System",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_key="power_state",
+        attribute_keys=("system_readiness_state", "serial", "cpdid", "device_ip"),
+    ),
+)
+
+PLAYER_SENSOR_GROUPS: tuple[KaleidescapeSensorGroupDescription, ...] = (
+    KaleidescapeSensorGroupDescription(
+        key="video_format",
+        name="Video format",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_key="video_mode",
+        attribute_keys=(
+            "video_color_eotf",
+            "video_color_space",
+            "video_color_depth",
+            "video_color_sampling",
+        ),
+    ),
+    KaleidescapeSensorGroupDescription(
+        key="masking",
+        name="Masking",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_key="screen_mask_ratio",
+        attribute_keys=(
+            "screen_mask_top_trim_rel",
+            "screen_mask_bottom_trim_rel",
+            "screen_mask_conservative_ratio",
+            "screen_mask_top_mask_abs",
+            "screen_mask_bottom_mask_abs",
+            "cinemascape_mode",
+            "cinemascape_mask",
+        ),
+    ),
+    KaleidescapeSensorGroupDescription(
+        key="ui",
+        name="Ui",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_key="ui_screen",
+        attribute_keys=("ui_popup", "ui_dialog"),
+    ),
+    KaleidescapeSensorGroupDescription(
+        key="timing",
+        name="Timing",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_key="title_location",
+        attribute_keys=("title_length", "chapter_location", "chapter_length"),
+    ),
+)
+
+# Sensors that compact mode keeps as separate entities.
+COMPACT_PLAYER_SENSOR_KEYS = frozenset({"media_location", "play_status", "play_speed"})
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    coordinator: KaleidescapeSensorCoordinator = hass.data[DOMAIN][entry.entry_id][
-        "sensor_coordinator"
-    ]
-    is_movie_player: bool = hass.data[DOMAIN][entry.entry_id][DATA_IS_MOVIE_PLAYER]
+    compact = entry.options.get(CONF_COMPACT_ENTITIES, DEFAULT_COMPACT_ENTITIES)
+    entities: list[SensorEntity] = []
+    for player in hass.data[DOMAIN][entry.entry_id][DATA_PLAYERS]:
+        sensor_types = SHARED_SENSOR_TYPES
+        group_types = SHARED_SENSOR_GROUPS
+        if player[DATA_IS_MOVIE_PLAYER]:
+            sensor_types += PLAYER_SENSOR_TYPES
+            group_types += PLAYER_SENSOR_GROUPS
+            entities.extend(
+                KaleidescapePlaybackSensorEntity(entry, player, description)
+                for description in PLAYBACK_SENSOR_TYPES
+            )
+        else:
+            # Left over when a setup before profile detection assumed a movie player.
+            remove_player_entities(
+                hass,
+                entry,
+                player,
+                "sensor",
+                (
+                    description.key
+                    for description in (
+                        *PLAYER_SENSOR_TYPES,
+                        *PLAYER_SENSOR_GROUPS,
+                        *PLAYBACK_SENSOR_TYPES,
+                    )
+                ),
+            )
 
-    sensor_types = SHARED_SENSOR_TYPES
-    if is_movie_player:
-        sensor_types += PLAYER_SENSOR_TYPES
+        if compact:
+            replaced = tuple(
+                description
+                for description in sensor_types
+                if description.key not in COMPACT_PLAYER_SENSOR_KEYS
+            )
+            sensor_types = tuple(
+                description
+                for description in sensor_types
+                if description.key in COMPACT_PLAYER_SENSOR_KEYS
+            )
+        else:
+            replaced = group_types
+            group_types = ()
 
-    async_add_entities(
-        KaleidescapeSensorEntity(entry, coordinator, description) for description in sensor_types
-    )
+        # Drop the registry entries of the mode that is not in use.
+        remove_player_entities(
+            hass, entry, player, "sensor", (description.key for description in replaced)
+        )
+
+        entities.extend(
+            KaleidescapeSensorEntity(entry, player, description) for description in sensor_types
+        )
+        entities.extend(
+            KaleidescapeSensorGroupEntity(entry, player, description) for description in group_types
+        )
+        entities.extend(
+            KaleidescapeConnectionSensorEntity(entry, player, description)
+            for description in CONNECTION_SENSOR_TYPES
+        )
+        entities.append(KaleidescapeMetadataSyncSensorEntity(entry, player))
+
+    async_add_entities(entities)
 
 
 class KaleidescapeSensorEntity(CoordinatorEntity[KaleidescapeSensorCoordinator], SensorEntity):
@@ -224,28 +400,174 @@ class KaleidescapeSensorEntity(CoordinatorEntity[KaleidescapeSensorCoordinator],
     def __init__(
         self,
         entry: ConfigEntry,
-        coordinator: KaleidescapeSensorCoordinator,
+        player: dict[str, Any],
         description: KaleidescapeSensorDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(player["sensor_coordinator"])
         self._entry = entry
+        self._player = player
         self.entity_description = description
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_unique_id = player_unique_id(entry, player, description.key)
 
     @property
     def device_info(self):
-        device_type = self.hass.data[DOMAIN][self._entry.entry_id].get(
-            DATA_DEVICE_TYPE, "Kaleidescape"
-        )
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "manufacturer": "Kaleidescape",
-            "model": str(device_type),
-            "name": self._entry.data.get(CONF_NAME, DEFAULT_NAME),
-        }
+        return player_device_info(self._entry, self._player)
 
     @property
     def native_value(self) -> StateType:
         if not self.coordinator.data:
             return None
         return self.entity_description.value_fn(self.coordinator.data)
+
+
+class KaleidescapeSensorGroupEntity(CoordinatorEntity[KaleidescapeSensorCoordinator], SensorEntity):
+    """Compact-mode sensor that only writes state when a value in its group changes."""
+
+    _attr_has_entity_name = True
+
+    entity_description: KaleidescapeSensorGroupDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        player: dict[str, Any],
+        description: KaleidescapeSensorGroupDescription,
+    ) -> None:
+        super().__init__(player["sensor_coordinator"])
+        self._entry = entry
+        self._player = player
+        self.entity_description = description
+        self._attr_unique_id = player_unique_id(entry, player, description.key)
+        self._group_values = self._values(self.coordinator.data)
+        self._written_available = True
+
+    def _values(self, state: Mapping[str, Any] | None) -> tuple[Any, ...]:
+        if not state:
+            return ()
+        description = self.entity_description
+        keys = (description.state_key, *description.attribute_keys)
+        return tuple(state.get(key) for key in keys)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        values = self._values(self.coordinator.data)
+        if values == self._group_values and self.available == self._written_available:
+            return
+        self._group_values = values
+        self._written_available = self.available
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self):
+        return player_device_info(self._entry, self._player)
+
+    @property
+    def native_value(self) -> StateType:
+        return self._group_values[0] if self._group_values else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if not self._group_values:
+            return None
+        attribute_keys = self.entity_description.attribute_keys
+        return dict(zip(attribute_keys, self._group_values[1:], strict=True))
+
+
+class KaleidescapeConnectionSensorEntity(
+    CoordinatorEntity[KaleidescapeSensorCoordinator], SensorEntity
+):
+    """Diagnostics about the shared control connection, sampled on each poll."""
+
+    _attr_has_entity_name = True
+
+    entity_description: KaleidescapeConnectionSensorDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        player: dict[str, Any],
+        description: KaleidescapeConnectionSensorDescription,
+    ) -> None:
+        super().__init__(player["sensor_coordinator"])
+        self._entry = entry
+        self._player = player
+        self.entity_description = description
+        self._attr_unique_id = player_unique_id(entry, player, description.key)
+
+    @property
+    def device_info(self):
+        return player_device_info(self._entry, self._player)
+
+    @property
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(self._player["client"])
+
+
+class KaleidescapePlaybackSensorEntity(
+    CoordinatorEntity[KaleidescapeSensorCoordinator], SensorEntity
+):
+    """Values derived locally from the player's playback clock, extrapolated to now."""
+
+    _attr_has_entity_name = True
+
+    entity_description: KaleidescapePlaybackSensorDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        player: dict[str, Any],
+        description: KaleidescapePlaybackSensorDescription,
+    ) -> None:
+        super().__init__(player["sensor_coordinator"])
+        self._entry = entry
+        self._player = player
+        self._clock: KaleidescapePlaybackClock = player["playback_clock"]
+        self.entity_description = description
+        self._attr_unique_id = player_unique_id(entry, player, description.key)
+
+    @property
+    def device_info(self):
+        return player_device_info(self._entry, self._player)
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        return self.entity_description.value_fn(self._clock)
+
+
+class KaleidescapeMetadataSyncSensorEntity(SensorEntity):
+    """Progress of the bulk content-details sync, with its current rate."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Content details sync"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, entry: ConfigEntry, player: dict[str, Any]) -> None:
+        self._entry = entry
+        self._player = player
+        self._sync: KaleidescapeMetadataSync = player["metadata_sync"]
+        self._attr_unique_id = player_unique_id(entry, player, "content_details_sync")
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._sync.add_listener(self.async_write_ha_state))
+
+    @property
+    def device_info(self):
+        return player_device_info(self._entry, self._player)
+
+    @property
+    def native_value(self) -> StateType:
+        return self._sync.progress
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "running": self._sync.running,
+            "fetched": self._sync.fetched,
+            "remaining": self._sync.remaining,
+            "rate": self._sync.rate,
+            "last_error": self._sync.last_error,
+        }
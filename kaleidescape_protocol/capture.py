@@ -0,0 +1,144 @@
+"""Record and replay raw Kaleidescape control-protocol sessions.
+
+Capture files are gzip-compressed text: a header line, then one frame per line as
+``<seconds since start> <direction> <frame>``, where the direction is ">" for frames sent to
+the player and "<" for frames received from it.
+
+Replay a capture through the parser and decoder without Home Assistant::
+
+    python -m kaleidescape_protocol.capture session.cap.gz --realtime
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import NamedTuple
+
+from .client import ProtocolCapture
+from .codec import EMPTY_PLAYBACK_STATE, PlaybackState, decode_state_response
+from .framing import parse_response_message
+
+CAPTURE_HEADER = "# kaleidescape-capture 1"
+REPLAY_YIELD_EVERY = 500
+
+
+class CaptureFrame(NamedTuple):
+    offset: float
+    direction: str
+    frame: str
+
+
+def write_capture(path: str | Path, capture: ProtocolCapture, source: str = "") -> int:
+    """Write a capture to path and return the number of frames written. Blocking."""
+    with gzip.open(path, "wt", encoding="utf-8") as capture_file:
+        capture_file.write(f"{CAPTURE_HEADER} {source}".rstrip() + "\n")
+        for offset, direction, frame in capture.frames:
+            capture_file.write(f"{offset:.3f} {direction} {frame}\n")
+    return len(capture.frames)
+
+
+def read_capture(path: str | Path) -> list[CaptureFrame]:
+    """Read the frames of a capture file. Blocking."""
+    frames: list[CaptureFrame] = []
+    with gzip.open(path, "rt", encoding="utf-8") as capture_file:
+        header = capture_file.readline()
+        if not header.startswith(CAPTURE_HEADER):
+            raise ValueError(f"{path} is not a Kaleidescape capture file")
+        for line in capture_file:
+            offset, direction, frame = line.rstrip("\n").split(" ", 2)
+            frames.append(CaptureFrame(float(offset), direction, frame))
+    return frames
+
+
+async def async_replay(
+    frames: Iterable[CaptureFrame],
+    handle_frame: Callable[[CaptureFrame], None],
+    *,
+    realtime: bool = False,
+) -> int:
+    """Feed received frames to handle_frame and return how many were replayed.
+
+    With realtime, frames keep their recorded spacing; otherwise they are replayed as fast
+    as possible, yielding to the event loop every few hundred frames.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    replayed = 0
+    for frame in frames:
+        if frame.direction != "<":
+            continue
+        if realtime:
+            if (delay := started + frame.offset - loop.time()) > 0:
+                await asyncio.sleep(delay)
+        elif replayed % REPLAY_YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+        handle_frame(frame)
+        replayed += 1
+    return replayed
+
+
+@dataclass
+class ReplayDecoder:
+    """Decode replayed frames into one PlaybackState per device, as the coordinator would."""
+
+    on_change: Callable[[CaptureFrame, str, PlaybackState], None] | None = None
+    states: dict[str, PlaybackState] = field(default_factory=dict)
+    frames: int = 0
+    decoded: int = 0
+    changes: int = 0
+
+    def handle_frame(self, frame: CaptureFrame) -> None:
+        self.frames += 1
+        response = parse_response_message(frame.frame)
+        if not (decoded := decode_state_response(response)):
+            return
+        self.decoded += 1
+        device_id = response.device_id if response is not None else ""
+        previous = self.states.get(device_id, EMPTY_PLAYBACK_STATE)
+        state = previous.updated(decoded)
+        if state is previous:
+            return
+        self.states[device_id] = state
+        self.changes += 1
+        if self.on_change is not None:
+            self.on_change(frame, device_id, state)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m kaleidescape_protocol.capture",
+        description="Replay a Kaleidescape protocol capture.",
+    )
+    parser.add_argument("capture", type=Path, help="capture file written by stop_capture")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded timing")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    def _print_change(frame: CaptureFrame, device_id: str, state: PlaybackState) -> None:
+        values = " ".join(f"{key}={state[key]}" for key in state.changed_keys)
+        print(f"{frame.offset:10.3f} {device_id} {values}")
+
+    frames = read_capture(args.capture)
+    decoder = ReplayDecoder(on_change=None if args.quiet else _print_change)
+    started = time.perf_counter()
+    asyncio.run(async_replay(frames, decoder.handle_frame, realtime=args.realtime))
+    elapsed = time.perf_counter() - started
+
+    rate = decoder.frames / elapsed if elapsed else 0.0
+    print(
+        f"{decoder.frames} frames received, {decoder.decoded} decoded, "
+        f"{decoder.changes} state changes in {elapsed:.3f}s ({rate:,.0f} frames/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+"""Decoding of status messages into playback state."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+
+from . import tables
+from .framing import KaleidescapeResponse
+from .tables import MOVIE_LOCATION_INDEX, PLAY_STATUS_INDEX
+
+
+def _decode_index(value: str, index: dict[int, str]) -> str:
+    try:
+        return index.get(int(value)) or sys.intern(value)
+    except ValueError:
+        return sys.intern(value)
+
+
+def parse_int(value: str) -> int | None:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+StateValue = str | int | float | None
+
+
+def _tenths(value: str) -> float:
+    return (parse_int(value) or 0) / 10.0
+
+
+def _decode_device_info(fields: list[str]) -> dict[str, StateValue]:
+    serial_value = fields[1].strip()
+    cpdid_value = fields[2].strip()
+    ip_value = fields[3].strip()
+    return {
+        "serial": serial_value.zfill(12) if serial_value else None,
+        "cpdid": cpdid_value or None,
+        "device_ip": ip_value or None,
+    }
+
+
+def _decode_play_status(fields: list[str]) -> dict[str, StateValue]:
+    return {
+        "play_status": _decode_index(fields[0], PLAY_STATUS_INDEX),
+        "play_speed": parse_int(fields[1]),
+        "title_length": parse_int(fields[3]),
+        "title_location": parse_int(fields[4]),
+        "chapter_length": parse_int(fields[6]),
+        "chapter_location": parse_int(fields[7]),
+    }
+
+
+def _decode_playing_title_name(fields: list[str]) -> dict[str, StateValue]:
+    return {"media_title": fields[0].strip() or None}
+
+
+def _decode_movie_media_type(fields: list[str]) -> dict[str, StateValue]:
+    return {"media_content_type": fields[0].strip().lower() or None}
+
+
+def _decode_highlighted_selection(fields: list[str]) -> dict[str, StateValue]:
+    # The cover belongs to the handle; the coordinator re-applies looked-up details.
+    return {"media_content_id": fields[0].strip() or None, "media_image_url": None}
+
+
+def _decode_movie_location(fields: list[str]) -> dict[str, StateValue]:
+    return {"media_location": _decode_index(fields[0], MOVIE_LOCATION_INDEX)}
+
+
+def _decode_video_mode(fields: list[str]) -> dict[str, StateValue]:
+    return {"video_mode": _decode_index(fields[2], tables.VIDEO_MODE_INDEX)}
+
+
+def _decode_video_color(fields: list[str]) -> dict[str, StateValue]:
+    return {
+        "video_color_eotf": _decode_index(fields[0], tables.VIDEO_COLOR_EOTF_INDEX),
+        "video_color_space": _decode_index(fields[1], tables.VIDEO_COLOR_SPACE_INDEX),
+        "video_color_depth": _decode_index(fields[2], tables.VIDEO_COLOR_DEPTH_INDEX),
+        "video_color_sampling": _decode_index(fields[3], tables.VIDEO_COLOR_SAMPLING_INDEX),
+    }
+
+
+def _decode_screen_mask(fields: list[str]) -> dict[str, StateValue]:
+    return {
+        "screen_mask_ratio": _decode_index(fields[0], tables.SCREEN_MASK_RATIO_INDEX),
+        "screen_mask_top_trim_rel": _tenths(fields[1]),
+        "screen_mask_bottom_trim_rel": _tenths(fields[2]),
+        "screen_mask_conservative_ratio": _decode_index(fields[3], tables.SCREEN_MASK_RATIO_INDEX),
+        "screen_mask_top_mask_abs": _tenths(fields[4]),
+        "screen_mask_bottom_mask_abs": _tenths(fields[5]),
+    }
+
+
+def _decode_cinemascape_mode(fields: list[str]) -> dict[str, StateValue]:
+    return {"cinemascape_mode": _decode_index(fields[0], tables.CINEMASCAPE_MODE_INDEX)}
+
+
+def _decode_cinemascape_mask(fields: list[str]) -> dict[str, StateValue]:
+    return {"cinemascape_mask": parse_int(fields[0])}
+
+
+def _decode_system_readiness_state(fields: list[str]) -> dict[str, StateValue]:
+    return {"system_readiness_state": _decode_index(fields[0], tables.SYSTEM_READINESS_INDEX)}
+
+
+def _decode_device_power_state(fields: list[str]) -> dict[str, StateValue]:
+    return {"power_state": _decode_index(fields[0], tables.POWER_STATE_INDEX)}
+
+
+def _decode_ui_state(fields: list[str]) -> dict[str, StateValue]:
+    return {
+        "ui_screen": _decode_index(fields[0], tables.UI_SCREEN_INDEX),
+        "ui_popup": _decode_index(fields[1], tables.UI_POPUP_INDEX),
+        "ui_dialog": _decode_index(fields[2], tables.UI_DIALOG_INDEX),
+    }
+
+
+@dataclass(frozen=True)
+class _StateDecoder:
+    """How one status message decodes; decode returns a value, or None, for every key."""
+
+    command: str
+    min_fields: int
+    keys: tuple[str, ...]
+    decode: Callable[[list[str]], dict[str, StateValue]]
+
+
+_STATE_DECODERS: tuple[_StateDecoder, ...] = (
+    _StateDecoder("GET_DEVICE_INFO", 4, ("serial", "cpdid", "device_ip"), _decode_device_info),
+    _StateDecoder(
+        "GET_PLAY_STATUS",
+        8,
+        (
+            "play_status",
+            "play_speed",
+            "title_length",
+            "title_location",
+            "chapter_length",
+            "chapter_location",
+        ),
+        _decode_play_status,
+    ),
+    _StateDecoder("GET_PLAYING_TITLE_NAME", 1, ("media_title",), _decode_playing_title_name),
+    _StateDecoder(
+        "GET_HIGHLIGHTED_SELECTION",
+        1,
+        ("media_content_id", "media_image_url"),
+        _decode_highlighted_selection,
+    ),
+    _StateDecoder("GET_MOVIE_MEDIA_TYPE", 1, ("media_content_type",), _decode_movie_media_type),
+    _StateDecoder("GET_MOVIE_LOCATION", 1, ("media_location",), _decode_movie_location),
+    _StateDecoder("GET_VIDEO_MODE", 3, ("video_mode",), _decode_video_mode),
+    _StateDecoder(
+        "GET_VIDEO_COLOR",
+        4,
+        ("video_color_eotf", "video_color_space", "video_color_depth", "video_color_sampling"),
+        _decode_video_color,
+    ),
+    _StateDecoder(
+        "GET_SCREEN_MASK",
+        6,
+        (
+            "screen_mask_ratio",
+            "screen_mask_top_trim_rel",
+            "screen_mask_bottom_trim_rel",
+            "screen_mask_conservative_ratio",
+            "screen_mask_top_mask_abs",
+            "screen_mask_bottom_mask_abs",
+        ),
+        _decode_screen_mask,
+    ),
+    _StateDecoder("GET_CINEMASCAPE_MODE", 1, ("cinemascape_mode",), _decode_cinemascape_mode),
+    _StateDecoder("GET_CINEMASCAPE_MASK", 1, ("cinemascape_mask",), _decode_cinemascape_mask),
+    _StateDecoder(
+        "GET_SYSTEM_READINESS_STATE",
+        1,
+        ("system_readiness_state",),
+        _decode_system_readiness_state,
+    ),
+    _StateDecoder("GET_DEVICE_POWER_STATE", 1, ("power_state",), _decode_device_power_state),
+    _StateDecoder("GET_UI_STATE", 3, ("ui_screen", "ui_popup", "ui_dialog"), _decode_ui_state),
+)
+
+STATE_DECODERS_BY_NAME: dict[str, _StateDecoder] = {
+    decoder.command.removeprefix("GET_"): decoder for decoder in _STATE_DECODERS
+}
+STATE_COMMANDS_BY_KEY: dict[str, str] = {
+    key: decoder.command for decoder in _STATE_DECODERS for key in decoder.keys
+}
+
+SHARED_STATE_COMMANDS: tuple[str, ...] = (
+    "GET_SYSTEM_READINESS_STATE",
+    "GET_DEVICE_POWER_STATE",
+    "GET_DEVICE_INFO",
+)
+PLAYER_STATE_COMMANDS: tuple[str, ...] = (
+    "GET_PLAY_STATUS",
+    "GET_PLAYING_TITLE_NAME",
+    "GET_HIGHLIGHTED_SELECTION",
+    "GET_MOVIE_MEDIA_TYPE",
+    "GET_MOVIE_LOCATION",
+    "GET_VIDEO_MODE",
+    "GET_VIDEO_COLOR",
+    "GET_SCREEN_MASK",
+    "GET_CINEMASCAPE_MODE",
+    "GET_CINEMASCAPE_MASK",
+    "GET_UI_STATE",
+)
+
+PLAYBACK_STATE_KEYS: tuple[str, ...] = (
+    "serial",
+    "cpdid",
+    "device_ip",
+    "media_location",
+    "play_status",
+    "play_speed",
+    "title_length",
+    "title_location",
+    "chapter_length",
+    "chapter_location",
+    "media_title",
+    "media_content_id",
+    "media_content_type",
+    "media_image_url",
+    "video_mode",
+    "video_color_eotf",
+    "video_color_space",
+    "video_color_depth",
+    "video_color_sampling",
+    "screen_mask_ratio",
+    "screen_mask_top_trim_rel",
+    "screen_mask_bottom_trim_rel",
+    "screen_mask_conservative_ratio",
+    "screen_mask_top_mask_abs",
+    "screen_mask_bottom_mask_abs",
+    "cinemascape_mode",
+    "cinemascape_mask",
+    "system_readiness_state",
+    "power_state",
+    "ui_screen",
+    "ui_popup",
+    "ui_dialog",
+)
+
+PLAYBACK_STATE_DEFAULTS: dict[str, StateValue] = {
+    "serial": "",
+    "cpdid": "",
+    "device_ip": "",
+    "media_location": "none",
+    "play_status": "none",
+    "play_speed": 0,
+    "title_length": 0,
+    "title_location": 0,
+    "chapter_length": 0,
+    "chapter_location": 0,
+    "media_title": "",
+    "media_content_id": "",
+    "media_content_type": "none",
+    "media_image_url": "",
+    "video_mode": "none",
+    "video_color_eotf": "unknown",
+    "video_color_space": "default",
+    "video_color_depth": "unknown",
+    "video_color_sampling": "none",
+    "screen_mask_ratio": "none",
+    "screen_mask_top_trim_rel": 0.0,
+    "screen_mask_bottom_trim_rel": 0.0,
+    "screen_mask_conservative_ratio": "none",
+    "screen_mask_top_mask_abs": 0.0,
+    "screen_mask_bottom_mask_abs": 0.0,
+    "cinemascape_mode": "none",
+    "cinemascape_mask": 0,
+    "system_readiness_state": "idle",
+    "power_state": "standby",
+    "ui_screen": "unknown",
+    "ui_popup": "none",
+    "ui_dialog": "none",
+}
+
+# Snapshot values are grouped by the status message that carries them.
+_STATE_GROUPS: tuple[tuple[str, ...], ...] = tuple(decoder.keys for decoder in _STATE_DECODERS)
+_STATE_SLOTS: dict[str, tuple[int, int]] = {
+    key: (group, position)
+    for group, keys in enumerate(_STATE_GROUPS)
+    for position, key in enumerate(keys)
+}
+_STATE_BITS: dict[str, int] = {key: 1 << bit for bit, key in enumerate(PLAYBACK_STATE_KEYS)}
+
+
+class PlaybackState(Mapping[str, StateValue]):
+    """Immutable snapshot of a player's decoded state.
+
+    Values live in one tuple per status message, so an update rebuilds only the groups it
+    touches and shares the others with the snapshot it came from. ``changed`` is a bit mask
+    over PLAYBACK_STATE_KEYS of the fields that differ from that snapshot. Every field is
+    readable as an attribute, and the read-only mapping interface keeps dict-style access.
+    """
+
+    __slots__ = ("_groups", "changed")
+
+    _groups: tuple[tuple[StateValue, ...], ...]
+    changed: int
+
+    def __init__(self, groups: tuple[tuple[StateValue, ...], ...], changed: int = 0) -> None:
+        object.__setattr__(self, "_groups", groups)
+        object.__setattr__(self, "changed", changed)
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, object]) -> PlaybackState:
+        """Build a snapshot from known keys in values, using defaults for the rest."""
+        return EMPTY_PLAYBACK_STATE.updated(values, complete=True)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("PlaybackState is immutable")
+
+    def __getitem__(self, key: str) -> StateValue:
+        group, position = _STATE_SLOTS[key]
+        return self._groups[group][position]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PLAYBACK_STATE_KEYS)
+
+    def __len__(self) -> int:
+        return len(PLAYBACK_STATE_KEYS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PlaybackState):
+            return self._groups == other._groups
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"PlaybackState({self.as_dict()!r})"
+
+    @property
+    def changed_keys(self) -> tuple[str, ...]:
+        return tuple(key for key in PLAYBACK_STATE_KEYS if self.changed & _STATE_BITS[key])
+
+    def as_dict(self) -> dict[str, StateValue]:
+        return {key: self[key] for key in PLAYBACK_STATE_KEYS}
+
+    def updated(self, values: Mapping[str, object], *, complete: bool = False) -> PlaybackState:
+        """Return a snapshot with values applied, or this one if nothing changed.
+
+        None and unknown keys fall back to the defaults. With complete=True, keys absent
+        from values are reset to their defaults too, as after a full poll.
+        """
+        groups = list(self._groups)
+        changed = 0
+        for index, keys in enumerate(_STATE_GROUPS):
+            if not complete and not any(key in values for key in keys):
+                continue
+            current = groups[index]
+            group = tuple(
+                _state_value(key, values.get(key))
+                if complete or key in values
+                else current[position]
+                for position, key in enumerate(keys)
+            )
+            if group == current:
+                continue
+            groups[index] = group
+            for position, key in enumerate(keys):
+                if group[position] != current[position]:
+                    changed |= _STATE_BITS[key]
+        if not changed:
+            return self
+        return PlaybackState(tuple(groups), changed)
+
+
+def _state_value(key: str, value: object) -> StateValue:
+    if value is None:
+        return PLAYBACK_STATE_DEFAULTS[key]
+    return value  # type: ignore[return-value]
+
+
+def _playback_state_field(key: str) -> property:
+    group, position = _STATE_SLOTS[key]
+    return property(lambda state: state._groups[group][position])
+
+
+for _key in PLAYBACK_STATE_KEYS:
+    setattr(PlaybackState, _key, _playback_state_field(_key))
+del _key
+
+EMPTY_PLAYBACK_STATE = PlaybackState(
+    tuple(tuple(PLAYBACK_STATE_DEFAULTS[key] for key in keys) for keys in _STATE_GROUPS)
+)
+
+
+def decode_state_response(response: KaleidescapeResponse | None) -> dict[str, StateValue]:
+    """Decode one status message into playback state fields, or {} if it carries none."""
+    if response is None or response.status != 0:
+        return {}
+    decoder = STATE_DECODERS_BY_NAME.get(response.name)
+    if decoder is None or len(response.fields) < decoder.min_fields:
+        return {}
+    return decoder.decode(response.fields)
+
+
+def state_commands_for_keys(keys: Iterable[str]) -> list[str]:
+    """Return the GET_* commands needed to refresh the given playback state keys."""
+    commands: list[str] = []
+    for key in keys:
+        command = STATE_COMMANDS_BY_KEY.get(key)
+        if command is not None and command not in commands:
+            commands.append(command)
+    return commands
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import importlib.util
+
+import pytest
+
+collect_ignore: list[str] = []
+if importlib.util.find_spec("pytest_homeassistant_custom_component") is None:
+    # The integration tests need Home Assistant's test harness from requirements_test.txt.
+    collect_ignore.append("integration")
+
+if importlib.util.find_spec("pytest_socket") is None:
+
+    @pytest.fixture
+    def socket_enabled() -> None:
+        """Stand in for pytest-socket's fixture when nothing blocks sockets."""
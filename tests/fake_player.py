@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+
+def default_reply(body: str) -> str:
+    """Answer a request with an empty success message named after it."""
+    name = body.split(":", 1)[0].removeprefix("GET_")
+    return f"000:{name}:"
+
+
+class FakePlayer:
+    """Control port on localhost that answers every request line, optionally late.
+
+    reply maps a request body to the payload after the sequence number; delays maps a
+    request name such as GET_VIDEO_MODE to seconds to wait before answering it.
+    """
+
+    def __init__(
+        self,
+        reply: Callable[[str], str] = default_reply,
+        delays: dict[str, float] | None = None,
+    ) -> None:
+        self.reply = reply
+        self.delays = delays or {}
+        self.received: list[str] = []
+        self.port = 0
+        self._server: asyncio.Server | None = None
+        self._writers: list[asyncio.StreamWriter] = []
+        self._handlers: list[asyncio.Task[None]] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def __aenter__(self) -> FakePlayer:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        for task in self._tasks:
+            task.cancel()
+        for writer in self._writers:
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def bodies(self, name: str) -> list[str]:
+        """Return the received request bodies that start with name."""
+        return [
+            body
+            for body in (frame.split("/", 2)[2] for frame in self.received)
+            if body.startswith(name)
+        ]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.append(writer)
+        self._handlers.append(asyncio.current_task())
+        try:
+            await self._serve(reader, writer)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while line := await reader.readline():
+            frame = line.decode("latin-1").strip()
+            self.received.append(frame)
+            device_id, sequence, body = frame.split("/", 2)
+            message = f"{device_id}/{sequence}/{self.reply(body)}/\n"
+            delay = self.delays.get(body.split(":", 1)[0], 0.0)
+            task = asyncio.create_task(self._send(writer, message, delay))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: str, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        if not writer.is_closing():
+            writer.write(message.encode("latin-1"))
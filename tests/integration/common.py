@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fake_client import FakeClient
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kaleidescape_strato.const import DATA_PLAYER_ID, DOMAIN
+from custom_components.kaleidescape_strato.coordinator import KaleidescapeSensorCoordinator
+
+
+def mock_player(
+    hass: HomeAssistant, client: FakeClient, options: dict[str, Any] | None = None
+) -> tuple[MockConfigEntry, dict[str, Any]]:
+    """Add a config entry and return it with a player dict as async_setup_entry builds it."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "127.0.0.1"}, options=options or {})
+    entry.add_to_hass(hass)
+    coordinator = KaleidescapeSensorCoordinator(hass, entry, client, include_player_metrics=True)
+    player = {
+        CONF_NAME: "Theater",
+        DATA_PLAYER_ID: "",
+        "client": client,
+        "sensor_coordinator": coordinator,
+    }
+    return entry, player
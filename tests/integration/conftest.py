@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Generator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Let Home Assistant load the integration from custom_components."""
+
+
+@pytest.fixture
+def ssdp_callbacks(hass: HomeAssistant) -> Generator[list[Callable[..., None]]]:
+    """Stand in for the ssdp integration and collect the announcement callbacks registered."""
+    callbacks: list[Callable[..., None]] = []
+
+    async def _register(
+        hass: HomeAssistant, callback: Callable[..., None], match_dict: Any = None
+    ) -> Callable[[], None]:
+        callbacks.append(callback)
+        return lambda: callbacks.remove(callback)
+
+    hass.config.components.add("ssdp")
+    with patch("homeassistant.components.ssdp.async_register_callback", _register):
+        yield callbacks
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from custom_components.kaleidescape_strato.kaleidescape_protocol import (
+    KaleidescapeResponse,
+    StateValue,
+)
+
+
+class FakeClient:
+    """Stand-in for KaleidescapeClient that answers state queries from a dict.
+
+    effects maps a command to the state fields it changes once sent; responses maps a raw
+    request to its reply and details a content handle to its (title, image URL). While gate
+    or details_gate is set and closed, state queries or detail lookups wait for it; error, if
+    set, is raised by every query and request.
+    """
+
+    def __init__(
+        self,
+        state: dict[str, StateValue] | None = None,
+        effects: dict[str, dict[str, StateValue]] | None = None,
+    ) -> None:
+        self.state: dict[str, StateValue] = dict(state or {})
+        self.effects = effects or {}
+        self.responses: dict[str, KaleidescapeResponse] = {}
+        self.error: Exception | None = None
+        self.gate: asyncio.Event | None = None
+        self.sent: list[str] = []
+        self.queries: list[list[str]] = []
+        self.requests: list[list[str]] = []
+        self.polls = 0
+        self.details: dict[str, tuple[str | None, str | None]] = {}
+        self.details_gate: asyncio.Event | None = None
+        self.details_requests: list[str] = []
+        self.device_id = "01"
+        self.connection = object()
+        self.present = True
+        self.available = True
+        self.peer_address: str | None = None
+        self._event_listeners: list[Callable[[KaleidescapeResponse], None]] = []
+
+    def add_event_listener(
+        self, listener: Callable[[KaleidescapeResponse], None]
+    ) -> Callable[[], None]:
+        self._event_listeners.append(listener)
+        return lambda: self._event_listeners.remove(listener)
+
+    def emit(self, name: str, *fields: str) -> None:
+        """Deliver an event message to the listeners, as the read loop would."""
+        event = KaleidescapeResponse(0, name, list(fields), self.device_id, "!")
+        for listener in list(self._event_listeners):
+            listener(event)
+
+    def mark_reachable(self) -> None:
+        self.present = self.available = True
+
+    async def async_mark_absent(self) -> None:
+        self.present = self.available = False
+
+    async def async_send_command(self, command: str) -> None:
+        self.sent.append(command)
+        self.state.update(self.effects.get(command, {}))
+
+    async def async_query_state(self, commands: Iterable[str]) -> dict[str, Any]:
+        self.queries.append(list(commands))
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return dict(self.state)
+
+    async def async_query_playback_state(
+        self, *, include_player_metrics: bool = True
+    ) -> dict[str, Any]:
+        self.polls += 1
+        if self.error is not None:
+            raise self.error
+        return dict(self.state)
+
+    async def async_get_content_details(self, handle: str) -> tuple[str | None, str | None] | None:
+        self.details_requests.append(handle)
+        if self.details_gate is not None:
+            await self.details_gate.wait()
+        return self.details.get(handle)
+
+    async def async_send_requests(
+        self, commands: list[str]
+    ) -> dict[str, KaleidescapeResponse | None]:
+        self.requests.append(list(commands))
+        if self.error is not None:
+            raise self.error
+        return {command: self.responses.get(command) for command in commands}
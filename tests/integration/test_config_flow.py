@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from collections.abc import Generator
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.config_entries import SOURCE_SSDP, SOURCE_USER
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kaleidescape_strato.const import DOMAIN
+from custom_components.kaleidescape_strato.kaleidescape_protocol import KaleidescapeDevice
+
+pytestmark = pytest.mark.usefixtures("ssdp_callbacks", "no_setup")
+
+FLOW = "custom_components.kaleidescape_strato.config_flow"
+
+
+def _device(host: str, serial: str | None, name: str = "Theater") -> KaleidescapeDevice:
+    return KaleidescapeDevice(
+        host=host, port=10000, serial=serial, device_type="Strato S", name=name
+    )
+
+
+@pytest.fixture
+def no_setup() -> Generator[None]:
+    with patch("custom_components.kaleidescape_strato.async_setup_entry", return_value=True):
+        yield
+
+
+async def _manual(hass: HomeAssistant, host: str) -> dict:
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"name": "Theater", "host": host, "port": 10000, "timeout": 5.0, "system_mode": False},
+    )
+
+
+async def test_manual_entry_is_keyed_by_serial(hass: HomeAssistant) -> None:
+    with patch(f"{FLOW}.async_probe", AsyncMock(return_value=_device("10.0.0.5", "000001234567"))):
+        result = await _manual(hass, "10.0.0.5")
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == "000001234567"
+
+    # The same player under another address is the same device.
+    with patch(
+        f"{FLOW}.async_probe", AsyncMock(return_value=_device("player.local", "000001234567"))
+    ):
+        result = await _manual(hass, "player.local")
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_manual_entry_reports_unreachable_hosts(hass: HomeAssistant) -> None:
+    with patch(f"{FLOW}.async_probe", AsyncMock(return_value=None)):
+        result = await _manual(hass, "10.0.0.5")
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+
+async def test_scan_offers_new_devices_once_and_adds_each_selected(hass: HomeAssistant) -> None:
+    MockConfigEntry(domain=DOMAIN, unique_id="000000000003", data={"host": "10.0.0.9"}).add_to_hass(
+        hass
+    )
+    scanned = [
+        _device("10.0.0.1", "000000000001", "Theater"),
+        _device("10.0.0.2", "000000000002", "Lounge"),
+        _device("10.0.0.3", "000000000003", "Known"),
+        _device("10.0.0.4", "000000000001", "Theater"),
+    ]
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "scan_network"}
+    )
+    with patch(f"{FLOW}.async_scan", AsyncMock(return_value=scanned)):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"hosts": "10.0.0.0/29", "port": 10000}
+        )
+    assert result["step_id"] == "select_devices"
+    assert list(result["data_schema"].schema["devices"].options) == ["10.0.0.1", "10.0.0.2"]
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"devices": ["10.0.0.1", "10.0.0.2"]}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    entries = {entry.unique_id: entry for entry in hass.config_entries.async_entries(DOMAIN)}
+    assert set(entries) == {"000000000001", "000000000002", "000000000003"}
+    assert entries["000000000002"].data["host"] == "10.0.0.2"
+
+
+async def test_scan_requires_a_selection(hass: HomeAssistant) -> None:
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "scan_network"}
+    )
+    with patch(f"{FLOW}.async_scan", AsyncMock(return_value=[_device("10.0.0.1", "1")])):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"hosts": "10.0.0.1", "port": 10000}
+        )
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"devices": []})
+    assert result["errors"] == {"base": "no_devices_selected"}
+
+
+def _ssdp(host: str) -> SsdpServiceInfo:
+    return SsdpServiceInfo(
+        ssdp_usn="uuid:player::upnp:rootdevice",
+        ssdp_st="upnp:rootdevice",
+        ssdp_location=f"http://{host}:80/description.xml",
+        ssdp_udn="uuid:player",
+        upnp={"friendlyName": "Theater"},
+    )
+
+
+async def test_ssdp_updates_the_host_of_a_manually_added_device(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, unique_id="000001234567", data={"host": "10.0.0.5"})
+    entry.add_to_hass(hass)
+
+    with patch(f"{FLOW}.async_probe", AsyncMock(return_value=_device("10.0.0.6", "000001234567"))):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_SSDP}, data=_ssdp("10.0.0.6")
+        )
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert entry.data["host"] == "10.0.0.6"
+
+
+async def test_ssdp_moves_legacy_entries_to_the_serial(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, unique_id="udn:uuid:player", data={"host": "10.0.0.5"})
+    entry.add_to_hass(hass)
+
+    with patch(f"{FLOW}.async_probe", AsyncMock(return_value=_device("10.0.0.6", "000001234567"))):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_SSDP}, data=_ssdp("10.0.0.6")
+        )
+    assert result["reason"] == "already_configured"
+    assert (entry.unique_id, entry.data["host"]) == ("000001234567", "10.0.0.6")
+
+
+async def test_ssdp_confirms_new_devices(hass: HomeAssistant) -> None:
+    with patch(f"{FLOW}.async_probe", AsyncMock(return_value=_device("10.0.0.6", "000001234567"))):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_SSDP}, data=_ssdp("10.0.0.6")
+        )
+    assert result["step_id"] == "discovery_confirm"
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == "000001234567"
+    assert result["data"]["host"] == "10.0.0.6"
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from common import mock_player
+from fake_client import FakeClient
+from homeassistant.core import HomeAssistant
+
+import custom_components.kaleidescape_strato.coordinator as coordinator_module
+from custom_components.kaleidescape_strato.const import CONF_UPDATE_BATCH_WINDOW
+from custom_components.kaleidescape_strato.coordinator import KaleidescapeSensorCoordinator
+
+
+def _coordinator(
+    hass: HomeAssistant, client: FakeClient, window: int = 20
+) -> tuple[KaleidescapeSensorCoordinator, list[dict]]:
+    """Return a coordinator and the snapshots its listeners were told about."""
+    _entry, player = mock_player(hass, client, {CONF_UPDATE_BATCH_WINDOW: window})
+    coordinator = player["sensor_coordinator"]
+    updates: list[dict] = []
+    coordinator.async_add_listener(lambda: updates.append(dict(coordinator.data)))
+    return coordinator, updates
+
+
+async def test_burst_of_events_is_one_update(hass: HomeAssistant) -> None:
+    coordinator, updates = _coordinator(hass, FakeClient())
+    coordinator.async_merge_state({"play_status": "playing"})
+    coordinator.async_merge_state({"play_speed": 1})
+    coordinator.async_merge_state({"media_title": "Heat"})
+    assert updates == []
+
+    await asyncio.sleep(0.05)
+    assert len(updates) == 1
+    assert (updates[0]["play_status"], updates[0]["play_speed"]) == ("playing", 1)
+    assert updates[0]["media_title"] == "Heat"
+    await coordinator.async_shutdown()
+
+
+async def test_zero_window_applies_each_event(hass: HomeAssistant) -> None:
+    coordinator, updates = _coordinator(hass, FakeClient(), window=0)
+    coordinator.async_merge_state({"play_status": "playing"})
+    coordinator.async_merge_state({"play_status": "paused"})
+    assert [update["play_status"] for update in updates] == ["playing", "paused"]
+    await coordinator.async_shutdown()
+
+
+async def test_unchanged_events_do_not_notify(hass: HomeAssistant) -> None:
+    coordinator, updates = _coordinator(hass, FakeClient(), window=0)
+    coordinator.async_merge_state({"play_status": "playing"})
+    coordinator.async_merge_state({"play_status": "playing"})
+    assert len(updates) == 1
+    await coordinator.async_shutdown()
+
+
+async def test_events_clear_a_poll_failure(hass: HomeAssistant) -> None:
+    coordinator, _updates = _coordinator(hass, FakeClient(), window=0)
+    coordinator.async_merge_state({"play_status": "playing"})
+    coordinator.async_set_update_error(TimeoutError())
+    assert not coordinator.last_update_success
+
+    coordinator.async_merge_state({"play_status": "playing"})
+    assert coordinator.last_update_success
+    await coordinator.async_shutdown()
+
+
+async def test_poll_takes_pending_events(hass: HomeAssistant) -> None:
+    coordinator, updates = _coordinator(hass, FakeClient())
+    coordinator.async_merge_state({"media_title": "Heat"})
+    coordinator.async_apply_polled_state({"play_status": "playing"})
+    assert len(updates) == 1
+    assert (updates[0]["media_title"], updates[0]["play_status"]) == ("Heat", "playing")
+
+    # The batch was applied with the poll, so its timer has nothing left to flush.
+    await asyncio.sleep(0.05)
+    assert len(updates) == 1
+    await coordinator.async_shutdown()
+
+
+@pytest.fixture
+def short_debounce(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(coordinator_module, "CONTENT_DETAILS_DEBOUNCE", 0.05)
+
+
+@pytest.mark.usefixtures("short_debounce")
+async def test_details_are_looked_up_once_scrolling_stops(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    client.details["26-0-0"] = ("Heat", "http://player/heat.jpg")
+    coordinator, _updates = _coordinator(hass, client, window=0)
+    for handle in ("24-0-0", "25-0-0", "26-0-0"):
+        coordinator.async_merge_state({"media_content_id": handle})
+        await asyncio.sleep(0.01)
+    assert client.details_requests == []
+
+    await asyncio.sleep(0.1)
+    assert client.details_requests == ["26-0-0"]
+    assert coordinator.data["media_title"] == "Heat"
+    assert coordinator.data["media_image_url"] == "http://player/heat.jpg"
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("short_debounce")
+async def test_moving_on_cancels_a_pending_lookup(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    client.details = {"24-0-0": ("Heat", "http://player/heat.jpg"), "25-0-0": ("Ran", None)}
+    client.details_gate = asyncio.Event()
+    coordinator, _updates = _coordinator(hass, client, window=0)
+    coordinator.async_merge_state({"media_content_id": "24-0-0"})
+    await asyncio.sleep(0.1)
+    assert client.details_requests == ["24-0-0"]
+
+    # The lookup for the first handle is still waiting on the player when the cursor moves.
+    coordinator.async_merge_state({"media_content_id": "25-0-0"})
+    client.details_gate.set()
+    await asyncio.sleep(0.1)
+    assert client.details_requests == ["24-0-0", "25-0-0"]
+    assert coordinator.data["media_title"] == "Ran"
+    assert not coordinator.data["media_image_url"]
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.usefixtures("short_debounce")
+async def test_details_do_not_outlive_their_handle(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    client.details["24-0-0"] = ("Heat", "http://player/heat.jpg")
+    coordinator, _updates = _coordinator(hass, client, window=0)
+    coordinator.async_merge_state({"media_content_id": "24-0-0"})
+    await asyncio.sleep(0.1)
+    assert coordinator.data["media_image_url"] == "http://player/heat.jpg"
+
+    # Highlight messages clear the image; it must not be put back for the new handle.
+    coordinator.async_merge_state({"media_content_id": "25-0-0", "media_image_url": None})
+    coordinator.async_apply_polled_state({"play_status": "playing"})
+    assert not coordinator.data["media_image_url"]
+    await coordinator.async_shutdown()
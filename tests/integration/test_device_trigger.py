@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import HomeAssistant
+
+from custom_components.kaleidescape_strato import device_trigger
+from custom_components.kaleidescape_strato.const import DOMAIN, EVENT_KALEIDESCAPE
+
+DEVICE_ID = "abcdef"
+
+
+async def test_every_trigger_type_is_offered(hass: HomeAssistant) -> None:
+    triggers = await device_trigger.async_get_triggers(hass, DEVICE_ID)
+    assert {trigger[CONF_TYPE] for trigger in triggers} == {
+        "movie_location",
+        "play_status",
+        "ui_state",
+        "screen_mask",
+        "playback_boundary",
+    }
+    assert all(trigger[CONF_DEVICE_ID] == DEVICE_ID for trigger in triggers)
+
+
+async def test_capabilities_list_target_values(hass: HomeAssistant) -> None:
+    capabilities = await device_trigger.async_get_trigger_capabilities(
+        hass, {CONF_TYPE: "movie_location"}
+    )
+    assert capabilities["extra_fields"]({"to": "credits"}) == {"to": "credits"}
+    assert await device_trigger.async_get_trigger_capabilities(hass, {CONF_TYPE: "ui_state"}) == {}
+
+
+async def test_trigger_matches_type_and_target(hass: HomeAssistant) -> None:
+    calls: list[dict] = []
+
+    async def _action(variables: dict, context: object = None) -> None:
+        calls.append(variables["trigger"])
+
+    config = device_trigger.TRIGGER_SCHEMA(
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: DEVICE_ID,
+            CONF_TYPE: "movie_location",
+            "to": "credits",
+        }
+    )
+    trigger_info = {
+        "domain": "automation",
+        "name": "test",
+        "home_assistant_start": False,
+        "variables": {},
+        "trigger_data": {"id": "0", "idx": "0", "alias": None},
+    }
+    detach = await device_trigger.async_attach_trigger(hass, config, _action, trigger_info)
+
+    for data in (
+        {"type": "movie_location", "media_location": "content"},
+        {"type": "play_status", "media_location": "credits"},
+        {"device_id": "other", "type": "movie_location", "media_location": "credits"},
+        {"type": "movie_location", "media_location": "credits"},
+    ):
+        hass.bus.async_fire(EVENT_KALEIDESCAPE, {"device_id": DEVICE_ID, **data})
+    await hass.async_block_till_done()
+    detach()
+
+    assert len(calls) == 1
+    assert calls[0]["event"].data["media_location"] == "credits"
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+
+from common import mock_player
+from fake_client import FakeClient
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.kaleidescape_strato.const import (
+    DOMAIN,
+    EVENT_DEBOUNCE_COOLDOWN,
+    EVENT_KALEIDESCAPE,
+)
+from custom_components.kaleidescape_strato.events import KaleidescapeEventDispatcher
+
+
+async def test_transitions_fire_at_once_and_settle_after_the_cooldown(
+    hass: HomeAssistant,
+) -> None:
+    client = FakeClient()
+    entry, player = mock_player(hass, client)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, entry.entry_id)}
+    )
+    events = async_capture_events(hass, EVENT_KALEIDESCAPE)
+    dispatcher = KaleidescapeEventDispatcher(hass, entry, player)
+    dispatcher.async_start()
+
+    client.emit("MOVIE_LOCATION", "03")
+    await hass.async_block_till_done()
+    assert [event.data for event in events] == [
+        {
+            "device_id": device.id,
+            "type": "movie_location",
+            "media_location": "content",
+            "previous_media_location": None,
+        }
+    ]
+
+    # Changes inside the cooldown collapse into one event with the settled value.
+    client.emit("MOVIE_LOCATION", "05")
+    client.emit("MOVIE_LOCATION", "04")
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    await asyncio.sleep(EVENT_DEBOUNCE_COOLDOWN + 0.05)
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    assert events[1].data["media_location"] == "intermission"
+    assert events[1].data["previous_media_location"] == "content"
+
+    # The player repeating the current value is no transition.
+    await asyncio.sleep(EVENT_DEBOUNCE_COOLDOWN + 0.05)
+    client.emit("MOVIE_LOCATION", "04")
+    await hass.async_block_till_done()
+    assert len(events) == 2
+
+    dispatcher.async_stop()
+    client.emit("MOVIE_LOCATION", "05")
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    await player["sensor_coordinator"].async_shutdown()
+
+
+async def test_events_update_the_coordinator(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    entry, player = mock_player(hass, client)
+    events = async_capture_events(hass, EVENT_KALEIDESCAPE)
+    dispatcher = KaleidescapeEventDispatcher(hass, entry, player)
+    dispatcher.async_start()
+
+    # Messages without a transition type are merged but fire nothing.
+    client.emit("VIDEO_MODE", "00", "00", "24")
+    client.emit("PLAY_STATUS", "2", "0", "01", "09000", "00120", "001", "00300", "00010")
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+
+    coordinator = player["sensor_coordinator"]
+    assert coordinator.data["play_status"] == "playing"
+    assert coordinator.data["title_location"] == 120
+    assert coordinator.data["video_mode"] is not None
+    assert [event.data["type"] for event in events] == ["play_status"]
+    assert events[0].data["previous_play_status"] is None
+    dispatcher.async_stop()
+    await coordinator.async_shutdown()
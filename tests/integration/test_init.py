@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fake_player import FakePlayer, default_reply
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+import custom_components.kaleidescape_strato as integration
+from custom_components.kaleidescape_strato.const import (
+    DATA_DEVICE_TYPE,
+    DATA_PLAYERS,
+    DOMAIN,
+)
+
+pytestmark = pytest.mark.usefixtures("socket_enabled", "ssdp_callbacks")
+
+
+def _reply(body: str) -> str:
+    if body.startswith("GET_NUM_ZONES"):
+        return "000:NUM_ZONES:01:00"
+    if body.startswith("GET_DEVICE_TYPE_NAME"):
+        return "000:DEVICE_TYPE_NAME:Strato S"
+    return default_reply(body)
+
+
+def _device_type(hass: HomeAssistant, entry: MockConfigEntry) -> str:
+    return hass.data[DOMAIN][entry.entry_id][DATA_PLAYERS][0][DATA_DEVICE_TYPE]
+
+
+async def test_setup_does_not_wait_for_a_slow_profile(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(integration, "PROFILE_DETECTION_TIMEOUT", 0.1)
+    async with FakePlayer(_reply, delays={"GET_NUM_ZONES": 0.5}) as player:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"name": "Theater", "host": "127.0.0.1", "port": player.port, "timeout": 5.0},
+        )
+        entry.add_to_hass(hass)
+
+        async with asyncio.timeout(0.4):
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        assert _device_type(hass, entry) == "Kaleidescape"
+
+        # The background refresh detects the profile at the full timeout and reloads.
+        await asyncio.sleep(0.8)
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+        assert _device_type(hass, entry) == "Strato S"
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
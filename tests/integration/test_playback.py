@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from common import mock_player
+from fake_client import FakeClient
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.kaleidescape_strato.const import (
+    CONF_UPDATE_BATCH_WINDOW,
+    EVENT_KALEIDESCAPE,
+)
+from custom_components.kaleidescape_strato.coordinator import KaleidescapeSensorCoordinator
+from custom_components.kaleidescape_strato.playback import (
+    KaleidescapePlaybackClock,
+    parse_playback_offsets,
+)
+
+PLAYING = {
+    "play_status": "playing",
+    "play_speed": 1,
+    "title_length": 600,
+    "title_location": 100,
+    "chapter_length": 200,
+    "chapter_location": 50,
+    "media_title": "Heat",
+}
+
+
+@pytest.fixture
+async def clock(
+    hass: HomeAssistant,
+) -> tuple[KaleidescapeSensorCoordinator, KaleidescapePlaybackClock]:
+    entry, player = mock_player(hass, FakeClient(), {CONF_UPDATE_BATCH_WINDOW: 0})
+    clock = KaleidescapePlaybackClock(hass, entry, player, [300, 60])
+    stop = clock.async_start()
+    yield player["sensor_coordinator"], clock
+    stop()
+    await player["sensor_coordinator"].async_shutdown()
+
+
+def test_parse_playback_offsets() -> None:
+    assert parse_playback_offsets("60, 300 60") == [300, 60]
+    assert parse_playback_offsets("") == []
+    for text in ("0", "-5", "1.5", "soon"):
+        with pytest.raises(ValueError):
+            parse_playback_offsets(text)
+
+
+async def test_clock_extrapolates_between_samples(
+    clock: tuple, freezer: FrozenDateTimeFactory
+) -> None:
+    coordinator, playback = clock
+    coordinator.async_merge_state(PLAYING)
+    assert playback.time_remaining() == 500
+    assert playback.estimated_end == dt_util.utcnow() + timedelta(seconds=500)
+
+    freezer.tick(timedelta(seconds=50))
+    assert playback.time_remaining() == 450
+    assert playback.chapter_progress == 50.0
+
+    # Pausing stops the clock.
+    coordinator.async_merge_state({"play_status": "paused", "title_location": 150})
+    freezer.tick(timedelta(seconds=50))
+    assert playback.time_remaining() == 450
+    assert playback.estimated_end is None
+
+    coordinator.async_merge_state({"title_length": 0})
+    assert playback.time_remaining() is None
+
+
+async def test_timers_fire_at_the_offsets(
+    hass: HomeAssistant, clock: tuple, freezer: FrozenDateTimeFactory
+) -> None:
+    coordinator, _playback = clock
+    events = async_capture_events(hass, EVENT_KALEIDESCAPE)
+    coordinator.async_merge_state(PLAYING)
+
+    freezer.tick(timedelta(seconds=201))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [(event.data["offset"], event.data["time_remaining"]) for event in events] == [
+        (300, 299)
+    ]
+    assert events[0].data["type"] == "playback_boundary"
+    assert events[0].data["media_title"] == "Heat"
+
+
+async def test_timers_follow_seeks_only(
+    hass: HomeAssistant, clock: tuple, freezer: FrozenDateTimeFactory
+) -> None:
+    coordinator, playback = clock
+    events = async_capture_events(hass, EVENT_KALEIDESCAPE)
+    coordinator.async_merge_state(PLAYING)
+    timers = list(playback._timers)
+
+    # A sample that matches the extrapolated position keeps the armed timers.
+    freezer.tick(timedelta(seconds=10))
+    coordinator.async_merge_state({"title_location": 111, "chapter_location": 61})
+    assert playback._timers == timers
+
+    # A seek past the first boundary re-arms only the ones still ahead.
+    coordinator.async_merge_state({"title_location": 400})
+    assert len(playback._timers) == 1
+    freezer.tick(timedelta(seconds=141))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [event.data["offset"] for event in events] == [60]
+
+
+async def test_stopping_cancels_the_timers(hass: HomeAssistant, clock: tuple) -> None:
+    coordinator, playback = clock
+    coordinator.async_merge_state(PLAYING)
+    assert len(playback._timers) == 2
+
+    coordinator.async_merge_state({"play_status": "paused"})
+    assert playback._timers == []
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import timedelta
+
+import pytest
+from common import mock_player
+from fake_client import FakeClient
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.ssdp import SsdpChange
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.kaleidescape_strato.presence import KaleidescapePresenceMonitor
+
+
+def _announcement(host: str, max_age: int = 60) -> SsdpServiceInfo:
+    return SsdpServiceInfo(
+        ssdp_usn="uuid:player::upnp:rootdevice",
+        ssdp_st="upnp:rootdevice",
+        ssdp_location=f"http://{host}:80/description.xml",
+        ssdp_headers={"cache-control": f"max-age={max_age}"},
+        upnp={},
+    )
+
+
+@pytest.fixture
+async def monitor(
+    hass: HomeAssistant, ssdp_callbacks: list[Callable[..., None]]
+) -> tuple[FakeClient, dict, Callable[..., None]]:
+    client = FakeClient()
+    entry, player = mock_player(hass, client)
+    stop = await KaleidescapePresenceMonitor(hass, entry, client, [player]).async_start()
+    (announce,) = ssdp_callbacks
+    yield client, player, announce
+    stop()
+    await player["sensor_coordinator"].async_shutdown()
+
+
+async def test_byebye_pauses_the_players(hass: HomeAssistant, monitor: tuple) -> None:
+    client, player, announce = monitor
+    announce(_announcement("127.0.0.1"), SsdpChange.BYEBYE)
+    await hass.async_block_till_done()
+
+    assert not client.present
+    assert not player["sensor_coordinator"].last_update_success
+
+
+async def test_unrenewed_announcement_expires(
+    hass: HomeAssistant, monitor: tuple, freezer: FrozenDateTimeFactory
+) -> None:
+    client, _player, announce = monitor
+    announce(_announcement("127.0.0.1", max_age=60), SsdpChange.ALIVE)
+
+    freezer.tick(timedelta(seconds=45))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert client.present
+
+    # A renewal restarts the clock.
+    announce(_announcement("127.0.0.1", max_age=60), SsdpChange.UPDATE)
+    freezer.tick(timedelta(seconds=45))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert client.present
+
+    freezer.tick(timedelta(seconds=20))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert not client.present
+
+
+async def test_alive_reconnects_an_absent_host(hass: HomeAssistant, monitor: tuple) -> None:
+    client, player, announce = monitor
+    announce(_announcement("127.0.0.1"), SsdpChange.BYEBYE)
+    await hass.async_block_till_done()
+    polls = client.polls
+
+    announce(_announcement("127.0.0.1"), SsdpChange.ALIVE)
+    await hass.async_block_till_done()
+    assert client.present and client.available
+    assert client.polls > polls
+    assert player["sensor_coordinator"].last_update_success
+
+
+async def test_announcements_match_the_connected_address(
+    hass: HomeAssistant, monitor: tuple
+) -> None:
+    client, _player, announce = monitor
+    announce(_announcement("192.0.2.7"), SsdpChange.BYEBYE)
+    await hass.async_block_till_done()
+    assert client.present
+
+    client.peer_address = "192.0.2.7"
+    announce(_announcement("192.0.2.7"), SsdpChange.BYEBYE)
+    await hass.async_block_till_done()
+    assert not client.present
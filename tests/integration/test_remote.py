@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import pytest
+from common import mock_player
+from fake_client import FakeClient
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from custom_components.kaleidescape_strato.const import (
+    CONF_ALLOW_RAW_COMMANDS,
+    DEFAULT_MACRO_WAIT_TIMEOUT,
+)
+from custom_components.kaleidescape_strato.kaleidescape_protocol import KaleidescapeResponse
+from custom_components.kaleidescape_strato.remote import (
+    KaleidescapeRemoteEntity,
+    _parse_wait_step,
+)
+
+
+@pytest.mark.parametrize(
+    ("command", "key", "expected", "negate", "timeout"),
+    [
+        ("wait play_status == playing", "play_status", "playing", False, None),
+        ("WAIT ui_screen != Movie_List within 2.5s", "ui_screen", "movie_list", True, 2.5),
+        (
+            " wait media_location==main_content within 3 ",
+            "media_location",
+            "main_content",
+            False,
+            3,
+        ),
+    ],
+)
+def test_wait_step_parsing(
+    command: str, key: str, expected: str, negate: bool, timeout: float | None
+) -> None:
+    step = _parse_wait_step(command)
+    assert step is not None
+    assert (step.key, step.expected, step.negate) == (key, expected, negate)
+    assert step.timeout == (timeout or DEFAULT_MACRO_WAIT_TIMEOUT)
+
+
+@pytest.mark.parametrize("command", ["PLAY", "wait", "wait for it", "wait play_status playing"])
+def test_other_commands_are_not_wait_steps(command: str) -> None:
+    assert _parse_wait_step(command) is None
+
+
+def test_wait_step_rejects_unknown_state() -> None:
+    with pytest.raises(HomeAssistantError, match="bogus"):
+        _parse_wait_step("wait bogus == 1")
+
+
+def test_wait_step_matches_case_insensitively() -> None:
+    step = _parse_wait_step("wait play_status == Playing")
+    assert step is not None
+    assert step.matches({"play_status": "PLAYING"})
+    assert not step.matches({"play_status": "paused"})
+    negated = _parse_wait_step("wait media_title != none")
+    assert negated is not None
+    assert not negated.matches({"media_title": None})
+    assert negated.matches({"media_title": "Alien"})
+
+
+def _remote(
+    hass: HomeAssistant, client: FakeClient, *, allow_raw_commands: bool = False
+) -> KaleidescapeRemoteEntity:
+    entry, player = mock_player(hass, client, {CONF_ALLOW_RAW_COMMANDS: allow_raw_commands})
+    return KaleidescapeRemoteEntity(entry, player)
+
+
+async def test_macro_waits_for_state_between_keys(hass: HomeAssistant) -> None:
+    client = FakeClient(
+        state={"play_status": "paused"}, effects={"PLAY": {"play_status": "playing"}}
+    )
+    remote = _remote(hass, client)
+
+    await remote.async_send_command(
+        ["play", "wait play_status == playing within 2", "up"], delay_secs=5
+    )
+
+    # The wait step paces the macro, so the fixed delay between keys is dropped.
+    assert client.sent == ["PLAY", "UP"]
+    assert client.queries
+
+
+async def test_macro_fails_when_state_is_not_reached(hass: HomeAssistant) -> None:
+    client = FakeClient(state={"play_status": "paused"})
+    remote = _remote(hass, client)
+
+    with pytest.raises(HomeAssistantError, match="play_status == playing within 0.3s"):
+        await remote.async_send_command(["wait play_status == playing within 0.3", "up"])
+    assert client.sent == []
+
+
+async def test_query_returns_every_response_of_one_exchange(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    client.responses["GET_PLAY_STATUS"] = KaleidescapeResponse(
+        status=0, name="PLAY_STATUS", fields=["2", "0"], device_id="01", sequence="1"
+    )
+    remote = _remote(hass, client)
+
+    result = await remote.async_query([" GET_PLAY_STATUS ", "GET_BOGUS"])
+
+    assert client.requests == [["GET_PLAY_STATUS", "GET_BOGUS"]]
+    assert result == {
+        "responses": {
+            "GET_PLAY_STATUS": {
+                "status": 0,
+                "name": "PLAY_STATUS",
+                "fields": ["2", "0"],
+                "device_id": "01",
+                "sequence": "1",
+            },
+            "GET_BOGUS": None,
+        }
+    }
+
+
+@pytest.mark.parametrize("command", ["PLAY", "LEAVE_STANDBY", "01/1/ENTER_STANDBY"])
+async def test_query_rejects_commands(hass: HomeAssistant, command: str) -> None:
+    client = FakeClient()
+    remote = _remote(hass, client, allow_raw_commands=True)
+
+    with pytest.raises(ServiceValidationError, match="Only GET_"):
+        await remote.async_query(["GET_PLAY_STATUS", command])
+    assert client.requests == []
+
+
+async def test_query_addressed_requests_need_raw_commands(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    with pytest.raises(ServiceValidationError, match="Allow sending raw commands"):
+        await _remote(hass, client).async_query(["#OTHER/1/GET_PLAY_STATUS"])
+    assert client.requests == []
+
+    await _remote(hass, client, allow_raw_commands=True).async_query(["#OTHER/1/GET_PLAY_STATUS"])
+    assert client.requests == [["#OTHER/1/GET_PLAY_STATUS"]]
+
+
+async def test_query_reports_connection_errors(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    client.error = TimeoutError()
+    with pytest.raises(HomeAssistantError, match="Unable to query"):
+        await _remote(hass, client).async_query(["GET_PLAY_STATUS"])
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from common import mock_player
+from fake_client import FakeClient
+from homeassistant.core import HomeAssistant
+
+from custom_components.kaleidescape_strato.const import (
+    CONF_EVENT_ONLY_COMMANDS,
+    CONF_FAST_REFRESH_COMMANDS,
+    FAST_REFRESH_INTERVAL,
+    SENSOR_SCAN_INTERVAL,
+    SLOW_REFRESH_INTERVAL,
+)
+from custom_components.kaleidescape_strato.coordinator import KaleidescapeSensorCoordinator
+from custom_components.kaleidescape_strato.scheduler import KaleidescapePollScheduler, _PollJob
+
+
+def _coordinator(hass: HomeAssistant, client: FakeClient) -> KaleidescapeSensorCoordinator:
+    return mock_player(hass, client)[1]["sensor_coordinator"]
+
+
+def _run_slot(scheduler: KaleidescapePollScheduler, job: _PollJob) -> None:
+    """Run the job's slot now instead of at its booked time."""
+    assert job.timer is not None
+    job.timer.cancel()
+    scheduler._poll(job, job.timer.when())
+
+
+def _phases(scheduler: KaleidescapePollScheduler, interval: float) -> list[float]:
+    return sorted(round(job.timer.when() % interval, 3) for job in scheduler._jobs[interval])
+
+
+async def test_jobs_of_an_interval_get_evenly_spaced_slots(hass: HomeAssistant) -> None:
+    scheduler = KaleidescapePollScheduler(hass, jitter=0)
+    interval = SENSOR_SCAN_INTERVAL
+    removers = [scheduler.async_add(_coordinator(hass, FakeClient())) for _ in range(4)]
+    assert _phases(scheduler, interval) == pytest.approx(
+        [0, interval / 4, interval / 2, interval * 3 / 4], abs=1e-3
+    )
+
+    # Slots are re-assigned when a player goes away.
+    removers.pop()()
+    assert _phases(scheduler, interval) == pytest.approx(
+        [0, interval / 3, interval * 2 / 3], abs=1e-3
+    )
+
+    for remove in removers:
+        remove()
+    assert not scheduler._jobs
+
+
+async def test_jitter_stays_inside_the_slot(hass: HomeAssistant) -> None:
+    scheduler = KaleidescapePollScheduler(hass, jitter=10)
+    interval = SENSOR_SCAN_INTERVAL
+    removers = [scheduler.async_add(_coordinator(hass, FakeClient())) for _ in range(2)]
+    now = hass.loop.time()
+    cycle_start = now - now % interval
+    for index, job in enumerate(scheduler._jobs[interval]):
+        due = cycle_start + index * interval / 2
+        if due <= now:
+            due += interval
+        assert abs(job.timer.when() - due) <= interval / 2 / 4
+    for remove in removers:
+        remove()
+
+
+async def test_slot_is_skipped_while_the_previous_poll_runs(hass: HomeAssistant) -> None:
+    client = FakeClient(state={"play_status": "playing"})
+    client.gate = asyncio.Event()
+    coordinator = _coordinator(hass, client)
+    scheduler = KaleidescapePollScheduler(hass, jitter=0)
+    remove = scheduler.async_add(coordinator)
+    job = scheduler._jobs[SENSOR_SCAN_INTERVAL][0]
+
+    _run_slot(scheduler, job)
+    await asyncio.sleep(0)
+    _run_slot(scheduler, job)
+    await asyncio.sleep(0)
+    assert len(client.queries) == 1
+
+    client.gate.set()
+    await job.task
+    assert coordinator.data["play_status"] == "playing"
+    _run_slot(scheduler, job)
+    await job.task
+    assert len(client.queries) == 2
+
+    remove()
+    await coordinator.async_shutdown()
+
+
+async def test_paused_players_are_not_polled(hass: HomeAssistant) -> None:
+    client = FakeClient()
+    client.present = False
+    coordinator = _coordinator(hass, client)
+    scheduler = KaleidescapePollScheduler(hass, jitter=0)
+    remove = scheduler.async_add(coordinator)
+    job = scheduler._jobs[SENSOR_SCAN_INTERVAL][0]
+
+    _run_slot(scheduler, job)
+    assert job.task is None
+    assert client.queries == []
+    # The next slot is still booked, so polling resumes once the player is back.
+    assert job.timer is not None
+
+    remove()
+
+
+async def test_entries_on_one_player_share_each_poll(hass: HomeAssistant) -> None:
+    client = FakeClient(state={"play_status": "playing"})
+    first, second = _coordinator(hass, client), _coordinator(hass, client)
+    other = _coordinator(hass, FakeClient())
+    scheduler = KaleidescapePollScheduler(hass, jitter=0)
+    removers = [scheduler.async_add(coordinator) for coordinator in (first, second, other)]
+
+    jobs = scheduler._jobs[SENSOR_SCAN_INTERVAL]
+    assert len(jobs) == 2
+    shared = next(job for job in jobs if first in job.coordinators)
+    assert shared.coordinators == [first, second]
+
+    _run_slot(scheduler, shared)
+    await shared.task
+    assert len(client.queries) == 1
+    assert first.data["play_status"] == second.data["play_status"] == "playing"
+
+    client.error = TimeoutError()
+    _run_slot(scheduler, shared)
+    await shared.task
+    assert not first.last_update_success
+    assert not second.last_update_success
+
+    # The job outlives the entry that created it while another still follows it.
+    removers[0]()
+    assert shared in scheduler._jobs[SENSOR_SCAN_INTERVAL]
+    assert shared.coordinators == [second]
+
+    for remove in removers[1:]:
+        remove()
+    for coordinator in (first, second, other):
+        await coordinator.async_shutdown()
+
+
+async def test_each_refresh_tier_is_its_own_job(hass: HomeAssistant) -> None:
+    scheduler = KaleidescapePollScheduler(hass, jitter=0)
+    default = _coordinator(hass, FakeClient())
+    remove = scheduler.async_add(default)
+    # Nothing is polled every second unless asked for.
+    assert set(scheduler._jobs) == {SENSOR_SCAN_INTERVAL, SLOW_REFRESH_INTERVAL}
+    assert "GET_PLAY_STATUS" in scheduler._jobs[SENSOR_SCAN_INTERVAL][0].commands
+    assert "GET_DEVICE_INFO" in scheduler._jobs[SLOW_REFRESH_INTERVAL][0].commands
+    remove()
+
+    client = FakeClient()
+    options = {
+        CONF_FAST_REFRESH_COMMANDS: ["GET_PLAY_STATUS"],
+        CONF_EVENT_ONLY_COMMANDS: ["GET_UI_STATE"],
+    }
+    tiered = mock_player(hass, client, options)[1]["sensor_coordinator"]
+    remove = scheduler.async_add(tiered)
+    (fast,) = scheduler._jobs[FAST_REFRESH_INTERVAL]
+    assert fast.commands == ["GET_PLAY_STATUS"]
+    polled = [
+        command for jobs in scheduler._jobs.values() for job in jobs for command in job.commands
+    ]
+    assert "GET_UI_STATE" not in polled
+    assert polled.count("GET_PLAY_STATUS") == 1
+
+    _run_slot(scheduler, fast)
+    await fast.task
+    assert client.queries == [["GET_PLAY_STATUS"]]
+
+    remove()
+    for coordinator in (default, tiered):
+        await coordinator.async_shutdown()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+from pathlib import Path
+
+import pytest
+
+from kaleidescape_protocol.capture import (
+    CaptureFrame,
+    ReplayDecoder,
+    async_replay,
+    read_capture,
+    write_capture,
+)
+from kaleidescape_protocol.client import ProtocolCapture
+
+FRAMES = [
+    (">", "01/1/GET_PLAY_STATUS:"),
+    ("<", "01/1/000:PLAY_STATUS:2:0:01:09000:00120:001:00300:00010:/"),
+    ("<", "01/!/000:PLAYING_TITLE_NAME:Dune:/"),
+    ("<", "01/!/000:PLAYING_TITLE_NAME:Dune:/"),
+    ("<", "01/!/000:USER_INPUT:01:/"),
+]
+
+
+def _capture(max_frames: int = 100) -> ProtocolCapture:
+    capture = ProtocolCapture(max_frames)
+    for direction, frame in FRAMES:
+        capture.record(direction, frame)
+    return capture
+
+
+def test_capture_stops_at_max_frames() -> None:
+    capture = _capture(max_frames=3)
+    assert [frame for _, _, frame in capture.frames] == [frame for _, frame in FRAMES[:3]]
+    assert capture.truncated
+    assert not _capture().truncated
+
+
+def test_capture_file_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "session.cap.gz"
+    capture = _capture()
+    assert write_capture(path, capture, "player.local:10000") == len(FRAMES)
+
+    frames = read_capture(path)
+    assert [(frame.direction, frame.frame) for frame in frames] == FRAMES
+    assert [frame.offset for frame in frames] == [
+        pytest.approx(offset, abs=0.001) for offset, _, _ in capture.frames
+    ]
+
+
+def test_read_capture_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "other.gz"
+    with gzip.open(path, "wt") as other:
+        other.write("not a capture\n")
+    with pytest.raises(ValueError):
+        read_capture(path)
+
+
+def test_replay_decodes_received_frames_into_state_changes() -> None:
+    changes: list[tuple[str, tuple[str, ...]]] = []
+    decoder = ReplayDecoder(
+        on_change=lambda frame, device_id, state: changes.append((device_id, state.changed_keys))
+    )
+    frames = [CaptureFrame(0.0, direction, frame) for direction, frame in FRAMES]
+
+    assert asyncio.run(async_replay(frames, decoder.handle_frame)) == 4
+    assert (decoder.frames, decoder.decoded, decoder.changes) == (4, 3, 2)
+    assert changes[1] == ("01", ("media_title",))
+    assert decoder.states["01"].media_title == "Dune"
+    assert decoder.states["01"].title_location == 120
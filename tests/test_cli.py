@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+from fake_player import FakePlayer
+
+from kaleidescape_protocol import cli
+
+# Home Assistant's test harness blocks sockets unless a test asks for them.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+def _run_against_player(*argv: str) -> tuple[int, list[str]]:
+    async def _run() -> tuple[int, list[str]]:
+        async with FakePlayer() as player:
+            args = cli._build_parser().parse_args(["127.0.0.1", "--port", str(player.port), *argv])
+            return await cli._async_main(args), player.received
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["bench", "-n", "0"],
+        ["bench", "--iterations", "-3"],
+        ["--timeout", "0", "query", "GET_PLAY_STATUS"],
+        ["--timeout", "nan", "query", "GET_PLAY_STATUS"],
+        ["watch", "--interval", "-1"],
+        ["query"],
+    ],
+)
+def test_invalid_arguments_are_rejected(argv: list[str]) -> None:
+    with pytest.raises(SystemExit) as exit_info:
+        cli._build_parser().parse_args(["player.local", *argv])
+    assert exit_info.value.code == 2
+
+
+def test_query_prints_each_response(capsys: pytest.CaptureFixture[str]) -> None:
+    code, received = _run_against_player("query", "GET_PLAY_STATUS", "GET_VIDEO_MODE")
+    assert code == 0
+    assert [frame.split("/", 2)[2] for frame in received] == ["GET_PLAY_STATUS:", "GET_VIDEO_MODE:"]
+    assert capsys.readouterr().out.splitlines() == [
+        "GET_PLAY_STATUS: status=0 PLAY_STATUS ",
+        "GET_VIDEO_MODE: status=0 VIDEO_MODE ",
+    ]
+
+
+def test_send_resolves_remote_aliases() -> None:
+    code, received = _run_against_player("--device", "#1234", "send", "up", "select")
+    assert code == 0
+    assert received == ["#1234/1/UP:", "#1234/2/SELECT:"]
+
+
+def test_bench_reports_every_measurement(capsys: pytest.CaptureFixture[str]) -> None:
+    code, _ = _run_against_player("bench", "-n", "2")
+    assert code == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].endswith("(n=2)")
+    assert [line.split()[0] for line in lines[1:]] == ["connect", "rtt", "poll"]
+
+
+def test_connection_errors_exit_with_status_1(capsys: pytest.CaptureFixture[str]) -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    assert cli.main(["127.0.0.1", "--port", str(port), "query", "GET_PLAY_STATUS"]) == 1
+    assert capsys.readouterr().err.startswith("error: ")
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+
+import pytest
+from fake_player import FakePlayer, default_reply
+
+from kaleidescape_protocol import client as client_module
+from kaleidescape_protocol.client import (
+    RTT_TIMEOUT_FLOOR,
+    KaleidescapeClient,
+    KaleidescapeConnection,
+    KaleidescapeUnavailableError,
+    _RttEstimator,
+    _TokenBucket,
+)
+
+PLAY_STATUS_REPLY = "000:PLAY_STATUS:2:0:01:09000:00120:001:00300:00010"
+NEVER = 3600.0
+
+# Home Assistant's test harness blocks sockets unless a test asks for them.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+def _reply(body: str) -> str:
+    if body.startswith("GET_PLAY_STATUS"):
+        return PLAY_STATUS_REPLY
+    if body.startswith("GET_CONTENT_DETAILS:"):
+        handle = body.split(":")[1]
+        return f"000:CONTENT_DETAILS_OVERVIEW:4:{handle} title:{handle}.jpg:movie:"
+    return default_reply(body)
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_breaker_opens_after_repeated_failures_and_backs_off(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(client_module, "BREAKER_INITIAL_BACKOFF", 0.05)
+
+    async def _run() -> list[bool]:
+        connection = KaleidescapeConnection("127.0.0.1", _closed_port(), 1.0)
+        changes: list[bool] = []
+        connection.add_availability_listener(changes.append)
+
+        for _ in range(client_module.BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(OSError):
+                await connection.async_connect()
+        assert not connection.available
+        with pytest.raises(KaleidescapeUnavailableError):
+            await connection.async_exchange([("01", "GET_PLAY_STATUS:")])
+
+        # Once the backoff has passed a single probe goes out, and failing doubles it.
+        await asyncio.sleep(0.07)
+        with pytest.raises(OSError) as probe_error:
+            await connection.async_connect()
+        assert not isinstance(probe_error.value, KaleidescapeUnavailableError)
+        with pytest.raises(KaleidescapeUnavailableError):
+            await connection.async_connect()
+
+        connection.mark_reachable()
+        assert connection.available
+        await connection.async_close()
+        return changes
+
+    assert asyncio.run(_run()) == [False, True]
+
+
+def test_successful_probe_closes_the_breaker(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(client_module, "BREAKER_INITIAL_BACKOFF", 0.01)
+
+    async def _run() -> list[bool]:
+        async with FakePlayer() as player:
+            connection = KaleidescapeConnection("127.0.0.1", player.port, 1.0)
+            changes: list[bool] = []
+            connection.add_availability_listener(changes.append)
+            for _ in range(client_module.BREAKER_FAILURE_THRESHOLD):
+                connection._record_failure()
+            await asyncio.sleep(0.02)
+
+            await connection.async_exchange([("01", "GET_PLAY_STATUS:")])
+            assert connection.available
+            await connection.async_close()
+            return changes
+
+    assert asyncio.run(_run()) == [False, True]
+
+
+def test_rtt_estimator_smooths_samples_and_backs_off() -> None:
+    rtt = _RttEstimator()
+    assert rtt.timeout(5.0) == 5.0
+
+    rtt.sample(0.1)
+    assert rtt.srtt == pytest.approx(0.1)
+    assert rtt.rttvar == pytest.approx(0.05)
+    assert rtt.timeout(5.0) == RTT_TIMEOUT_FLOOR
+
+    rtt.sample(2.0)
+    assert rtt.srtt == pytest.approx(0.1 * 0.875 + 2.0 * 0.125)
+    assert rtt.rttvar == pytest.approx(0.05 * 0.75 + 1.9 * 0.25)
+    base = rtt.timeout(60.0)
+    assert base == pytest.approx(rtt.srtt + 4 * rtt.rttvar)
+
+    rtt.timed_out()
+    assert rtt.timeout(60.0) == pytest.approx(base * 2)
+    for _ in range(10):
+        rtt.timed_out()
+    assert rtt.timeout(60.0) == 60.0
+
+    rtt.sample(rtt.srtt)
+    assert rtt.timeout(60.0) < base
+
+
+def test_late_reply_fails_only_its_request() -> None:
+    async def _run() -> None:
+        async with FakePlayer(_reply, delays={"GET_VIDEO_MODE": 0.5}) as player:
+            connection = KaleidescapeConnection("127.0.0.1", player.port, 0.2)
+            client = KaleidescapeClient("127.0.0.1", player.port, 0.2, connection=connection)
+            await client.async_send_request("GET_PLAY_STATUS")
+
+            with pytest.raises(TimeoutError):
+                await client.async_send_request("GET_VIDEO_MODE")
+            assert connection.connected
+            assert connection.available
+
+            # The connection keeps serving, and the late reply frees its sequence number.
+            response = await client.async_send_request("GET_PLAY_STATUS")
+            assert response is not None and response.name == "PLAY_STATUS"
+            await asyncio.sleep(0.5)
+            assert connection._sequences.qsize() == len(client_module.SEQUENCE_NUMBERS)
+            await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_timeout_abandons_every_unanswered_request_in_the_batch() -> None:
+    async def _run() -> None:
+        delays = {"GET_VIDEO_MODE": NEVER, "GET_SCREEN_MASK": NEVER}
+        async with FakePlayer(_reply, delays=delays) as player:
+            connection = KaleidescapeConnection("127.0.0.1", player.port, 0.2)
+            client = KaleidescapeClient("127.0.0.1", player.port, 0.2, connection=connection)
+            with pytest.raises(TimeoutError):
+                await client.async_send_requests(
+                    ["GET_PLAY_STATUS", "GET_VIDEO_MODE", "GET_SCREEN_MASK"]
+                )
+
+            # A new identical request is sent again instead of joining the dead one.
+            retry = asyncio.create_task(client.async_send_request("GET_SCREEN_MASK"))
+            await asyncio.sleep(0.05)
+            assert len(player.bodies("GET_SCREEN_MASK")) == 2
+            with pytest.raises(TimeoutError):
+                await retry
+
+            await asyncio.sleep(0.3)
+            assert connection._sequences.qsize() == len(client_module.SEQUENCE_NUMBERS)
+            assert not connection._reclaim_timers
+            await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_exhausted_sequence_numbers_fail_instead_of_hanging() -> None:
+    async def _run() -> float:
+        commands = [f"GET_SLOT_{number}" for number in client_module.SEQUENCE_NUMBERS]
+        async with FakePlayer(delays=dict.fromkeys(commands, NEVER)) as player:
+            client = KaleidescapeClient("127.0.0.1", player.port, 0.3)
+            stuck = [asyncio.create_task(client.async_send_request(name)) for name in commands]
+            await asyncio.sleep(0.05)
+
+            started = time.monotonic()
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(client.async_send_request("GET_PLAY_STATUS"), 5.0)
+            elapsed = time.monotonic() - started
+            await asyncio.gather(*stuck, return_exceptions=True)
+            await client.async_close()
+        return elapsed
+
+    assert asyncio.run(_run()) < 1.0
+
+
+def test_pipelined_responses_match_their_requests() -> None:
+    async def _run() -> None:
+        async with FakePlayer(_reply, delays={"GET_PLAY_STATUS": 0.1}) as player:
+            client = KaleidescapeClient("127.0.0.1", player.port, 2.0)
+            responses = await client.async_send_requests(
+                ["GET_PLAY_STATUS", "GET_VIDEO_MODE", "GET_DEVICE_POWER_STATE"]
+            )
+            await client.async_close()
+
+        assert [response.name for response in responses.values()] == [
+            "PLAY_STATUS",
+            "VIDEO_MODE",
+            "DEVICE_POWER_STATE",
+        ]
+        assert len({frame.split("/")[1] for frame in player.received}) == 3
+
+    asyncio.run(_run())
+
+
+def test_players_in_a_system_are_addressed_by_device_id() -> None:
+    async def _run() -> None:
+        async with FakePlayer(_reply) as player:
+            local = KaleidescapeClient("127.0.0.1", player.port, 2.0)
+            remote = local.for_device("#1234")
+            local_events: list[str] = []
+            remote_events: list[str] = []
+            local.add_event_listener(lambda event: local_events.append(event.name))
+            remote.add_event_listener(lambda event: remote_events.append(event.name))
+
+            await remote.async_send_request("GET_PLAY_STATUS")
+            await remote.async_send_request("GET_PLAY_STATUS")
+            local.connection.inject_message("#1234/!/000:PLAY_STATUS:0:0:00:0:0:0:0:0:/")
+            local.connection.inject_message("01/!/000:UI_STATE:01:00:00:0:/")
+            await local.async_close()
+
+        # Only other players are asked for events, once per connection.
+        assert [frame.split("/", 2)[::2] for frame in player.received] == [
+            ["#1234", "ENABLE_EVENTS:"],
+            ["#1234", "GET_PLAY_STATUS:"],
+            ["#1234", "GET_PLAY_STATUS:"],
+        ]
+        assert remote_events == ["PLAY_STATUS"]
+        assert local_events == ["UI_STATE"]
+
+    asyncio.run(_run())
+
+
+def test_pool_shares_connection_until_last_release() -> None:
+    async def _run() -> None:
+        first = KaleidescapeClient.acquire("Player.local", 10000, 5.0)
+        second = KaleidescapeClient.acquire(" player.LOCAL ", 10000, 10.0)
+        other = KaleidescapeClient.acquire("player.local", 10001, 5.0)
+        assert first.connection is second.connection
+        assert other.connection is not first.connection
+
+        await first.async_release()
+        assert client_module._CONNECTION_POOL[("player.local", 10000)] is second.connection
+        await second.async_release()
+        assert ("player.local", 10000) not in client_module._CONNECTION_POOL
+        await other.async_release()
+        assert not client_module._CONNECTION_POOL
+
+    asyncio.run(_run())
+
+
+def test_released_connection_closes_and_stays_closed(monkeypatch: pytest.MonkeyPatch) -> None:
+    open_connection = asyncio.open_connection
+
+    async def _slow_open_connection(*args: object, **kwargs: object) -> object:
+        await asyncio.sleep(0.1)
+        return await open_connection(*args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "open_connection", _slow_open_connection)
+
+    async def _run() -> None:
+        async with FakePlayer(_reply) as player:
+            client = KaleidescapeClient.acquire("127.0.0.1", player.port, 2.0)
+            request = asyncio.create_task(client.async_send_request("GET_PLAY_STATUS"))
+            await asyncio.sleep(0.02)
+            await client.async_release()
+            with pytest.raises(ConnectionResetError):
+                await request
+            assert not client.connection.connected
+
+            # Work still holding the released client fails instead of reconnecting.
+            with pytest.raises(ConnectionResetError):
+                await client.async_send_request("GET_PLAY_STATUS")
+            assert len(player.bodies("GET_PLAY_STATUS")) == 1
+
+    asyncio.run(_run())
+
+
+def test_identical_requests_in_flight_share_one_frame() -> None:
+    async def _run() -> None:
+        async with FakePlayer(_reply, delays={"GET_PLAY_STATUS": 0.05}) as player:
+            client = KaleidescapeClient("127.0.0.1", player.port, 2.0)
+            first, second = await asyncio.gather(
+                client.async_query_state(["GET_PLAY_STATUS"]),
+                client.async_query_state(["GET_PLAY_STATUS"]),
+            )
+            assert first == second
+            assert first["play_status"] == "playing"
+            assert len(player.bodies("GET_PLAY_STATUS")) == 1
+
+            # Commands are never merged, even when identical.
+            await asyncio.gather(
+                client.async_send_command("PLAY"), client.async_send_command("PLAY")
+            )
+            assert len(player.bodies("PLAY")) == 2
+            await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_token_bucket_spends_burst_then_paces_in_order() -> None:
+    async def _run() -> tuple[float, list[int]]:
+        bucket = _TokenBucket(rate=20.0, burst=2)
+        order: list[int] = []
+
+        async def _acquire(index: int) -> None:
+            await bucket.async_acquire()
+            order.append(index)
+
+        started = time.monotonic()
+        await asyncio.gather(*(_acquire(index) for index in range(4)))
+        assert bucket.waiting == 0
+        return time.monotonic() - started, order
+
+    elapsed, order = asyncio.run(_run())
+    assert order == [0, 1, 2, 3]
+    # Two tokens are free; the other two arrive at 20 per second.
+    assert 0.08 <= elapsed < 1.0
+
+
+def test_shared_settings_follow_the_current_users() -> None:
+    async def _run() -> None:
+        strict = KaleidescapeClient.acquire(
+            "player.local", 10000, 5.0, rate_limit=2.0, rate_burst=1
+        )
+        loose = KaleidescapeClient.acquire(
+            "player.local", 10000, 10.0, True, rate_limit=10.0, rate_burst=4
+        )
+        connection = strict.connection
+        assert connection.timeout == 10.0
+        assert connection._debug_commands
+        assert (connection._rate_limiter.rate, connection._rate_limiter.burst) == (2.0, 1)
+
+        # Settings return to the remaining user's once the other one leaves.
+        await strict.async_release()
+        assert (connection._rate_limiter.rate, connection._rate_limiter.burst) == (10.0, 4)
+        await loose.async_release()
+
+        unlimited = KaleidescapeClient.acquire("player.local", 10000, 5.0, rate_limit=2.0)
+        quick = KaleidescapeClient.acquire("player.local", 10000, 2.0)
+        await unlimited.async_release()
+        assert quick.connection.timeout == 2.0
+        assert quick.connection._rate_limiter is None
+        assert not quick.connection._debug_commands
+        await quick.async_release()
+
+    asyncio.run(_run())
+
+
+def test_capture_records_both_directions() -> None:
+    async def _run() -> list[str]:
+        async with FakePlayer(_reply) as player:
+            client = KaleidescapeClient("127.0.0.1", player.port, 2.0)
+            capture = client.connection.start_capture()
+            await client.async_send_request("GET_PLAY_STATUS")
+            assert client.connection.stop_capture() is capture
+            await client.async_send_request("GET_PLAY_STATUS")
+            await client.async_close()
+        return [direction for _, direction, _ in capture.frames]
+
+    assert asyncio.run(_run()) == [">", "<"]
+
+
+def test_fetch_content_details_skips_empty_handles() -> None:
+    async def _run() -> dict:
+        async with FakePlayer(_reply) as player:
+            client = KaleidescapeClient("127.0.0.1", player.port, 2.0)
+            details = {
+                handle: result
+                async for handle, result in client.async_fetch_content_details(
+                    ["26-0.0-S_a", "", "26-0.0-S_b", "26-0.0-S_c"], window=2
+                )
+            }
+            await client.async_close()
+        assert len(player.bodies("GET_CONTENT_DETAILS")) == 3
+        assert "GET_CONTENT_DETAILS::" not in player.bodies("GET_CONTENT_DETAILS")
+        return details
+
+    assert asyncio.run(_run()) == {
+        "26-0.0-S_a": ("26-0.0-S_a title", "26-0.0-S_a.jpg"),
+        "26-0.0-S_b": ("26-0.0-S_b title", "26-0.0-S_b.jpg"),
+        "26-0.0-S_c": ("26-0.0-S_c title", "26-0.0-S_c.jpg"),
+    }
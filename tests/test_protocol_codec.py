@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import pytest
+
+from kaleidescape_protocol.codec import (
+    EMPTY_PLAYBACK_STATE,
+    PlaybackState,
+    decode_state_response,
+    state_commands_for_keys,
+)
+from kaleidescape_protocol.framing import parse_response_message
+
+PLAYING = EMPTY_PLAYBACK_STATE.updated(
+    {
+        "play_status": "playing",
+        "play_speed": 1,
+        "title_length": 9000,
+        "title_location": 120,
+        "media_title": "Dune",
+        "media_content_id": "26-0.0-S_c446c8e2",
+        "media_image_url": "http://192.0.2.10/cover.jpg",
+        "video_mode": "1080p60_16:9",
+    },
+    complete=True,
+)
+
+
+def _decode(*messages: str) -> dict:
+    values: dict = {}
+    for message in messages:
+        values.update(decode_state_response(parse_response_message(message)))
+    return values
+
+
+def test_partial_poll_clears_title_selection_and_cover_on_stop() -> None:
+    stopped = PLAYING.updated(
+        _decode(
+            "01/1/000:PLAY_STATUS:0:0:00:00000:00000:000:00000:00000:/",
+            "01/1/000:PLAYING_TITLE_NAME::/",
+            "01/1/000:HIGHLIGHTED_SELECTION::/",
+        )
+    )
+
+    assert stopped.play_status == "none"
+    assert stopped.title_length == 0
+    assert stopped.media_title == ""
+    assert stopped.media_content_id == ""
+    assert stopped.media_image_url == ""
+    # Groups the poll did not cover are kept.
+    assert stopped.video_mode == "1080p60_16:9"
+    assert set(stopped.changed_keys) == {
+        "play_status",
+        "play_speed",
+        "title_length",
+        "title_location",
+        "media_title",
+        "media_content_id",
+        "media_image_url",
+    }
+
+
+def test_decoders_emit_every_key_they_own() -> None:
+    assert _decode("01/1/000:PLAYING_TITLE_NAME::/") == {"media_title": None}
+    assert _decode("01/1/000:HIGHLIGHTED_SELECTION::/") == {
+        "media_content_id": None,
+        "media_image_url": None,
+    }
+    assert _decode("01/1/000:DEVICE_INFO::::192.0.2.10:/") == {
+        "serial": None,
+        "cpdid": None,
+        "device_ip": "192.0.2.10",
+    }
+
+
+def test_unchanged_partial_returns_same_snapshot() -> None:
+    assert PLAYING.updated({"media_title": "Dune"}) is PLAYING
+
+
+def test_updated_reports_only_changed_keys() -> None:
+    paused = PLAYING.updated({"play_status": "paused", "play_speed": None, "unknown": 1})
+    assert paused.changed_keys == ("play_status", "play_speed")
+    assert paused.play_speed == 0
+    assert paused["media_title"] == "Dune"
+    assert paused != PLAYING
+    assert paused.updated({"play_status": "playing", "play_speed": 1}) == PLAYING
+
+
+def test_complete_update_resets_missing_keys() -> None:
+    polled = PLAYING.updated({"play_status": "playing"}, complete=True)
+    assert polled.media_title == ""
+    assert polled.video_mode == "none"
+    assert "play_status" not in polled.changed_keys
+    assert PlaybackState.from_mapping(PLAYING.as_dict()) == PLAYING
+    assert EMPTY_PLAYBACK_STATE.changed == 0
+
+
+def test_playback_state_is_immutable() -> None:
+    with pytest.raises(AttributeError):
+        PLAYING.media_title = "Arrival"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        hash(PLAYING)
+
+
+def test_state_commands_for_keys_deduplicates() -> None:
+    assert state_commands_for_keys(["media_content_id", "media_image_url", "play_status"]) == [
+        "GET_HIGHLIGHTED_SELECTION",
+        "GET_PLAY_STATUS",
+    ]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fake_player import FakePlayer
+
+from kaleidescape_protocol.discovery import async_scan, expand_scan_targets
+
+# Home Assistant's test harness blocks sockets unless a test asks for them.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+def test_expand_scan_targets_mixes_hosts_and_subnets() -> None:
+    assert expand_scan_targets("player.local, 192.168.1.4;192.168.1.0/30\n192.168.1.2") == [
+        "player.local",
+        "192.168.1.4",
+        "192.168.1.1",
+        "192.168.1.2",
+    ]
+    assert expand_scan_targets("192.168.1.7/32") == ["192.168.1.7"]
+    assert expand_scan_targets(" , ") == []
+
+
+def test_expand_scan_targets_enforces_the_limit() -> None:
+    assert len(expand_scan_targets("10.0.0.0/24", limit=254)) == 254
+    with pytest.raises(ValueError, match="more than 100 addresses"):
+        expand_scan_targets("10.0.0.0/24", limit=100)
+    with pytest.raises(ValueError, match="more than 2 hosts"):
+        expand_scan_targets("a b c", limit=2)
+    with pytest.raises(ValueError):
+        expand_scan_targets("10.0.0.300/24")
+
+
+def test_scan_returns_only_responders(monkeypatch: pytest.MonkeyPatch) -> None:
+    open_connection = asyncio.open_connection
+
+    # Only 127.0.0.1 may be dialled under Home Assistant's harness; refuse the second host.
+    async def _open_connection(host: str, *args: object, **kwargs: object) -> object:
+        if host != "127.0.0.1":
+            raise ConnectionRefusedError
+        return await open_connection(host, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "open_connection", _open_connection)
+
+    def _reply(body: str) -> str:
+        if body.startswith("GET_DEVICE_INFO"):
+            return "000:DEVICE_INFO:0:1234567:01:192.0.2.10"
+        if body.startswith("GET_DEVICE_TYPE_NAME"):
+            return "000:DEVICE_TYPE_NAME:Strato S"
+        return "000:FRIENDLY_NAME:Theater"
+
+    async def _run() -> list:
+        async with FakePlayer(_reply) as player:
+            return await async_scan(["127.0.0.1", "127.0.0.2"], player.port, timeout=1.0)
+
+    (device,) = asyncio.run(_run())
+    assert device.host == "127.0.0.1"
+    assert device.serial == "000001234567"
+    assert (device.device_type, device.name) == ("Strato S", "Theater")
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Generous enough for a cold interpreter on slow CI; a regression that pulls in Home
+# Assistant or a large dependency costs well over this.
+IMPORT_TIME_BUDGET = 0.5
+
+
+def _run(code: str) -> dict:
+    """Run code in a fresh interpreter started in the repository root."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys\n{code}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    return json.loads(result.stdout)
+
+
+def test_codec_import_stays_light() -> None:
+    loaded = _run(
+        "import json, time\n"
+        "started = time.perf_counter()\n"
+        "from kaleidescape_protocol import PlaybackState, decode_state_response\n"
+        "elapsed = time.perf_counter() - started\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+
+    assert "asyncio" not in loaded["modules"]
+    assert not any(name.startswith("homeassistant") for name in loaded["modules"])
+    assert "kaleidescape_protocol.client" not in loaded["modules"]
+    assert loaded["elapsed"] < IMPORT_TIME_BUDGET
+
+
+def test_codec_import_leaves_rare_tables_unbuilt() -> None:
+    tables = _run(
+        "import json\n"
+        "import kaleidescape_protocol.codec\n"
+        "from kaleidescape_protocol import tables\n"
+        "built = lambda: sorted(n for n in vars(tables) if n.endswith('_INDEX'))\n"
+        "before = built()\n"
+        "tables.VIDEO_MODE_INDEX\n"
+        "print(json.dumps({'before': before, 'after': built()}))\n"
+    )
+
+    assert tables["before"] == ["MOVIE_LOCATION_INDEX", "PLAY_STATUS_INDEX"]
+    assert tables["after"] == ["MOVIE_LOCATION_INDEX", "PLAY_STATUS_INDEX", "VIDEO_MODE_INDEX"]
+
+
+def test_client_import_does_not_load_home_assistant() -> None:
+    loaded = _run(
+        "import json, time\n"
+        "started = time.perf_counter()\n"
+        "from kaleidescape_protocol import KaleidescapeClient\n"
+        "elapsed = time.perf_counter() - started\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+
+    assert not any(name.startswith("homeassistant") for name in loaded["modules"])
+    assert loaded["elapsed"] < IMPORT_TIME_BUDGET
+
+
+def test_lazy_exports_resolve() -> None:
+    exports = _run(
+        "import json, kaleidescape_protocol\n"
+        "missing = [n for n in kaleidescape_protocol.__all__ "
+        "if getattr(kaleidescape_protocol, n, None) is None]\n"
+        "print(json.dumps(missing))\n"
+    )
+
+    assert exports == []
+
+
+def test_cli_runs_without_home_assistant() -> None:
+    result = subprocess.run(
+        [sys.executable, "-m", "kaleidescape_protocol.cli", "--help"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+
+    assert "bench" in result.stdout
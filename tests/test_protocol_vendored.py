@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "kaleidescape_protocol"
+VENDORED_DIR = ROOT / "custom_components" / "kaleidescape_strato" / "kaleidescape_protocol"
+
+
+def _sources(directory: Path) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted(directory.glob("*.py"))}
+
+
+def test_integration_ships_the_same_protocol_package() -> None:
+    # HACS installs only custom_components/kaleidescape_strato, so the integration carries a
+    # copy of kaleidescape_protocol. Refresh it with:
+    #   rm -r custom_components/kaleidescape_strato/kaleidescape_protocol
+    #   cp -r kaleidescape_protocol custom_components/kaleidescape_strato/
+    package = _sources(PACKAGE_DIR)
+    vendored = _sources(VENDORED_DIR)
+
+    assert sorted(vendored) == sorted(package)
+    stale = [name for name in package if vendored[name] != package[name]]
+    assert not stale, f"vendored copies differ from kaleidescape_protocol/: {stale}"